@@ -2,30 +2,43 @@
 AI Fervv IDE - Elite Edition
 Bootstrap script.
 """
-import customtkinter as ctk
+import multiprocessing
 import os
 import sys
 
 # Ensure src is in path
 sys.path.append(os.path.dirname(__file__))
 
-from src.core.kernel.kernel import kernel
-from src.core.vfs.vfs import VirtualFileSystem
-from src.services.config_service import ConfigService
-from src.services.theme_service import ThemeService
-from src.services.ai_service import AIService
-from src.ui.workbench.workbench import Workbench
+# Boot profiling must be switched on before the heavy imports below
+from src.core.profiler import boot_profiler
+for _arg in sys.argv[1:]:
+    if _arg.startswith("--profile-boot"):
+        boot_profiler.enable(_arg.partition("=")[2] or None)
+
+with boot_profiler.span("import customtkinter"):
+    import customtkinter as ctk
+
+with boot_profiler.span("import kernel + services"):
+    from src.core.kernel.kernel import kernel
+    from src.core.kernel.bootstrap import bootstrap_kernel
+
+with boot_profiler.span("import workbench"):
+    from src.ui.workbench.workbench import Workbench
 
 class App(ctk.CTk):
     def __init__(self):
-        super().__init__()
+        with boot_profiler.span("Tk root window"):
+            super().__init__()
         
         # 0. Global Settings
         ctk.set_appearance_mode("Dark")
         ctk.set_default_color_theme("blue")
         
         # 1. Bootstrap Kernel
-        self._init_kernel()
+        from src.core.event_bus import global_event_bus
+        global_event_bus.attach_main_loop(self)
+        with boot_profiler.span("App._init_kernel"):
+            self._init_kernel()
         
         # 2. Setup Window
         self.title("AI Fervv IDE - Galactic Edition")
@@ -38,47 +51,34 @@ class App(ctk.CTk):
             self.configure(fg_color=theme_svc.get_color("bg_main"))
         
         # 4. Launch Workbench
-        self.workbench = Workbench(self)
-        self.workbench.pack(fill="both", expand=True)
+        with boot_profiler.span("Workbench"):
+            self.workbench = Workbench(self)
+            self.workbench.pack(fill="both", expand=True)
 
-    def _init_kernel(self):
-        # 1. Bootstrap Logger
-        from src.services.logger_service import setup_logger
-        self.logger = setup_logger(kernel)
-        kernel.log("🚀 Bootstrapping Galactic Kernel...")
-        
-        # 2. Bridge Container EARLY to support service inter-dependencies
-        from src.core.container import Container
-        Container._instances = kernel.services 
-        
-        # 3. Load VFS Extension
-        vfs = VirtualFileSystem()
-        vfs.on_load(kernel)
-        
-        # 4. Register Legacy Services
-        config = ConfigService()
-        kernel.register_service("ConfigService", config)
-        
-        theme = ThemeService()
-        kernel.register_service("ThemeService", theme)
+        if boot_profiler.enabled:
+            # Idle callbacks run once the first frame has been laid out and drawn
+            self.after_idle(self._on_first_frame)
 
-        from src.services.file_service import FileService
-        file_svc = FileService()
-        # kernel.register_service("FileService", file_svc) # Kernel registration
-        # But Container adapter takes kernel.services.
-        kernel.register_service("FileService", file_svc)
-        
-        ai = AIService()
-        ai.initialize()
-        kernel.register_service("AIService", ai)
+    def _on_first_frame(self):
+        boot_profiler.mark("first frame")
+        boot_profiler.finish()
+
+    def _init_kernel(self):
+        # Logger, VFS and core services are shared with the headless entry point
+        self.logger = bootstrap_kernel()
         
         # Events
-        from src.core.event_bus import global_event_bus
-        global_event_bus.subscribe("open_settings", lambda _: self.show_settings())
+        from src.core.event_bus import global_event_bus, DISPATCH_MAIN
+        global_event_bus.subscribe("open_settings", self.show_settings, dispatch=DISPATCH_MAIN)
+        
+        # External edits (git checkout, terminal, other editors) reach the UI as "files_changed"
+        kernel.get_service("FileWatcher").start()
+        kernel.get_service("WorkspaceIndex").start()
+        kernel.get_service("TrigramIndex").start()
         
         kernel.log("✅ Kernel Ready.")
 
-    def show_settings(self):
+    def show_settings(self, _data=None):
         # Placeholder for existing settings logic or new implementation
         # Assuming the method exists or creating a simple one
         top = ctk.CTkToplevel(self)
@@ -88,5 +88,11 @@ class App(ctk.CTk):
         ctk.CTkLabel(top, text="Theme Configured via Service.", text_color="gray").pack()
 
 if __name__ == "__main__":
+    # Workers of the frozen exe start here: run their task, not a second IDE
+    multiprocessing.freeze_support()
     app = App()
-    app.mainloop()
\ No newline at end of file
+    try:
+        app.mainloop()
+    finally:
+        # Stops the watcher, indexes, search workers and event bus pool; flushes settings
+        kernel.shutdown()
\ No newline at end of file
@@ -4,11 +4,26 @@ The breakdown of the AI into a Kernel-aware entity.
 """
 from src.agent_os.tools import AgentTools
 from src.core.kernel.kernel import kernel
+from src.core.vfs.overlay import OverlayVFS
 
 class AutonomousAgent:
-    def __init__(self, ai_service):
+    def __init__(self, ai_service, speculative=False):
         self.ai = ai_service
-        self.tools = AgentTools()
+        # Speculative agents write to an in-memory overlay until their changes are accepted
+        self.overlay = OverlayVFS(kernel.get_service("VFS")) if speculative else None
+        self.tools = AgentTools(self.overlay)
+
+    def pending_diff(self):
+        """Unified diff of the edits a speculative run has not committed yet."""
+        return self.overlay.diff() if self.overlay else ""
+
+    def accept_changes(self):
+        """Commits a speculative run's edits to disk in one batch. Returns the written uris."""
+        return self.overlay.commit() if self.overlay else []
+
+    def reject_changes(self):
+        if self.overlay:
+            self.overlay.discard()
 
     def think_and_act(self, goal):
         """
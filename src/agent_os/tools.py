@@ -6,8 +6,10 @@ import subprocess
 from src.core.kernel.kernel import kernel
 
 class AgentTools:
-    def __init__(self):
-        self.vfs = kernel.get_service("VFS")
+    def __init__(self, vfs=None):
+        # vfs may be an OverlayVFS to keep the agent's edits speculative; an empty
+        # overlay has len() 0, so test for None rather than truthiness
+        self.vfs = vfs if vfs is not None else kernel.get_service("VFS")
 
     def read_file(self, path):
         """Reads a file from the VFS."""
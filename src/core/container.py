@@ -1,18 +1,88 @@
 """
 Dependency Injection Container
 Manages singleton instances and service resolution.
+
+Services can be registered eagerly (an instance) or lazily (a factory plus the
+names of the services it depends on). A lazy service is built on its first
+lookup, exactly once even when several threads ask for it at the same time.
 """
+import threading
+from src.core.profiler import boot_profiler
+
+
+class ServiceFactory:
+    """Deferred construction of a service."""
+    def __init__(self, factory, depends=()):
+        self.factory = factory
+        self.depends = tuple(depends)
+        self.lock = threading.Lock()
+
 
 class Container:
     _instances = {}
+    _factories = {}
+    _registry_lock = threading.Lock()
+    _resolving = threading.local()
 
     @classmethod
     def register(cls, interface, instance):
         cls._instances[interface] = instance
 
+    @classmethod
+    def register_factory(cls, interface, factory, depends=()):
+        """Registers a callable that builds the service on first use."""
+        with cls._registry_lock:
+            cls._factories[interface] = ServiceFactory(factory, depends)
+
+    @classmethod
+    def unregister(cls, interface):
+        with cls._registry_lock:
+            cls._factories.pop(interface, None)
+            return cls._instances.pop(interface, None)
+
+    @classmethod
+    def is_registered(cls, interface):
+        return interface in cls._instances or interface in cls._factories
+
+    @classmethod
+    def is_instantiated(cls, interface):
+        return interface in cls._instances
+
     @classmethod
     def get(cls, interface):
-        return cls._instances.get(interface)
+        instance = cls._instances.get(interface)
+        if instance is not None or interface not in cls._factories:
+            return instance
+        return cls._create(interface)
+
+    @classmethod
+    def _create(cls, interface):
+        entry = cls._factories.get(interface)
+        if entry is None:
+            return cls._instances.get(interface)
+
+        stack = getattr(cls._resolving, "stack", None)
+        if stack is None:
+            stack = cls._resolving.stack = []
+        if interface in stack:
+            raise RuntimeError(f"Circular service dependency: {' -> '.join(stack + [interface])}")
+
+        stack.append(interface)
+        try:
+            # Dependencies first, outside our own lock so unrelated services build in parallel
+            for dep in entry.depends:
+                if cls.get(dep) is None:
+                    raise LookupError(f"Service '{interface}' depends on unavailable '{dep}'")
+            with entry.lock:
+                instance = cls._instances.get(interface)
+                if instance is None:
+                    with boot_profiler.span(f"service: {interface}", cat="service"):
+                        instance = entry.factory()
+                    cls._instances[interface] = instance
+                    cls._factories.pop(interface, None)
+            return instance
+        finally:
+            stack.pop()
 
 # Global accessor
 def get_service(interface):
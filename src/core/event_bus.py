@@ -1,25 +1,523 @@
 """
 Event Bus System
 Handles decoupling of components via publish/subscribe pattern.
+
+Every subscriber declares where its callback runs:
+    DISPATCH_INLINE - on the publishing thread (the default).
+    DISPATCH_POOL   - on a shared worker pool; the publisher never waits.
+    DISPATCH_MAIN   - on the Tk main loop, through one batched after() drain.
+
+Bursty topics can be given a coalescing policy (LatestWins, Batch, RateLimit)
+so subscribers receive one payload per window instead of one call per event.
+
+Topics are dot-separated ("lsp.python.diagnostics"). Subscription patterns may
+use "*" for exactly one segment and a trailing "**" for any number of segments,
+e.g. "lsp.*" or "vfs.write.**". Patterns live in a trie and the subscribers of
+each concrete topic are resolved once and cached, so publishing costs
+O(matching subscribers) no matter how many patterns are registered.
+
+subscribe() returns a Subscription handle whose unsubscribe() removes it.
+Callbacks are held strongly unless subscribed with weak=True, which holds a
+bound method through a weak reference so it drops out when its object is collected.
+
+Every handler call is timed into per-topic and per-subscriber histograms
+(see get_stats()). Handlers slower than slow_handler_ms are reported through
+the attached logger, as are handler exceptions.
 """
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Any, Dict, List
+from src.core.metrics import StatsTable
 
-class EventBus:
+DISPATCH_INLINE = "inline"
+DISPATCH_POOL = "pool"
+DISPATCH_MAIN = "main"
+
+_DISPATCH_MODES = (DISPATCH_INLINE, DISPATCH_POOL, DISPATCH_MAIN)
+
+# Upper bound of callbacks run per main-loop drain so a burst cannot freeze a frame.
+MAIN_DRAIN_BATCH = 200
+
+
+# Resolved-topic cache is dropped wholesale past this size (guards unbounded topic names)
+RESOLVE_CACHE_LIMIT = 4096
+
+DEFAULT_SLOW_HANDLER_MS = 50.0
+
+
+def _callable_name(callback):
+    """Qualified name of a callback, e.g. src.ui.views.explorer.ExplorerView._on_file_changed."""
+    func = getattr(callback, "__func__", callback)
+    func = getattr(func, "func", func)  # functools.partial
+    module = getattr(func, "__module__", None) or "?"
+    qualname = getattr(func, "__qualname__", None) or type(func).__qualname__
+    if "<lambda>" in qualname and hasattr(func, "__code__"):
+        # Tell lambdas apart by where they are defined
+        qualname += f":{func.__code__.co_firstlineno}"
+    return f"{module}.{qualname}"
+
+
+class Subscription:
+    """A single callback registered for a topic pattern. Also the unsubscribe handle."""
+    def __init__(self, bus, event_name: str, callback: Callable, dispatch: str, weak: bool):
+        self.event_name = event_name
+        self.dispatch = dispatch
+        self.name = _callable_name(callback)
+        self.active = True
+        # Paused subscriptions stay registered but receive nothing (see EventBus.capture)
+        self.paused = False
+        self._bus = bus
+        if weak and hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+            self._ref = weakref.WeakMethod(callback, self._on_owner_collected)
+            self._strong = None
+        else:
+            self._ref = None
+            self._strong = callback
+
+    @property
+    def callback(self):
+        """The live callback, or None once its owner has been collected."""
+        if self._ref is not None:
+            return self._ref()
+        return self._strong
+
+    def unsubscribe(self):
+        self._bus.unsubscribe(self)
+
+    def _on_owner_collected(self, _ref):
+        # May run inside GC on any thread: only flag it, the bus purges later
+        self.active = False
+        self._bus._mark_dead()
+
+
+class _TopicNode:
+    __slots__ = ("children", "subs")
+
+    def __init__(self):
+        self.children: Dict[str, "_TopicNode"] = {}
+        self.subs: List[Subscription] = []
+
+
+_EMPTY = object()
+
+
+class CoalescePolicy:
+    """
+    Base class for per-topic coalescing.
+    offer() buffers an event and returns True when the buffer should be flushed
+    right away; otherwise the bus flushes it after delay() seconds.
+    """
     def __init__(self):
-        self._subscribers: Dict[str, List[Callable]] = {}
+        self.lock = threading.Lock()
+        self.timer = None
+
+    def offer(self, data) -> bool:
+        raise NotImplementedError
+
+    def drain(self):
+        """Returns the payload to deliver, or _EMPTY if nothing is pending."""
+        raise NotImplementedError
+
+    def delay(self) -> float:
+        raise NotImplementedError
+
+
+class LatestWins(CoalescePolicy):
+    """Delivers only the most recent event of each window."""
+    def __init__(self, window: float = 0.05):
+        super().__init__()
+        self.window = window
+        self._latest = _EMPTY
+
+    def offer(self, data):
+        self._latest = data
+        return False
+
+    def drain(self):
+        data, self._latest = self._latest, _EMPTY
+        return data
+
+    def delay(self):
+        return self.window
+
+
+class Batch(CoalescePolicy):
+    """Collects every event of a window and delivers them as one list."""
+    def __init__(self, window: float = 0.1, max_items: int = 0):
+        super().__init__()
+        self.window = window
+        self.max_items = max_items
+        self._items = []
+
+    def offer(self, data):
+        self._items.append(data)
+        return bool(self.max_items) and len(self._items) >= self.max_items
+
+    def drain(self):
+        if not self._items:
+            return _EMPTY
+        items, self._items = self._items, []
+        return items
+
+    def delay(self):
+        return self.window
+
 
-    def subscribe(self, event_name: str, callback: Callable):
-        if event_name not in self._subscribers:
-            self._subscribers[event_name] = []
-        self._subscribers[event_name].append(callback)
+class RateLimit(CoalescePolicy):
+    """
+    Passes through at most max_per_second events per second.
+    Excess events collapse into the latest one, delivered when the window ends.
+    """
+    def __init__(self, max_per_second: int):
+        super().__init__()
+        self.max_per_second = max_per_second
+        self._window_start = 0.0
+        self._count = 0
+        self._held = _EMPTY
+
+    def _roll_window(self, now):
+        if now - self._window_start >= 1.0:
+            self._window_start = now
+            self._count = 0
+
+    def offer(self, data):
+        self._roll_window(time.monotonic())
+        self._held = data
+        if self._count < self.max_per_second and self.timer is None:
+            self._count += 1
+            return True
+        return False
+
+    def drain(self):
+        if self.timer is not None:
+            # Trailing flush opens the next window
+            self._roll_window(time.monotonic())
+            self._count += 1
+        data, self._held = self._held, _EMPTY
+        return data
+
+    def delay(self):
+        return max(0.0, self._window_start + 1.0 - time.monotonic())
+
+
+class EventBus:
+    def __init__(self, max_workers: int = 4):
+        self._trie = _TopicNode()
+        self._resolved: Dict[str, tuple] = {}
+        self._has_dead = False
+        self._policies: Dict[str, CoalescePolicy] = {}
+        self._lock = threading.RLock()
+        self._capture = threading.local()
+
+        # Worker pool for DISPATCH_POOL (created on first use)
+        self._max_workers = max_workers
+        self._pool = None
+
+        # Main-loop marshaling for DISPATCH_MAIN
+        self._main_root = None
+        self._main_thread = threading.main_thread()
+        self._main_queue = deque()
+        self._drain_scheduled = False
+
+        # Instrumentation
+        self.slow_handler_ms = DEFAULT_SLOW_HANDLER_MS
+        self._logger = None
+        self._topic_stats = StatsTable()
+        self._subscriber_stats = StatsTable()
+
+    def subscribe(self, event_name: str, callback: Callable, dispatch: str = DISPATCH_INLINE, weak: bool = False):
+        """
+        Registers callback for a topic or pattern and returns its Subscription.
+        With weak=True a bound method does not keep its object alive.
+        """
+        if dispatch not in _DISPATCH_MODES:
+            raise ValueError(f"Unknown dispatch mode: {dispatch}")
+        segments = event_name.split(".")
+        if "**" in segments[:-1]:
+            raise ValueError(f"'**' is only allowed as the last segment: {event_name}")
+
+        sub = Subscription(self, event_name, callback, dispatch, weak)
+        capture = getattr(self._capture, "state", None)
+        if capture is not None:
+            capture[0].append(sub)
+            sub.paused = capture[1]
+        with self._lock:
+            node = self._trie
+            for segment in segments:
+                node = node.children.setdefault(segment, _TopicNode())
+            # Copy-on-write so publishers can iterate without holding the lock
+            node.subs = node.subs + [sub]
+            self._resolved = {}
+        return sub
+
+    @contextmanager
+    def capture(self, paused=False):
+        """
+        Collects every Subscription made on this thread inside the with-block.
+        With paused=True they receive nothing until their paused flag is cleared,
+        which lets the kernel swap an extension's subscriptions in one step.
+        """
+        previous = getattr(self._capture, "state", None)
+        subs = []
+        self._capture.state = (subs, paused)
+        try:
+            yield subs
+        finally:
+            self._capture.state = previous
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            sub.active = False
+            self._remove(sub)
+            self._resolved = {}
+
+    def _remove(self, sub):
+        path = [self._trie]
+        for segment in sub.event_name.split("."):
+            node = path[-1].children.get(segment)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].subs = [s for s in path[-1].subs if s is not sub]
+        # Prune branches left empty
+        segments = sub.event_name.split(".")
+        for i in range(len(segments), 0, -1):
+            node = path[i]
+            if node.subs or node.children:
+                break
+            del path[i - 1].children[segments[i - 1]]
+
+    def _mark_dead(self):
+        self._has_dead = True
+
+    def _purge_dead(self):
+        with self._lock:
+            self._has_dead = False
+            dead = []
+            stack = [self._trie]
+            while stack:
+                node = stack.pop()
+                dead.extend(s for s in node.subs if not s.active)
+                stack.extend(node.children.values())
+            for sub in dead:
+                self._remove(sub)
+            self._resolved = {}
+
+    def _resolve(self, event_name):
+        subs = self._resolved.get(event_name)
+        if subs is not None:
+            return subs
+        with self._lock:
+            matched = []
+            segments = event_name.split(".")
+            frontier = [self._trie]
+            for segment in segments:
+                next_frontier = []
+                for node in frontier:
+                    rest = node.children.get("**")
+                    if rest is not None:
+                        matched.extend(rest.subs)
+                    # A literal "*" segment must not reach the same child twice
+                    for key in (segment,) if segment == "*" else (segment, "*"):
+                        child = node.children.get(key)
+                        if child is not None:
+                            next_frontier.append(child)
+                frontier = next_frontier
+                if not frontier:
+                    break
+            for node in frontier:
+                matched.extend(node.subs)
+                rest = node.children.get("**")
+                if rest is not None:
+                    matched.extend(rest.subs)
+
+            # Overlapping patterns can still reach one node along several paths
+            subs = tuple(dict.fromkeys(matched))
+            if len(self._resolved) >= RESOLVE_CACHE_LIMIT:
+                self._resolved = {}
+            self._resolved[event_name] = subs
+        return subs
+
+    def attach_main_loop(self, root):
+        """Binds DISPATCH_MAIN subscribers to a Tk root. Must be called on the Tk thread."""
+        self._main_root = root
+        self._main_thread = threading.current_thread()
+
+    def set_logger(self, logger):
+        """Routes handler errors and slow-handler reports to a Logger service."""
+        self._logger = logger
+
+    def get_stats(self):
+        """Snapshot of per-topic and per-subscriber counters and latency histograms."""
+        return {
+            "slow_handler_ms": self.slow_handler_ms,
+            "topics": self._topic_stats.snapshot(),
+            "subscribers": self._subscriber_stats.snapshot(),
+        }
+
+    def reset_stats(self):
+        self._topic_stats.clear()
+        self._subscriber_stats.clear()
+
+    def set_policy(self, event_name: str, policy: CoalescePolicy = None):
+        """Installs (or with None removes) the coalescing policy of a topic."""
+        old = self._policies.pop(event_name, None)
+        if old is not None:
+            self._flush_policy(event_name, old)
+        if policy is not None:
+            self._policies[event_name] = policy
 
     def publish(self, event_name: str, data: Any = None):
-        if event_name in self._subscribers:
-            for callback in self._subscribers[event_name]:
-                try:
-                    callback(data)
-                except Exception as e:
-                    print(f"Error handling event {event_name}: {e}")
+        self._topic_stats.incr(event_name, "published")
+        policy = self._policies.get(event_name)
+        if policy is None:
+            self._dispatch(event_name, data)
+            return
+
+        with policy.lock:
+            flush_now = policy.offer(data)
+            if not flush_now and policy.timer is None:
+                policy.timer = threading.Timer(policy.delay(), self._flush_policy, (event_name, policy))
+                policy.timer.daemon = True
+                policy.timer.start()
+        if flush_now:
+            self._flush_policy(event_name, policy, from_timer=False)
+
+    def deliver(self, event_name: str, data: Any, subs):
+        """
+        Dispatches one event to only those of subs that match it, bypassing any
+        coalescing policy (data is delivered as given, e.g. an already batched list).
+        """
+        only = set(subs)
+        for sub in self._resolve(event_name):
+            if sub in only:
+                self._dispatch_one(event_name, sub, data)
+
+    def flush(self, event_name: str = None):
+        """Delivers pending coalesced events right away (all topics by default)."""
+        names = [event_name] if event_name else list(self._policies)
+        for name in names:
+            policy = self._policies.get(name)
+            if policy is not None:
+                self._flush_policy(name, policy)
+
+    def _flush_policy(self, event_name, policy, from_timer=True):
+        with policy.lock:
+            payload = policy.drain()
+            if from_timer and policy.timer is not None:
+                policy.timer.cancel()
+                policy.timer = None
+        if payload is not _EMPTY:
+            self._dispatch(event_name, payload)
+
+    def _dispatch(self, event_name, data):
+        if self._has_dead:
+            self._purge_dead()
+        for sub in self._resolve(event_name):
+            self._dispatch_one(event_name, sub, data)
+
+    def _dispatch_one(self, event_name, sub, data):
+        if sub.dispatch == DISPATCH_POOL:
+            self._get_pool().submit(self._invoke, event_name, sub, data, time.perf_counter())
+        elif sub.dispatch == DISPATCH_MAIN and self._needs_marshal():
+            self._enqueue_main(event_name, sub, data)
+        else:
+            self._invoke(event_name, sub, data)
+
+    def _invoke(self, event_name, sub, data, queued_at=None):
+        # Subscriptions can die between dispatch and a deferred (pool/main) call
+        callback = sub.callback if sub.active and not sub.paused else None
+        if callback is None:
+            return
+        start = time.perf_counter()
+        if queued_at is not None:
+            self._topic_stats.incr(event_name, "queue_wait_ms", (start - queued_at) * 1000.0)
+        try:
+            callback(data)
+        except Exception as e:
+            self._topic_stats.incr(event_name, "errors")
+            self._subscriber_stats.incr(sub.name, "errors")
+            if self._logger:
+                self._logger.error(f"Error handling event {event_name}", exc_info=True, handler=sub.name)
+            else:
+                print(f"Error handling event {event_name}: {e}")
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+        self._topic_stats.incr(event_name, "delivered")
+        self._topic_stats.record(event_name, elapsed_ms)
+        self._subscriber_stats.incr(sub.name, "calls")
+        self._subscriber_stats.record(sub.name, elapsed_ms)
+        if elapsed_ms >= self.slow_handler_ms:
+            self._report_slow(event_name, sub, elapsed_ms)
+
+    def _report_slow(self, event_name, sub, elapsed_ms):
+        self._topic_stats.incr(event_name, "slow")
+        self._subscriber_stats.incr(sub.name, "slow")
+        message = f"Slow event handler {sub.name} on '{event_name}': {elapsed_ms:.1f} ms"
+        if self._logger:
+            self._logger.log("WARNING", message, {
+                "event": event_name,
+                "handler": sub.name,
+                "duration_ms": round(elapsed_ms, 3),
+                "thread": threading.current_thread().name,
+            })
+        else:
+            print(message)
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="event-bus")
+        return self._pool
+
+    def _needs_marshal(self):
+        # Without a main loop (headless, early boot) main-thread handlers run inline
+        return self._main_root is not None and threading.current_thread() is not self._main_thread
+
+    def _enqueue_main(self, event_name, sub, data):
+        self._main_queue.append((event_name, sub, data, time.perf_counter()))
+        with self._lock:
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+        self._schedule_drain()
+
+    def _schedule_drain(self):
+        try:
+            self._main_root.after(0, self._drain_main)
+        except Exception:
+            # Root destroyed: nothing left to deliver to
+            self._main_queue.clear()
+            with self._lock:
+                self._drain_scheduled = False
+
+    def _drain_main(self):
+        with self._lock:
+            self._drain_scheduled = False
+        for _ in range(MAIN_DRAIN_BATCH):
+            try:
+                event_name, sub, data, queued_at = self._main_queue.popleft()
+            except IndexError:
+                return
+            self._invoke(event_name, sub, data, queued_at)
+        # Leftovers get their own frame
+        with self._lock:
+            if self._drain_scheduled or not self._main_queue:
+                return
+            self._drain_scheduled = True
+        self._schedule_drain()
+
+    def shutdown(self):
+        """Flushes coalesced events and stops the worker pool. Pending pool callbacks are dropped."""
+        self.flush()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
 
 # Global instance for app-wide events
 global_event_bus = EventBus()
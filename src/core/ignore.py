@@ -0,0 +1,148 @@
+"""
+Ignore Rules
+.gitignore / .ignore matching for workspace scans.
+
+Each directory's ignore files become an IgnoreRules object; an IgnoreStack
+chains them from the workspace root down, and (as in git) the deepest
+matching rule wins, later lines winning within one file. Patterns are
+compiled to regular expressions once; files without negations are folded
+into a single alternation so the common case is one regex call per path.
+"""
+import os
+import re
+
+IGNORE_FILES = (".gitignore", ".ignore")
+# Never indexed, whatever the ignore files say
+ALWAYS_IGNORED = {".git", ".hg", ".svn", ".fervv", "__pycache__"}
+
+
+def _glob_to_regex(glob):
+    """Translates a gitignore glob (no leading/trailing slash handling) to a regex body."""
+    out = []
+    i, n = 0, len(glob)
+    while i < n:
+        c = glob[i]
+        if c == "*":
+            if glob[i:i + 3] == "**/":
+                out.append("(?:.*/)?")
+                i += 3
+                continue
+            if glob[i:i + 2] == "**":
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = glob.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = glob[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(glob[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class _Rule:
+    __slots__ = ("regex", "negate", "dir_only")
+
+    def __init__(self, regex, negate, dir_only):
+        self.regex = regex
+        self.negate = negate
+        self.dir_only = dir_only
+
+
+class IgnoreRules:
+    """The rules of one directory's ignore files. Paths are relative to that directory, '/'-separated."""
+    def __init__(self, lines):
+        self.rules = []
+        for raw in lines:
+            line = raw.rstrip("\n").rstrip("\r")
+            if not line.strip() or line.startswith("#"):
+                continue
+            if not line.endswith("\\ "):
+                line = line.rstrip()
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            elif line.startswith("\\"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            # A slash anywhere but the end anchors the pattern to this directory
+            anchored = "/" in line
+            body = _glob_to_regex(line.lstrip("/"))
+            pattern = body if anchored else f"(?:.*/)?{body}"
+            self.rules.append(_Rule(re.compile(pattern + r"\Z"), negate, dir_only))
+
+        # Without negations only "does anything match" matters: one combined regex per kind
+        self._combined = None
+        if self.rules and not any(r.negate for r in self.rules):
+            any_kind = [r.regex.pattern for r in self.rules if not r.dir_only]
+            dirs = [r.regex.pattern for r in self.rules]
+            self._combined = (
+                re.compile("|".join(f"(?:{p})" for p in any_kind)) if any_kind else None,
+                re.compile("|".join(f"(?:{p})" for p in dirs)),
+            )
+
+    @classmethod
+    def from_directory(cls, directory):
+        """Reads the ignore files of a directory. Returns None if it has none."""
+        lines = []
+        for name in IGNORE_FILES:
+            try:
+                with open(os.path.join(directory, name), "r", encoding="utf-8", errors="replace") as f:
+                    lines.extend(f.readlines())
+            except OSError:
+                continue
+        rules = cls(lines)
+        return rules if rules.rules else None
+
+    def match(self, rel, is_dir):
+        """True (ignored), False (explicitly re-included) or None (no rule applies)."""
+        if self._combined is not None:
+            regex = self._combined[1] if is_dir else self._combined[0]
+            return True if regex is not None and regex.match(rel) else None
+        for rule in reversed(self.rules):
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.match(rel):
+                return not rule.negate
+        return None
+
+
+class IgnoreStack:
+    """Rules in effect inside one directory: its own plus every ancestor's up to the root."""
+    __slots__ = ("entries",)
+
+    def __init__(self, entries=()):
+        self.entries = tuple(entries)  # ((base_rel, IgnoreRules), ...) root first
+
+    def child(self, dir_rel, rules):
+        """The stack for a subdirectory that has its own rules (or self if it has none)."""
+        if rules is None:
+            return self
+        return IgnoreStack(self.entries + ((dir_rel, rules),))
+
+    def is_ignored(self, rel, is_dir):
+        """rel is the workspace-relative, '/'-separated path."""
+        if rel.rpartition("/")[2] in ALWAYS_IGNORED:
+            return True
+        for base, rules in reversed(self.entries):
+            sub = rel[len(base) + 1:] if base else rel
+            verdict = rules.match(sub, is_dir)
+            if verdict is not None:
+                return verdict
+        return False
@@ -0,0 +1,137 @@
+"""
+Kernel Bootstrap
+Boots the kernel and every non-UI service. Shared by the desktop app (main.py)
+and the headless entry point (src/headless.py), so neither Tk, customtkinter
+nor PIL are imported here.
+"""
+import os
+import sys
+from functools import partial
+from src.core.kernel.kernel import kernel
+from src.core.event_bus import global_event_bus, Batch, LatestWins
+from src.core.profiler import boot_profiler
+from src.core.workspace import STATE_DIR_NAME, workspace_root
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+EXTENSIONS_DIR = os.path.join(APP_ROOT, "extensions")
+# User settings and logs sit next to the app (the exe when frozen), never in the workspace
+DATA_ROOT = os.path.dirname(sys.executable) if getattr(sys, "frozen", False) else APP_ROOT
+
+
+def bootstrap_kernel(settings_file="settings.json", kernel_instance=kernel, workspace=None):
+    """
+    Registers the logger, VFS and core services on kernel_instance, with the
+    workspace services rooted at workspace (default: the cwd). Returns the logger.
+    """
+    root = os.path.abspath(workspace or workspace_root())
+    settings_file = os.path.join(DATA_ROOT, settings_file)
+    # 1. Bootstrap Logger
+    with boot_profiler.span("kernel: logger"):
+        from src.services.logger_service import setup_logger
+        logger = setup_logger(kernel_instance, os.path.join(DATA_ROOT, "logs"))
+    kernel_instance.log("🚀 Bootstrapping Galactic Kernel...")
+
+    # 2. Coalesce bursty topics before anything can publish them
+    global_event_bus.set_policy("vfs_write", Batch(window=0.1))
+    global_event_bus.set_policy("file_saved", Batch(window=0.1))
+    global_event_bus.set_policy("config_changed", Batch(window=0.1))
+    global_event_bus.set_policy("theme_changed", LatestWins(window=0.05))
+    global_event_bus.set_policy("git_status", LatestWins(window=0.05))
+    global_event_bus.set_policy("search_results", Batch(window=0.05))
+
+    # 3. Load VFS Extension
+    with boot_profiler.span("kernel: VFS"):
+        from src.core.vfs.vfs import VirtualFileSystem
+        vfs = VirtualFileSystem()
+        vfs.on_load(kernel_instance)
+
+    # 4. Register Legacy Services
+    with boot_profiler.span("kernel: ConfigService"):
+        from src.services.config_service import ConfigService
+        config = ConfigService(settings_file, os.path.join(root, STATE_DIR_NAME, "settings.json"))
+        kernel_instance.register_service("ConfigService", config, stop_on_shutdown=True)
+    global_event_bus.slow_handler_ms = config.get("slow_handler_ms", global_event_bus.slow_handler_ms)
+    from src.core.vfs.cache import content_cache
+    content_cache.set_budget(int(config.get("vfs_cache_mb", 64)) * 1024 * 1024)
+
+    with boot_profiler.span("kernel: ThemeService"):
+        from src.services.theme_service import ThemeService
+        theme = ThemeService()
+        kernel_instance.register_service("ThemeService", theme)
+
+    with boot_profiler.span("kernel: HistoryService"):
+        from src.services.history_service import HistoryService
+        history = HistoryService(root, int(config.get("history_max_mb", 256)) * 1024 * 1024)
+        kernel_instance.register_service("HistoryService", history)
+        # Unseen content is kept just before a VFS write replaces it; the new content once it landed
+        vfs.write_queue.add_hook(history.on_write)
+        vfs.write_queue.add_hook(history.on_commit, after_commit=True)
+
+    with boot_profiler.span("kernel: FileService"):
+        from src.services.file_service import FileService
+        file_svc = FileService()
+        kernel_instance.register_service("FileService", file_svc)
+
+    # 5. Lazy services: built on first use, not on the way to the first frame
+    kernel_instance.register_service("AIService", factory=_create_ai_service, depends=("ConfigService",))
+    kernel_instance.register_service("Agent", factory=partial(_create_agent, kernel_instance), depends=("AIService",))
+    kernel_instance.register_service("AsyncVFS", factory=partial(_create_async_vfs, kernel_instance), depends=("VFS",))
+    # Not started here: the desktop app starts it, headless runs usually don't need it
+    kernel_instance.register_service("FileWatcher", factory=partial(_create_file_watcher, root), stop_on_shutdown=True)
+    kernel_instance.register_service("WorkspaceIndex", factory=partial(_create_workspace_index, root), stop_on_shutdown=True)
+    kernel_instance.register_service("FuzzyFinder", factory=partial(_create_fuzzy_finder, kernel_instance), depends=("WorkspaceIndex",))
+    kernel_instance.register_service("TrigramIndex", factory=partial(_create_trigram_index, kernel_instance), depends=("WorkspaceIndex",),
+                                     stop_on_shutdown=True)
+    kernel_instance.register_service("SearchService", factory=partial(_create_search_service, kernel_instance), depends=("WorkspaceIndex", "TrigramIndex"),
+                                     stop_on_shutdown=True)
+
+    # 6. Manifest-based extensions
+    if os.path.isdir(EXTENSIONS_DIR):
+        from src.core.kernel.extension_loader import INDEX_FILE
+        with boot_profiler.span("kernel: extensions"):
+            kernel_instance.load_extensions([EXTENSIONS_DIR], os.path.join(EXTENSIONS_DIR, INDEX_FILE))
+
+    return logger
+
+
+def _create_ai_service():
+    # Deferred import: pulls in the openai / google.generativeai SDKs
+    from src.services.ai_service import AIService
+    ai = AIService()
+    ai.initialize()
+    return ai
+
+
+def _create_async_vfs(k):
+    from src.core.vfs.async_vfs import AsyncVFS
+    return AsyncVFS(k.get_service("VFS"))
+
+
+def _create_file_watcher(root):
+    from src.services.file_watcher_service import FileWatcherService
+    return FileWatcherService(root)
+
+
+def _create_workspace_index(root):
+    from src.services.workspace_index_service import WorkspaceIndexService
+    return WorkspaceIndexService(root)
+
+
+def _create_fuzzy_finder(k):
+    from src.services.fuzzy_finder import FuzzyFinderService
+    return FuzzyFinderService(k.get_service("WorkspaceIndex"))
+
+
+def _create_search_service(k):
+    from src.services.search_service import SearchService
+    return SearchService(k.get_service("WorkspaceIndex"), k.get_service("TrigramIndex"))
+
+
+def _create_trigram_index(k):
+    from src.services.trigram_index_service import TrigramIndexService
+    return TrigramIndexService(k.get_service("WorkspaceIndex"))
+
+
+def _create_agent(k):
+    from src.agent_os.autonomous_agent import AutonomousAgent
+    return AutonomousAgent(k.get_service("AIService"))
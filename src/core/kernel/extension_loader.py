@@ -0,0 +1,259 @@
+"""
+Extension Loader
+Manifest-driven discovery, parallel import and lazy activation of extensions.
+
+Each extension lives in its own folder under an extensions root and ships an
+extension.json manifest:
+
+    {
+        "name": "hello",
+        "entry": "hello.main:HelloExtension",
+        "dependencies": ["greeter"],
+        "activationEvents": ["onStartup", "onEvent:open_file"]
+    }
+
+"entry" is "<module>:<IExtension subclass>", importable from the extensions root.
+"onStartup" (or "*") activates at boot; "onEvent:<topic>" activates the first
+time that topic is published, and that event is then handed to the
+subscriptions the extension made in on_load. Dependencies are always
+activated first.
+
+Discovered manifests are cached in an on-disk index keyed by manifest mtime, so
+unchanged extensions are not re-parsed. Modules are imported in parallel, one
+dependency level at a time.
+"""
+import importlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.interfaces.extension import IExtension
+from src.core.event_bus import global_event_bus
+from src.core.profiler import boot_profiler
+
+MANIFEST_FILE = "extension.json"
+INDEX_FILE = ".extension_index.json"
+STARTUP_EVENTS = ("onStartup", "*")
+
+
+class ExtensionManifest:
+    def __init__(self, data, path):
+        self.name = data["name"]
+        self.entry = data["entry"]
+        self.dependencies = list(data.get("dependencies", []))
+        self.activation_events = list(data.get("activationEvents", ["onStartup"]))
+        self.path = path
+        self.root = os.path.dirname(os.path.dirname(path))
+
+    @property
+    def module_name(self):
+        return self.entry.partition(":")[0]
+
+    @property
+    def class_name(self):
+        return self.entry.partition(":")[2]
+
+    @property
+    def package(self):
+        """The extension's own top-level package (its folder), if the entry lives in it."""
+        top = self.module_name.partition(".")[0]
+        return top if top == os.path.basename(os.path.dirname(self.path)) else None
+
+    @property
+    def activates_on_startup(self):
+        return any(e in STARTUP_EVENTS for e in self.activation_events)
+
+    @property
+    def activation_topics(self):
+        return [e.partition(":")[2] for e in self.activation_events if e.startswith("onEvent:")]
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "entry": self.entry,
+            "dependencies": self.dependencies,
+            "activationEvents": self.activation_events,
+        }
+
+
+def discover_manifests(roots, index_path=None):
+    """Scans roots for extension manifests, reusing the on-disk index for unchanged ones."""
+    index = {}
+    if index_path and os.path.exists(index_path):
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except Exception:
+            index = {}
+
+    manifests = []
+    new_index = {}
+    for root in roots:
+        if not os.path.isdir(root):
+            continue
+        for entry in os.scandir(root):
+            path = os.path.join(entry.path, MANIFEST_FILE)
+            if not entry.is_dir():
+                continue
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            cached = index.get(path)
+            if cached and cached.get("mtime_ns") == mtime_ns:
+                data = cached["manifest"]
+            else:
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except Exception as e:
+                    print(f"Invalid extension manifest {path}: {e}")
+                    continue
+            try:
+                manifests.append(ExtensionManifest(data, path))
+            except KeyError as e:
+                print(f"Extension manifest {path} is missing {e}")
+                continue
+            new_index[path] = {"mtime_ns": mtime_ns, "manifest": data}
+
+    if index_path and new_index != index:
+        try:
+            with open(index_path, "w", encoding="utf-8") as f:
+                json.dump(new_index, f)
+        except Exception as e:
+            print(f"Extension index write error: {e}")
+    return manifests
+
+
+def dependency_levels(manifests):
+    """
+    Groups manifests into levels where every dependency sits in an earlier level.
+    Extensions with missing or circular dependencies are reported and left out.
+    """
+    by_name = {m.name: m for m in manifests}
+    remaining = {}
+    for m in manifests:
+        missing = [d for d in m.dependencies if d not in by_name]
+        if missing:
+            print(f"Extension {m.name} skipped: missing dependencies {missing}")
+        else:
+            remaining[m.name] = set(m.dependencies)
+
+    # Dropping an extension also drops whatever depends on it
+    changed = True
+    while changed:
+        changed = False
+        for name, deps in list(remaining.items()):
+            if not deps.issubset(remaining):
+                print(f"Extension {name} skipped: dependency unavailable")
+                del remaining[name]
+                changed = True
+
+    levels = []
+    done = set()
+    while remaining:
+        level = [name for name, deps in remaining.items() if deps <= done]
+        if not level:
+            print(f"Extensions skipped: circular dependencies among {sorted(remaining)}")
+            break
+        level.sort()
+        levels.append([by_name[name] for name in level])
+        done.update(level)
+        for name in level:
+            del remaining[name]
+    return levels
+
+
+class ExtensionLoader:
+    def __init__(self, kernel, max_workers=8):
+        self.kernel = kernel
+        self.max_workers = max_workers
+        self.manifests = {}
+        self.classes = {}
+        self._activation_subs = {}
+        self._lock = threading.RLock()
+
+    def load(self, roots, index_path=None):
+        """Discovers, imports and (for startup extensions) activates everything under roots."""
+        with boot_profiler.span("extensions: discover"):
+            manifests = discover_manifests(roots, index_path)
+        levels = dependency_levels(manifests)
+
+        for root in {m.root for m in manifests}:
+            if root not in sys.path:
+                sys.path.append(root)
+
+        with boot_profiler.span("extensions: import"):
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ext-import") as pool:
+                for level in levels:
+                    for manifest, cls in zip(level, pool.map(self._import, level)):
+                        if cls is not None:
+                            self.manifests[manifest.name] = manifest
+                            self.classes[manifest.name] = cls
+
+        for level in levels:
+            for manifest in level:
+                if manifest.name not in self.classes:
+                    continue
+                if manifest.activates_on_startup:
+                    self.activate(manifest.name)
+                else:
+                    self._arm(manifest)
+        return list(self.classes)
+
+    def _import(self, manifest):
+        try:
+            with boot_profiler.span(f"import {manifest.module_name}", cat="extension"):
+                module = importlib.import_module(manifest.module_name)
+            cls = getattr(module, manifest.class_name)
+            if not (isinstance(cls, type) and issubclass(cls, IExtension)):
+                raise TypeError(f"{manifest.entry} is not an IExtension")
+            return cls
+        except Exception as e:
+            print(f"Failed to import extension {manifest.name}: {e}")
+            return None
+
+    def _arm(self, manifest):
+        subs = []
+        for topic in manifest.activation_topics:
+            subs.append(global_event_bus.subscribe(
+                topic, lambda data, name=manifest.name, topic=topic: self._activate_on(name, topic, data)
+            ))
+        self._activation_subs[manifest.name] = subs
+
+    def _activate_on(self, name, topic, data):
+        # The triggering event was dispatched before the extension subscribed: hand it over
+        with self._lock:
+            before = set(self.kernel.extensions)
+            if not self.activate(name):
+                return
+            started = [n for n in self.kernel.extensions if n not in before]
+            subs = [sub for n in started for sub in self.kernel.extension_subscriptions(n)]
+        if subs:
+            global_event_bus.deliver(topic, data, subs)
+
+    def activate(self, name):
+        """Activates an extension (and its dependencies) once. Returns True if it is active."""
+        with self._lock:
+            if name in self.kernel.extensions:
+                return True
+            manifest = self.manifests.get(name)
+            if manifest is None:
+                return False
+            for dep in manifest.dependencies:
+                if not self.activate(dep):
+                    print(f"Extension {name} not activated: dependency {dep} failed")
+                    return False
+            for sub in self._activation_subs.pop(name, []):
+                sub.unsubscribe()
+            try:
+                with boot_profiler.span(f"activate {name}", cat="extension"):
+                    extension = self.classes[name]()
+                    self.kernel.start_extension(name, extension, manifest.module_name, manifest.class_name, manifest.package)
+            except Exception as e:
+                print(f"Failed to activate extension {name}: {e}")
+                return False
+            print(f"Loaded Extension: {name}")
+            return True
@@ -4,8 +4,16 @@ Manages the lifecycle of the IDE.
 """
 import importlib
 import inspect
+import json
+import sys
+import threading
+import time
 from src.core.interfaces.extension import IExtension
 from src.core.event_bus import global_event_bus
+from src.core.container import Container
+
+# Never re-imported by reload_extension(): swapping them would orphan live state
+PROTECTED_MODULES = ("src.core.kernel", "src.core.event_bus", "src.core.container", "src.core.interfaces")
 
 class Kernel:
     _instance = None
@@ -14,7 +22,17 @@ class Kernel:
         if cls._instance is None:
             cls._instance = super(Kernel, cls).__new__(cls)
             cls._instance.extensions = {}
-            cls._instance.services = {}
+            # Shares the Container registry so get_service() and the kernel agree
+            cls._instance.services = Container._instances
+            cls._instance.factories = Container._factories
+            cls._instance.extension_loader = None
+            # name -> (module, class, own package or None) and name -> services/subscriptions it registered
+            cls._instance._extension_sources = {}
+            cls._instance._extension_owned = {}
+            # Services whose stop() runs on shutdown, in registration order
+            cls._instance._stoppable = []
+            cls._instance._staging = threading.local()
+            cls._instance._lock = threading.RLock()
             # Default logger is print
             cls._instance.log = print
             print("🌌 Galactic Kernel Initialized")
@@ -26,32 +44,205 @@ class Kernel:
             module = importlib.import_module(module_path)
             for name, obj in inspect.getmembers(module):
                 if inspect.isclass(obj) and issubclass(obj, IExtension) and obj is not IExtension:
-                    extension = obj()
-                    extension.on_load(self)
-                    self.extensions[name] = extension
+                    self.start_extension(name, obj(), module_path, name)
                     print(f"Loaded Extension: {name}")
                     return True
         except Exception as e:
             print(f"Failed to load extension {module_path}: {e}")
             return False
 
-    def register_service(self, interface, instance):
-        """Registers a core service available to all extensions."""
-        self.services[interface] = instance
+    def load_extensions(self, roots, index_path=None):
+        """
+        Loads manifest-based extensions (see extension_loader) from the given folders.
+        Startup extensions are activated now, the rest when their activation event fires.
+        """
+        from src.core.kernel.extension_loader import ExtensionLoader
+        if self.extension_loader is None:
+            self.extension_loader = ExtensionLoader(self)
+        return self.extension_loader.load(roots, index_path)
+
+    def start_extension(self, name, extension, module_name, class_name, package=None):
+        """
+        Calls on_load and records the services and event subscriptions it creates.
+        package names a package that belongs to the extension alone (its folder);
+        reload_extension() re-imports it along with module_name.
+        """
+        with self._lock:
+            owned = self._capture_on_load(extension, staged=False)
+            self.extensions[name] = extension
+            self._extension_sources[name] = (module_name, class_name, package)
+            self._extension_owned[name] = owned
+
+    def extension_subscriptions(self, name):
+        """The event subscriptions an extension made in on_load."""
+        return list(self._extension_owned.get(name, {}).get("subscriptions", []))
+
+    def reload_extension(self, name):
+        """
+        Hot-reloads one extension: re-imports its module graph and calls on_load on a
+        fresh instance with its services and subscriptions staged, then calls
+        on_unload on the old instance and swaps them in one step. If the new code
+        fails to import or load, the previous version is left running untouched.
+        """
+        with self._lock:
+            old = self.extensions.get(name)
+            source = self._extension_sources.get(name)
+            if old is None or source is None:
+                print(f"Cannot reload {name}: extension not loaded")
+                return False
+            module_name, class_name, package = source
+            roots = (module_name, package) if package else (module_name,)
+            start = time.perf_counter()
+
+            try:
+                module, previous_modules = self._reimport(module_name, roots)
+            except Exception as e:
+                print(f"Reload of {name} failed: {e}")
+                return False
+            try:
+                extension = getattr(module, class_name)()
+            except Exception as e:
+                print(f"Reload of {name} failed: {e}")
+                self._restore_modules(roots, previous_modules)
+                return False
+
+            try:
+                owned = self._capture_on_load(extension, staged=True)
+            except Exception as e:
+                print(f"Reload of {name} failed in on_load, keeping previous version: {e}")
+                self._restore_modules(roots, previous_modules)
+                return False
+
+            # Only once the new version is ready is the old one taken down
+            try:
+                old.on_unload()
+            except Exception as e:
+                print(f"Error unloading {name}: {e}")
+            self._swap_extension(name, extension, owned)
+            if self.extension_loader is not None and name in self.extension_loader.classes:
+                self.extension_loader.classes[name] = type(extension)
+
+        self.log(f"Reloaded extension {name} in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return True
+
+    def _module_graph(self, roots):
+        """
+        Modules reloaded together with an extension: each root and, when it is a
+        package, its submodules. Siblings (e.g. other src.services modules) keep
+        their identity, so live services stay instances of the classes in use.
+        """
+        return [
+            n for n in sys.modules
+            if any(n == root or n.startswith(root + ".") for root in roots)
+            and not n.startswith(PROTECTED_MODULES)
+        ]
+
+    def _reimport(self, module_name, roots):
+        previous = {n: sys.modules[n] for n in self._module_graph(roots)}
+        for n in previous:
+            del sys.modules[n]
+        importlib.invalidate_caches()
+        try:
+            return importlib.import_module(module_name), previous
+        except Exception:
+            self._restore_modules(roots, previous)
+            raise
+
+    def _restore_modules(self, roots, previous):
+        for n in self._module_graph(roots):
+            del sys.modules[n]
+        sys.modules.update(previous)
+
+    def _capture_on_load(self, extension, staged):
+        owned = {"services": {}, "subscriptions": []}
+        self._staging.owned = owned
+        self._staging.staged = staged
+        try:
+            with global_event_bus.capture(paused=staged) as subs:
+                try:
+                    extension.on_load(self)
+                except Exception:
+                    for sub in subs:
+                        sub.unsubscribe()
+                    raise
+        finally:
+            self._staging.owned = None
+        owned["subscriptions"] = subs
+        return owned
+
+    def _swap_extension(self, name, extension, owned):
+        old = self._extension_owned.get(name, {"services": {}, "subscriptions": []})
+        for sub in old["subscriptions"]:
+            sub.unsubscribe()
+        for interface in old["services"]:
+            if interface not in owned["services"]:
+                Container.unregister(interface)
+        for interface, (instance, factory, depends) in owned["services"].items():
+            Container.unregister(interface)
+            if factory is not None:
+                Container.register_factory(interface, factory, depends)
+            else:
+                Container.register(interface, instance)
+        for sub in owned["subscriptions"]:
+            sub.paused = False
+        self.extensions[name] = extension
+        self._extension_owned[name] = owned
+        for interface in owned["services"]:
+            global_event_bus.publish("service_registered", interface)
+
+    def register_service(self, interface, instance=None, factory=None, depends=(), stop_on_shutdown=False):
+        """
+        Registers a core service available to all extensions.
+        Pass factory (and optionally depends, a list of service names) instead of an
+        instance to defer construction until the first get_service() call.
+        With stop_on_shutdown, the service's stop() is called by shutdown().
+        """
+        if stop_on_shutdown and interface not in self._stoppable:
+            self._stoppable.append(interface)
+        owned = getattr(self._staging, "owned", None)
+        if owned is not None:
+            # Called from an extension's on_load: remember it for reload_extension()
+            owned["services"][interface] = (instance, factory, depends)
+            if self._staging.staged:
+                return
+        if factory is not None:
+            Container.register_factory(interface, factory, depends)
+        else:
+            Container.register(interface, instance)
         global_event_bus.publish("service_registered", interface)
 
     def get_service(self, interface):
-        """Retrieves a registered service."""
-        return self.services.get(interface)
+        """Retrieves a registered service, building it first if it was registered lazily."""
+        return Container.get(interface)
+
+    def dump_event_stats(self, path=None):
+        """
+        Returns event bus counters and latency histograms (per topic and per subscriber).
+        If path is given the snapshot is also written there as JSON.
+        """
+        stats = global_event_bus.get_stats()
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(stats, f, indent=2)
+        return stats
 
     def shutdown(self):
-        """Gracefully unloads all extensions."""
+        """Gracefully unloads all extensions, then stops services (last registered first)."""
         for name, ext in self.extensions.items():
             try:
                 ext.on_unload()
             except Exception as e:
                 print(f"Error unloading {name}: {e}")
         self.extensions.clear()
+        for name in reversed(self._stoppable):
+            # Lazy services that were never built have nothing to stop
+            service = self.services.get(name)
+            if service is not None:
+                try:
+                    service.stop()
+                except Exception as e:
+                    print(f"Error stopping {name}: {e}")
+        global_event_bus.shutdown()
 
 # Global Kernel Accessor
 kernel = Kernel()
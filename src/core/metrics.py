@@ -0,0 +1,83 @@
+"""
+Metrics Primitives
+Lightweight counters and latency histograms for runtime instrumentation.
+"""
+import bisect
+import threading
+
+# Bucket upper bounds in milliseconds; the last bucket catches everything slower.
+DEFAULT_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram. Cheap enough to sit on every event dispatch."""
+    def __init__(self, bounds_ms=DEFAULT_BOUNDS_MS):
+        self.bounds_ms = tuple(bounds_ms)
+        self.buckets = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms):
+        self.buckets[bisect.bisect_left(self.bounds_ms, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, p):
+        """Upper bound (ms) of the bucket holding the p-th percentile."""
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100.0
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return self.bounds_ms[i] if i < len(self.bounds_ms) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self):
+        labels = [f"<={b}ms" for b in self.bounds_ms] + [f">{self.bounds_ms[-1]}ms"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": {label: n for label, n in zip(labels, self.buckets) if n},
+        }
+
+
+class StatsTable:
+    """Named counters plus a latency histogram per key, guarded by one lock."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}
+
+    def _row(self, key):
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = {"counters": {}, "latency": LatencyHistogram()}
+        return row
+
+    def incr(self, key, counter, n=1):
+        with self._lock:
+            counters = self._row(key)["counters"]
+            counters[counter] = counters.get(counter, 0) + n
+
+    def record(self, key, ms):
+        with self._lock:
+            self._row(key)["latency"].record(ms)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                key: dict(row["counters"], latency=row["latency"].to_dict())
+                for key, row in self._rows.items()
+            }
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
@@ -0,0 +1,24 @@
+"""
+Process Pools
+Worker processes for the CPU-bound services (find in files, trigram index).
+
+Workers are started with spawn (forkserver on Linux), never fork: the IDE
+process already runs the file watcher, the event bus pool and Tk, and a
+forked child inherits whatever locks those threads held. Entry points call
+multiprocessing.freeze_support() first, so workers of the frozen exe run
+their task instead of starting another IDE.
+"""
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+
+def pool_context():
+    """The multiprocessing context worker pools are started with."""
+    if sys.platform.startswith("linux") and not getattr(sys, "frozen", False):
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def process_pool(max_workers=None):
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=pool_context())
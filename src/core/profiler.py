@@ -0,0 +1,104 @@
+"""
+Boot Profiler
+Opt-in timeline of startup work, written as a Chrome trace / Perfetto JSON file.
+
+Enable with the FERVV_BOOT_PROFILE environment variable (value = output path)
+or the --profile-boot[=path] command line flag, then open the file in
+chrome://tracing or https://ui.perfetto.dev. Disabled spans cost one attribute check.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_TRACE_FILE = "boot_trace.json"
+
+
+class BootProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.output_path = None
+        self._events = []
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def enable(self, output_path=DEFAULT_TRACE_FILE):
+        self.enabled = True
+        self.output_path = output_path or DEFAULT_TRACE_FILE
+        self._events = []
+        self._origin = time.perf_counter()
+
+    def _now_us(self):
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    def _emit(self, event):
+        thread = threading.current_thread()
+        event["pid"] = os.getpid()
+        event["tid"] = thread.ident
+        with self._lock:
+            self._threads[thread.ident] = thread.name
+            self._events.append(event)
+
+    @contextmanager
+    def span(self, name, cat="boot", **args):
+        """Records a complete ("X") event around the with-block."""
+        if not self.enabled:
+            yield
+            return
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            event = {"name": name, "cat": cat, "ph": "X", "ts": start, "dur": self._now_us() - start}
+            if args:
+                event["args"] = args
+            self._emit(event)
+
+    def trace(self, func=None, *, name=None, cat="boot"):
+        """Decorator form of span(); the span is named after the function's qualname."""
+        if func is None:
+            return lambda f: self.trace(f, name=name, cat=cat)
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return func(*args, **kwargs)
+            with self.span(label, cat):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def mark(self, name, cat="boot"):
+        """Records an instant event, e.g. the first painted frame."""
+        if self.enabled:
+            self._emit({"name": name, "cat": cat, "ph": "i", "s": "g", "ts": self._now_us()})
+
+    def finish(self):
+        """Writes the trace file and stops recording. Returns the path written, if any."""
+        if not self.enabled:
+            return None
+        self.enabled = False
+        with self._lock:
+            events = list(self._events)
+            events.extend(
+                {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": tname}}
+                for tid, tname in self._threads.items()
+            )
+        try:
+            with open(self.output_path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+            print(f"Boot trace written to {self.output_path}")
+            return self.output_path
+        except Exception as e:
+            print(f"Boot trace write error: {e}")
+            return None
+
+
+boot_profiler = BootProfiler()
+
+_env_path = os.environ.get("FERVV_BOOT_PROFILE")
+if _env_path:
+    boot_profiler.enable(None if _env_path.lower() in ("1", "true", "yes") else _env_path)
@@ -0,0 +1,117 @@
+"""
+Async VFS Facade
+asyncio front-end over the VirtualFileSystem for bulk work (agent context
+building, indexing, search). Blocking VFS calls run on a bounded I/O thread
+pool and results are streamed back as async iterators in completion order,
+so reading 2,000 files overlaps their disk latency instead of paying it in turn.
+
+    avfs = kernel.get_service("AsyncVFS")
+    async for uri, text in avfs.read_many(uris):
+        ...
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+SKIP_DIRS = {"__pycache__", "node_modules"}
+
+
+def default_skip(name):
+    return name.startswith(".") or name in SKIP_DIRS
+
+
+class AsyncVFS:
+    def __init__(self, vfs, max_workers=16, max_in_flight=None):
+        self.vfs = vfs
+        self.max_workers = max_workers
+        # Caps queued work (and buffered results) regardless of how many paths are passed in
+        self.max_in_flight = max_in_flight or max_workers * 4
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vfs-io")
+
+    async def _map_unordered(self, fn, items):
+        """Runs fn(item) on the pool and yields (item, result) as each one completes."""
+        loop = asyncio.get_running_loop()
+        items = iter(items)
+        pending = {}
+
+        def fill():
+            while len(pending) < self.max_in_flight:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    return
+                pending[loop.run_in_executor(self._pool, fn, item)] = item
+
+        fill()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+                fill()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _read_text(self, uri):
+        try:
+            return self.vfs.read(uri)
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _read_bytes(self, uri):
+        try:
+            return self.vfs.read_bytes(uri)
+        except OSError:
+            return None
+
+    async def read(self, uri):
+        return await asyncio.get_running_loop().run_in_executor(self._pool, self._read_text, uri)
+
+    async def read_many(self, uris, binary=False):
+        """Yields (uri, content) as reads complete. Missing or undecodable files give None."""
+        async for uri, content in self._map_unordered(self._read_bytes if binary else self._read_text, uris):
+            yield uri, content
+
+    async def read_all(self, uris, binary=False):
+        """Reads every uri concurrently and returns {uri: content}."""
+        return {uri: content async for uri, content in self.read_many(uris, binary)}
+
+    async def stat_many(self, uris):
+        """Yields (uri, FileStat or None) as stats complete."""
+        async for uri, st in self._map_unordered(self.vfs.stat, uris):
+            yield uri, st
+
+    def _list_dir(self, uri):
+        """Returns (file_uris, dir_uris) directly under uri."""
+        provider, path = self.vfs.resolve(uri)
+        files, dirs = [], []
+        if provider.is_local:
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        (dirs if entry.is_dir() else files).append((entry.name, entry.path))
+            except OSError:
+                pass
+        else:
+            base = uri.rstrip("/")
+            for name in provider.list(path):
+                child = f"{base}/{name}"
+                st = self.vfs.stat(child)
+                (dirs if st is not None and st.is_dir else files).append((name, child))
+        return files, dirs
+
+    async def list_tree(self, uri, skip=default_skip):
+        """Yields every file uri below uri, listing directories concurrently."""
+        frontier = [uri]
+        while frontier:
+            next_frontier = []
+            async for _, (files, dirs) in self._map_unordered(self._list_dir, frontier):
+                for name, child in files:
+                    if not skip(name):
+                        yield child
+                next_frontier.extend(child for name, child in dirs if not skip(name))
+            frontier = next_frontier
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,106 @@
+"""
+Content Cache
+Shared LRU cache of local file contents, bounded by a byte budget.
+
+Entries are keyed by absolute path and validated against (mtime_ns, size, inode)
+on every lookup, so edits made outside the IDE are never served stale. Writes
+through the VFS or FileService invalidate their entry explicitly.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_BUDGET_BYTES = 64 * 1024 * 1024
+# A single file may take at most this share of the budget
+MAX_ENTRY_FRACTION = 0.25
+
+
+def stat_validator(st):
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class ContentCache:
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()  # key -> (validator, data)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    def read(self, path):
+        """Returns the file's bytes, from cache when the on-disk stat still matches."""
+        key = self.key(path)
+        st = os.stat(path)
+        validator = stat_validator(st)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == validator:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        with open(path, "rb") as f:
+            data = f.read()
+        self._put(key, validator, data)
+        return data
+
+    def _put(self, key, validator, data):
+        size = len(data)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            if size > self.budget_bytes * MAX_ENTRY_FRACTION:
+                return
+            self._entries[key] = (validator, data)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self):
+        while self._bytes > self.budget_bytes and self._entries:
+            _, (_, data) = self._entries.popitem(last=False)
+            self._bytes -= len(data)
+            self.evictions += 1
+
+    def invalidate(self, path):
+        with self._lock:
+            entry = self._entries.pop(self.key(path), None)
+            if entry is not None:
+                self._bytes -= len(entry[1])
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def set_budget(self, budget_bytes):
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            self._evict()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "budget_bytes": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# Shared by the VFS and FileService
+content_cache = ContentCache()
@@ -0,0 +1,34 @@
+"""
+Content-Defined Chunking
+Cuts data into chunks at line boundaries chosen by the content itself, so an
+edit only changes the chunks around it and insertions do not shift every
+later boundary. Used by the history store and remote delta writes.
+"""
+import zlib
+
+# Cut after a line whose crc32 has the bits of MASK clear, once the chunk is
+# at least MIN bytes; never let a chunk grow past MAX bytes
+CHUNK_MASK = 0x1F
+MIN_CHUNK_BYTES = 2 * 1024
+MAX_CHUNK_BYTES = 64 * 1024
+
+
+def chunk_boundaries(data, min_size=MIN_CHUNK_BYTES, max_size=MAX_CHUNK_BYTES, mask=CHUNK_MASK):
+    """Yields (start, end) offsets of the content-defined chunks of data."""
+    start = pos = 0
+    size = len(data)
+    while pos < size:
+        nl = data.find(b"\n", pos)
+        end = size if nl == -1 else nl + 1
+        if end - start > max_size:
+            # Cut before the line that overflows; a line longer than a chunk (or binary data) is split hard
+            cut = start + max_size if pos == start else pos
+            yield start, cut
+            start = pos = cut
+            continue
+        if end - start >= min_size and not zlib.crc32(data[pos:end]) & mask:
+            yield start, end
+            start = end
+        pos = end
+    if start < size:
+        yield start, size
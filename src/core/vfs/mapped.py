@@ -0,0 +1,175 @@
+"""
+Memory-Mapped Files
+Constant-memory access to large local files: byte ranges straight from an mmap
+and line paging through a sparse line-offset index built on first use.
+
+The index stores the start offset of every LINE_INDEX_STRIDE-th line, so a
+500 MB log with 10M lines costs ~300 KB of index; it is built chunk by chunk
+with bytes.split/accumulate, which keep the per-line work in C.
+
+Mappings are reference counted: one evicted or released while another thread
+still reads it is only unmapped when that read finishes.
+"""
+import mmap
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import accumulate
+
+LINE_INDEX_STRIDE = 256
+INDEX_CHUNK_BYTES = 16 * 1024 * 1024
+MAX_OPEN_MAPPINGS = 16
+
+
+class MappedFile:
+    def __init__(self, path):
+        self.path = path
+        st = os.stat(path)
+        self.validator = (st.st_mtime_ns, st.st_size, st.st_ino)
+        self.size = st.st_size
+        self._file = open(path, "rb")
+        # mmap refuses empty files
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self._index = None
+        self._line_count = 0
+        self._lock = threading.Lock()
+        # Guarded by the registry lock
+        self.refs = 0
+        self.retired = False
+
+    def read_range(self, offset, length):
+        if self._mm is None or offset >= self.size:
+            return b""
+        return self._mm[offset:min(offset + length, self.size)]
+
+    def _ensure_index(self):
+        with self._lock:
+            if self._index is None:
+                self._build_index()
+
+    def _build_index(self):
+        index = array("Q", [0])
+        newlines = 0
+        pos = 0
+        while pos < self.size:
+            end = min(pos + INDEX_CHUNK_BYTES, self.size)
+            chunk = self._mm[pos:end]
+            if end < self.size:
+                cut = chunk.rfind(b"\n")
+                if cut == -1:
+                    # One line longer than a chunk: keep scanning
+                    pos = end
+                    continue
+                chunk = chunk[:cut + 1]
+
+            parts = chunk.split(b"\n")
+            # Start offsets of the lines following each newline in this chunk
+            starts = list(accumulate((len(p) + 1 for p in parts[:-1]), initial=pos))[1:]
+            first = (-(newlines + 1)) % LINE_INDEX_STRIDE
+            index.extend(starts[first::LINE_INDEX_STRIDE])
+            newlines += len(starts)
+            pos += len(chunk)
+
+        ends_with_newline = self.size and self._mm[self.size - 1:self.size] == b"\n"
+        self._line_count = newlines if (not self.size or ends_with_newline) else newlines + 1
+        self._index = index
+
+    @property
+    def indexed(self):
+        """True once the line index is built (line paging no longer scans the file)."""
+        return self._index is not None
+
+    def line_count(self):
+        self._ensure_index()
+        return self._line_count
+
+    def line_offset(self, line):
+        """Byte offset where a 0-based line starts."""
+        self._ensure_index()
+        offset = self._index[line // LINE_INDEX_STRIDE]
+        for _ in range(line % LINE_INDEX_STRIDE):
+            offset = self._mm.find(b"\n", offset) + 1
+        return offset
+
+    def read_lines(self, start, count, encoding="utf-8", errors="replace"):
+        """Returns up to count lines (without line endings) beginning at 0-based line start."""
+        if start >= self.line_count() or count <= 0:
+            return []
+        offset = self.line_offset(start)
+        lines = []
+        for _ in range(min(count, self._line_count - start)):
+            nl = self._mm.find(b"\n", offset)
+            end = self.size if nl == -1 else nl
+            lines.append(self._mm[offset:end].decode(encoding, errors).rstrip("\r"))
+            offset = end + 1
+        return lines
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+
+class MappedFileRegistry:
+    """Keeps a few recently used mappings open; a changed file gets a fresh mapping."""
+    def __init__(self, limit=MAX_OPEN_MAPPINGS):
+        self.limit = limit
+        self._open = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    @contextmanager
+    def open(self, path):
+        """The current mapping of path, kept open until the with block ends."""
+        key = self._key(path)
+        st = os.stat(path)
+        validator = (st.st_mtime_ns, st.st_size, st.st_ino)
+        retired = []
+        with self._lock:
+            mapped = self._open.get(key)
+            if mapped is not None and mapped.validator == validator:
+                self._open.move_to_end(key)
+            else:
+                if mapped is not None:
+                    retired.append(self._open.pop(key))
+                mapped = self._open[key] = MappedFile(path)
+                while len(self._open) > self.limit:
+                    retired.append(self._open.popitem(last=False)[1])
+            mapped.refs += 1
+            retired = self._retire(retired)
+        self._close(retired)
+        try:
+            yield mapped
+        finally:
+            with self._lock:
+                mapped.refs -= 1
+                done = self._retire([mapped]) if mapped.retired else []
+            self._close(done)
+
+    def release(self, path):
+        """Unmaps a file, e.g. before it is rewritten (Windows cannot truncate mapped files)."""
+        with self._lock:
+            mapped = self._open.pop(self._key(path), None)
+            done = self._retire([mapped]) if mapped is not None else []
+        self._close(done)
+
+    @staticmethod
+    def _retire(mappings):
+        """Marks mappings as dropped (registry lock held); returns those nobody is reading."""
+        for mapped in mappings:
+            mapped.retired = True
+        return [mapped for mapped in mappings if mapped.refs == 0]
+
+    @staticmethod
+    def _close(mappings):
+        for mapped in mappings:
+            mapped.close()
+
+
+mapped_files = MappedFileRegistry()
@@ -0,0 +1,191 @@
+"""
+Overlay VFS
+Copy-on-write layer over the VirtualFileSystem for speculative edits.
+
+Writes and deletes stay in memory (deletes as whiteouts) and reads see them,
+so an agent can run a multi-step plan against its own changes without touching
+the disk, the file watcher, indexes or LSP. When the plan succeeds, commit()
+lands every change in one VFS transaction (one atomic batch, one vfs_write
+event); discard() throws it all away.
+
+    overlay = OverlayVFS(kernel.get_service("VFS"))
+    overlay.write("src/a.py", new_code)
+    print(overlay.diff())
+    overlay.commit()
+"""
+import difflib
+import io
+import os
+import threading
+import time
+
+from src.core.vfs.providers import FileStat, decode_text
+from src.core.vfs.vfs import SCHEME_SEPARATOR
+
+WHITEOUT = None
+
+
+class OverlayVFS:
+    def __init__(self, base):
+        self.base = base
+        self._changes = {}  # key -> (uri, bytes) or (uri, WHITEOUT)
+        self._lock = threading.Lock()
+
+    def _key(self, uri):
+        scheme, sep, rest = uri.partition(SCHEME_SEPARATOR)
+        if sep and scheme != "file":
+            return uri
+        return os.path.normcase(os.path.abspath(rest if sep else uri))
+
+    def _lookup(self, uri):
+        """Returns (found, data): data is WHITEOUT for deleted files."""
+        with self._lock:
+            entry = self._changes.get(self._key(uri))
+        if entry is None:
+            return False, None
+        return True, entry[1]
+
+    # --- VFS API ---
+
+    def read(self, uri):
+        data = self.read_bytes(uri)
+        if data is None:
+            return None
+        return decode_text(data)
+
+    def read_bytes(self, uri):
+        found, data = self._lookup(uri)
+        if found:
+            return data
+        return self.base.read_bytes(uri)
+
+    def write(self, uri, content):
+        data = content.encode("utf-8") if isinstance(content, str) else bytes(content)
+        with self._lock:
+            self._changes[self._key(uri)] = (uri, data)
+        return True
+
+    def delete(self, uri):
+        with self._lock:
+            self._changes[self._key(uri)] = (uri, WHITEOUT)
+        return True
+
+    def stat(self, uri):
+        found, data = self._lookup(uri)
+        if not found:
+            st = self.base.stat(uri)
+            if st is None and self._children(uri):
+                # Directory that only exists in the overlay
+                return FileStat(0, 0, is_dir=True)
+            return st
+        if data is WHITEOUT:
+            return None
+        return FileStat(len(data), time.time_ns())
+
+    def exists(self, uri):
+        return self.stat(uri) is not None
+
+    def _children(self, uri):
+        """Overlay entries directly inside directory uri: {name: data}."""
+        prefix = self._key(uri).replace(os.sep, "/").rstrip("/")
+        children = {}
+        with self._lock:
+            for key, (_uri, data) in self._changes.items():
+                parent, _, name = key.replace(os.sep, "/").rpartition("/")
+                if parent == prefix:
+                    children[name] = data
+        return children
+
+    def list(self, uri):
+        names = set(self.base.list(uri))
+        for name, data in self._children(uri).items():
+            if data is WHITEOUT:
+                names.discard(name)
+            else:
+                names.add(name)
+        return sorted(names)
+
+    def open_stream(self, uri):
+        found, data = self._lookup(uri)
+        if not found:
+            return self.base.open_stream(uri)
+        if data is WHITEOUT:
+            raise FileNotFoundError(uri)
+        return io.BytesIO(data)
+
+    def iter_lines(self, uri, encoding="utf-8", errors="replace"):
+        with self.open_stream(uri) as stream:
+            for raw in stream:
+                yield raw.decode(encoding, errors).rstrip("\r\n")
+
+    def read_lines(self, uri, start, count, encoding="utf-8", errors="replace"):
+        found, _ = self._lookup(uri)
+        if not found:
+            return self.base.read_lines(uri, start, count, encoding, errors)
+        return list(self.iter_lines(uri, encoding, errors))[start:start + count]
+
+    # --- overlay management ---
+
+    def changes(self):
+        """Returns {uri: "added" | "modified" | "deleted"} for everything pending."""
+        with self._lock:
+            entries = list(self._changes.values())
+        result = {}
+        for uri, data in entries:
+            exists = self.base.stat(uri) is not None
+            if data is WHITEOUT:
+                if exists:
+                    result[uri] = "deleted"
+            else:
+                result[uri] = "modified" if exists else "added"
+        return result
+
+    def diff(self, uri=None, context=3):
+        """Unified diff of the pending changes (of one uri, or all of them)."""
+        with self._lock:
+            entries = [e for k, e in self._changes.items() if uri is None or k == self._key(uri)]
+        chunks = []
+        for target, data in sorted(entries, key=lambda e: e[0]):
+            before = self.base.read_bytes(target)
+            old = decode_text(before, errors="replace") if before is not None else ""
+            new = decode_text(data, errors="replace") if data is not WHITEOUT else ""
+            if before is None and data is WHITEOUT:
+                continue
+            for line in difflib.unified_diff(
+                old.splitlines(keepends=True), new.splitlines(keepends=True),
+                fromfile="/dev/null" if before is None else f"a/{target}",
+                tofile="/dev/null" if data is WHITEOUT else f"b/{target}",
+                n=context,
+            ):
+                chunks.append(line if line.endswith("\n") else line + "\n\\ No newline at end of file\n")
+        return "".join(chunks)
+
+    def commit(self):
+        """Writes every pending change to the base VFS in one transaction. Returns the uris."""
+        with self._lock:
+            entries, self._changes = list(self._changes.values()), {}
+        if not entries:
+            return []
+        try:
+            with self.base.transaction(wait=True) as tx:
+                for uri, data in entries:
+                    if data is WHITEOUT:
+                        if self.base.stat(uri) is not None:
+                            tx.delete(uri)
+                    else:
+                        tx.write(uri, data)
+        except Exception:
+            # Keep the changes so the caller can retry or discard them
+            with self._lock:
+                for uri, data in entries:
+                    self._changes.setdefault(self._key(uri), (uri, data))
+            raise
+        return tx.future.result()
+
+    def discard(self):
+        with self._lock:
+            self._changes.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._changes)
@@ -0,0 +1,224 @@
+"""
+VFS Providers
+Storage backends mounted into the VirtualFileSystem by URI scheme.
+
+A provider works on bytes and provider-relative paths; the VFS handles URI
+parsing and text decoding. Built-ins: LocalProvider (file://, bare paths) and
+MemoryProvider (memory://). ZipProvider lives in zip_provider.py.
+"""
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+
+from src.core.vfs.cache import content_cache
+from src.core.vfs.mapped import mapped_files
+
+
+def decode_text(data, encoding="utf-8", errors="strict"):
+    """Decodes file bytes with universal newlines, as text-mode open() does."""
+    return data.decode(encoding, errors).replace("\r\n", "\n").replace("\r", "\n")
+
+
+def fsync_dir(directory):
+    """Makes renames inside directory durable (a no-op where directories cannot be opened)."""
+    if os.name == "nt":
+        return
+    fd = os.open(directory or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class FileStat:
+    __slots__ = ("size", "mtime_ns", "is_dir", "inode")
+
+    def __init__(self, size, mtime_ns, is_dir=False, inode=0):
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.is_dir = is_dir
+        self.inode = inode
+
+    def __repr__(self):
+        return f"FileStat(size={self.size}, mtime_ns={self.mtime_ns}, is_dir={self.is_dir})"
+
+
+class IFileSystemProvider(ABC):
+    # Providers backed by the OS file system expose real paths (used for caching, mmap)
+    is_local = False
+
+    @abstractmethod
+    def read(self, path) -> bytes:
+        """Returns the file's bytes. Raises FileNotFoundError if missing."""
+
+    @abstractmethod
+    def write(self, path, data: bytes):
+        """Replaces the file's content."""
+
+    @abstractmethod
+    def list(self, path):
+        """Returns the names directly inside a directory ([] if it is not one)."""
+
+    @abstractmethod
+    def stat(self, path):
+        """Returns a FileStat, or None if nothing exists at path."""
+
+    def open_stream(self, path):
+        """Returns a readable binary file object. Override to avoid loading everything."""
+        return io.BytesIO(self.read(path))
+
+    def exists(self, path):
+        return self.stat(path) is not None
+
+
+class LocalProvider(IFileSystemProvider):
+    is_local = True
+
+    def read(self, path):
+        return content_cache.read(path)
+
+    def write(self, path, data):
+        """Atomic replace: readers see the old or the new file, never a torn one."""
+        self.commit(self.stage(path, data), path)
+        fsync_dir(os.path.dirname(os.path.abspath(path)))
+
+    def stage(self, path, data, sync=True):
+        """Writes data to a temp file next to path and returns the temp path."""
+        directory, name = os.path.split(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Dot-prefixed so the file watcher and explorer ignore it
+        fd, temp = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            try:
+                os.chmod(temp, os.stat(path).st_mode & 0o7777)
+            except FileNotFoundError:
+                pass
+        except BaseException:
+            self.discard(temp)
+            raise
+        return temp
+
+    def commit(self, temp, path):
+        """Moves a staged temp file over path."""
+        # Windows cannot replace a file that is still mapped
+        mapped_files.release(path)
+        try:
+            os.replace(temp, path)
+        finally:
+            content_cache.invalidate(path)
+
+    def delete(self, path):
+        mapped_files.release(path)
+        try:
+            os.unlink(path)
+        finally:
+            content_cache.invalidate(path)
+
+    @staticmethod
+    def discard(temp):
+        try:
+            os.unlink(temp)
+        except OSError:
+            pass
+
+    def backup(self, path):
+        """Keeps the current file aside (a hard link where possible) for restore(); None if there is none."""
+        if not os.path.isfile(path):
+            return None
+        directory, name = os.path.split(os.path.abspath(path))
+        backup = os.path.join(directory, f".{name}.{uuid.uuid4().hex}.bak")
+        try:
+            os.link(path, backup)
+        except OSError:
+            shutil.copy2(path, backup)
+        return backup
+
+    def restore(self, backup, path):
+        """Puts back what backup() saved: the old file, or no file if there was none."""
+        if backup is not None:
+            try:
+                untouched = os.path.samefile(backup, path)
+            except OSError:
+                untouched = False
+            if untouched:
+                # Still the same inode: rename() between two links of one file is a no-op
+                self.discard(backup)
+            else:
+                self.commit(backup, path)
+        elif os.path.lexists(path):
+            self.delete(path)
+
+    def list(self, path):
+        if os.path.isdir(path):
+            return os.listdir(path)
+        return []
+
+    def stat(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return FileStat(st.st_size, st.st_mtime_ns, os.path.isdir(path), st.st_ino)
+
+    def open_stream(self, path):
+        return open(path, "rb")
+
+
+class MemoryProvider(IFileSystemProvider):
+    """
+    Process-local scratch storage for buffers and agent sandboxes.
+    Directories are implicit: they exist while any file lives below them.
+    """
+    def __init__(self):
+        self._files = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _norm(path):
+        return path.replace("\\", "/").strip("/")
+
+    def read(self, path):
+        with self._lock:
+            entry = self._files.get(self._norm(path))
+        if entry is None:
+            raise FileNotFoundError(path)
+        return entry[0]
+
+    def write(self, path, data):
+        with self._lock:
+            self._files[self._norm(path)] = (bytes(data), time.time_ns())
+
+    def delete(self, path):
+        with self._lock:
+            return self._files.pop(self._norm(path), None) is not None
+
+    def list(self, path):
+        prefix = self._norm(path)
+        prefix = prefix + "/" if prefix else ""
+        names = set()
+        with self._lock:
+            for key in self._files:
+                if key.startswith(prefix):
+                    names.add(key[len(prefix):].split("/", 1)[0])
+        return sorted(names)
+
+    def stat(self, path):
+        key = self._norm(path)
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is not None:
+                return FileStat(len(entry[0]), entry[1])
+            prefix = key + "/" if key else ""
+            if any(k.startswith(prefix) for k in self._files):
+                return FileStat(0, 0, is_dir=True)
+        return None
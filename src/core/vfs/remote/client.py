@@ -0,0 +1,285 @@
+"""
+Remote Provider
+VFS provider for workspaces served by fervv-vfs-server (see server.py).
+
+URIs look like fervv://host:port/path/inside/root, e.g.
+    vfs.read("fervv://buildbox:7878/src/main.py")
+
+One connection per server carries every request, tagged with an id, so calls
+from many threads (AsyncVFS, indexers) are pipelined instead of paying a round
+trip each. Payloads are zlib-compressed, stat results are cached for a short
+TTL, file contents are revalidated with a cheap "unchanged" reply, and writes
+to files the client has seen send only the chunks that changed.
+"""
+import hashlib
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from src.core.vfs.providers import FileStat, IFileSystemProvider
+from src.core.vfs.remote.protocol import (
+    DEFAULT_PORT, ProtocolError, RemoteError, chunk_signature, encode_frame, make_delta, read_frame,
+)
+
+STAT_TTL_SECONDS = 2.0
+STAT_CACHE_ENTRIES = 4096
+CONTENT_CACHE_BYTES = 32 * 1024 * 1024
+# Smaller files are always sent whole
+DELTA_MIN_FILE_BYTES = 8 * 1024
+REQUEST_TIMEOUT = 30.0
+# Server errnos re-raised as the matching local exception
+_ERRNO_EXCEPTIONS = {2: FileNotFoundError, 13: PermissionError, 20: NotADirectoryError, 21: IsADirectoryError}
+
+
+class _Connection:
+    def __init__(self, host, port, token=None):
+        self.sock = socket.create_connection((host, port), timeout=REQUEST_TIMEOUT)
+        self.sock.settimeout(None)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.rfile = self.sock.makefile("rb")
+        self._send_lock = threading.Lock()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._next_id = 1
+        self.closed = False
+        threading.Thread(target=self._read_loop, name=f"vfs-remote-{host}:{port}", daemon=True).start()
+        hello, _ = self.call({"op": "hello", "token": token})
+        if not hello.get("ok"):
+            self.close()
+            raise PermissionError(f"fervv://{host}:{port} rejected the token")
+
+    def request(self, message, body=b""):
+        """Sends a request without waiting. Returns a Future of (message, body)."""
+        future = Future()
+        with self._pending_lock:
+            if self.closed:
+                raise ConnectionError("remote VFS connection closed")
+            request_id = self._next_id
+            self._next_id += 1
+            self._pending[request_id] = future
+        frame = encode_frame(request_id, message, body)
+        try:
+            with self._send_lock:
+                self.sock.sendall(frame)
+        except OSError as e:
+            self._fail_all(e)
+            raise
+        return future
+
+    def call(self, message, body=b""):
+        return self.request(message, body).result(REQUEST_TIMEOUT)
+
+    def _read_loop(self):
+        try:
+            while True:
+                frame = read_frame(self.rfile)
+                if frame is None:
+                    raise ConnectionError("remote VFS server closed the connection")
+                request_id, message, body = frame
+                with self._pending_lock:
+                    future = self._pending.pop(request_id, None)
+                if future is None:
+                    continue
+                if "error" in message:
+                    errno = message.get("errno") or 0
+                    future.set_exception(_ERRNO_EXCEPTIONS.get(errno, RemoteError)(errno, message["error"]))
+                else:
+                    future.set_result((message, body))
+        except (ProtocolError, OSError, ValueError) as e:
+            self._fail_all(e)
+
+    def _fail_all(self, error):
+        with self._pending_lock:
+            self.closed = True
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError(f"remote VFS connection lost: {error}"))
+
+    def close(self):
+        self._fail_all("closed")
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+def _to_stat(info):
+    if info is None:
+        return None
+    return FileStat(info["size"], info["mtime_ns"], info["is_dir"])
+
+
+class RemoteProvider(IFileSystemProvider):
+    def __init__(self, token=None, stat_ttl=STAT_TTL_SECONDS, cache_bytes=CONTENT_CACHE_BYTES):
+        self.token = token if token is not None else os.environ.get("FERVV_VFS_TOKEN")
+        self.stat_ttl = stat_ttl
+        self.cache_bytes = cache_bytes
+        self._connections = {}
+        # address -> lock held while connecting, so one slow host only stalls its own callers
+        self._connect_locks = {}
+        self._stats = OrderedDict()  # (address, path) -> (expires_at, FileStat or None), oldest first
+        self._contents = OrderedDict()  # (address, path) -> (mtime_ns, size, data)
+        self._content_bytes = 0
+        self._lock = threading.Lock()
+
+    # --- plumbing ---
+
+    @staticmethod
+    def _split(path):
+        """'host:port/some/file' -> (('host', port), 'some/file')."""
+        address, _, rest = path.partition("/")
+        host, _, port = address.rpartition(":") if ":" in address else (address, "", "")
+        return (host, int(port or DEFAULT_PORT)), rest
+
+    def _connection(self, address):
+        with self._lock:
+            conn = self._connections.get(address)
+            if conn is not None and not conn.closed:
+                return conn
+            connect_lock = self._connect_locks.setdefault(address, threading.Lock())
+        # Connect and say hello outside _lock: cache lookups and other hosts carry on
+        with connect_lock:
+            with self._lock:
+                conn = self._connections.get(address)
+            if conn is None or conn.closed:
+                conn = _Connection(address[0], address[1], self.token)
+                with self._lock:
+                    self._connections[address] = conn
+            return conn
+
+    def _cache_stat(self, key, st):
+        now = time.monotonic()
+        with self._lock:
+            self._stats.pop(key, None)
+            self._stats[key] = (now + self.stat_ttl, st)
+            # Entries share one TTL, so the oldest are also the first to expire
+            while self._stats and (len(self._stats) > STAT_CACHE_ENTRIES or next(iter(self._stats.values()))[0] <= now):
+                self._stats.popitem(last=False)
+
+    def _cache_content(self, key, st, data):
+        with self._lock:
+            old = self._contents.pop(key, None)
+            if old is not None:
+                self._content_bytes -= len(old[2])
+            if len(data) > self.cache_bytes // 4:
+                return
+            self._contents[key] = (st.mtime_ns, st.size, data)
+            self._content_bytes += len(data)
+            while self._content_bytes > self.cache_bytes:
+                self._content_bytes -= len(self._contents.popitem(last=False)[1][2])
+
+    def _cached_content(self, key):
+        with self._lock:
+            entry = self._contents.get(key)
+            if entry is not None:
+                self._contents.move_to_end(key)
+            return entry
+
+    def _forget(self, key):
+        with self._lock:
+            self._stats.pop(key, None)
+            old = self._contents.pop(key, None)
+            if old is not None:
+                self._content_bytes -= len(old[2])
+
+    # --- provider API ---
+
+    def read(self, path):
+        address, rel = self._split(path)
+        key = (address, rel)
+        cached = self._cached_content(key)
+        message = {"op": "read", "path": rel}
+        if cached is not None:
+            message["have"] = [cached[0], cached[1]]
+        try:
+            reply, body = self._connection(address).call(message)
+        except FileNotFoundError:
+            self._forget(key)
+            raise
+        st = _to_stat(reply["stat"])
+        self._cache_stat(key, st)
+        if reply.get("unchanged"):
+            return cached[2]
+        self._cache_content(key, st, body)
+        return body
+
+    def write(self, path, data):
+        address, rel = self._split(path)
+        key = (address, rel)
+        conn = self._connection(address)
+        reply = None
+        if len(data) >= DELTA_MIN_FILE_BYTES:
+            reply = self._write_delta(conn, key, data)
+        if reply is None:
+            reply, _ = conn.call({"op": "write", "path": rel}, data)
+        st = _to_stat(reply["stat"])
+        self._cache_stat(key, st)
+        self._cache_content(key, st, data)
+
+    def _write_delta(self, conn, key, data):
+        """Sends only new chunks. Returns the reply, or None when a full write is needed."""
+        cached = self._cached_content(key)
+        if cached is not None:
+            base, signature = [cached[0], cached[1]], chunk_signature(cached[2])
+        else:
+            reply, _ = conn.call({"op": "signature", "path": key[1]})
+            if reply["stat"] is None:
+                return None
+            base, signature = [reply["stat"]["mtime_ns"], reply["stat"]["size"]], reply["signature"]
+        ops, literals = make_delta(data, signature)
+        if len(literals) > len(data) * 0.9:
+            return None
+        reply, _ = conn.call({
+            "op": "write_delta", "path": key[1], "base": base, "ops": ops,
+            "sha256": hashlib.sha256(data).hexdigest(),
+        }, literals)
+        # "stale": the file changed on the server since we saw it
+        return None if reply.get("stale") else reply
+
+    def delete(self, path):
+        address, rel = self._split(path)
+        self._forget((address, rel))
+        self._connection(address).call({"op": "delete", "path": rel})
+
+    def list(self, path):
+        address, rel = self._split(path)
+        reply, _ = self._connection(address).call({"op": "list", "path": rel})
+        return reply["names"]
+
+    def stat(self, path):
+        address, rel = self._split(path)
+        key = (address, rel)
+        with self._lock:
+            cached = self._stats.get(key)
+            if cached is not None and cached[0] <= time.monotonic():
+                del self._stats[key]
+                cached = None
+        if cached is not None:
+            return cached[1]
+        reply, _ = self._connection(address).call({"op": "stat", "path": rel})
+        st = _to_stat(reply["stat"])
+        self._cache_stat(key, st)
+        return st
+
+    def stat_many(self, paths):
+        """Stats many paths in one pipelined burst. Returns {path: FileStat or None}."""
+        futures = {}
+        for path in paths:
+            address, rel = self._split(path)
+            futures[path] = ((address, rel), self._connection(address).request({"op": "stat", "path": rel}))
+        result = {}
+        for path, (key, future) in futures.items():
+            st = _to_stat(future.result(REQUEST_TIMEOUT)[0]["stat"])
+            self._cache_stat(key, st)
+            result[path] = st
+        return result
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = list(self._connections.values()), {}
+        for conn in connections:
+            conn.close()
@@ -0,0 +1,137 @@
+"""
+Remote VFS Protocol
+Framing shared by RemoteProvider and the fervv-vfs-server.
+
+Frame:   !IIB header (payload length, request id, flags) + payload
+Payload: !I json length + UTF-8 JSON message + binary body (file content)
+Flags:   FLAG_ZLIB when the payload is zlib-compressed
+
+Request ids let a client keep many requests in flight on one connection;
+responses carry the id of their request and may arrive in any order.
+"""
+import hashlib
+import json
+import struct
+import zlib
+
+from src.core.vfs.chunking import chunk_boundaries
+
+HEADER = struct.Struct("!IIB")
+JSON_LENGTH = struct.Struct("!I")
+FLAG_ZLIB = 0x01
+# Payloads smaller than this are not worth compressing
+COMPRESS_MIN_BYTES = 512
+MAX_FRAME_BYTES = 512 * 1024 * 1024
+DEFAULT_PORT = 7878
+
+# Delta writes use smaller chunks than the history store: less to resend per edit
+DELTA_MIN_CHUNK = 512
+DELTA_MAX_CHUNK = 16 * 1024
+DELTA_MASK = 0x0F
+OP_COPY, OP_DATA = 0, 1
+
+
+class ProtocolError(Exception):
+    pass
+
+
+class RemoteError(OSError):
+    """An operation failed on the server (carries the server-side errno when known)."""
+
+
+def encode_frame(request_id, message, body=b"", compress=True):
+    encoded = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    payload = JSON_LENGTH.pack(len(encoded)) + encoded + body
+    flags = 0
+    if compress and len(payload) >= COMPRESS_MIN_BYTES:
+        packed = zlib.compress(payload, 1)
+        if len(packed) < len(payload):
+            payload, flags = packed, FLAG_ZLIB
+    return HEADER.pack(len(payload), request_id, flags) + payload
+
+
+def read_frame(stream):
+    """Reads one frame from a buffered binary stream. Returns (request_id, message, body), or None at EOF."""
+    header = stream.read(HEADER.size)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        raise ProtocolError("truncated frame header")
+    length, request_id, flags = HEADER.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise ProtocolError(f"frame too large: {length} bytes")
+    payload = stream.read(length)
+    if len(payload) < length:
+        raise ProtocolError("truncated frame")
+    if flags & FLAG_ZLIB:
+        payload = _inflate(payload)
+    (json_length,) = JSON_LENGTH.unpack_from(payload)
+    end = JSON_LENGTH.size + json_length
+    message = json.loads(payload[JSON_LENGTH.size:end].decode("utf-8"))
+    return request_id, message, payload[end:]
+
+
+def _inflate(payload):
+    """Decompresses a frame payload, refusing to inflate it past MAX_FRAME_BYTES."""
+    inflater = zlib.decompressobj()
+    try:
+        data = inflater.decompress(payload, MAX_FRAME_BYTES)
+    except zlib.error as e:
+        raise ProtocolError(f"bad compressed frame: {e}")
+    if inflater.unconsumed_tail:
+        raise ProtocolError(f"compressed frame inflates past {MAX_FRAME_BYTES} bytes")
+    if not inflater.eof:
+        raise ProtocolError("truncated compressed frame")
+    return data
+
+
+# --- delta writes ---
+# The file is cut into content-defined chunks on both sides; the writer sends
+# references to chunks the server already has plus the bytes of the new ones.
+
+def _digest(piece):
+    return hashlib.blake2b(piece, digest_size=16).hexdigest()
+
+
+def _chunks(data):
+    return [data[start:end] for start, end in chunk_boundaries(data, DELTA_MIN_CHUNK, DELTA_MAX_CHUNK, DELTA_MASK)]
+
+
+def chunk_signature(data):
+    """Digests of the delta chunks of data, in order."""
+    return [_digest(piece) for piece in _chunks(data)]
+
+
+def make_delta(data, signature):
+    """
+    Encodes data against a remote file's signature.
+    Returns (ops, literals): ops is a list of [OP_COPY, chunk_index] and [OP_DATA, length].
+    """
+    known = {}
+    for index, digest in enumerate(signature):
+        known.setdefault(digest, index)
+    ops, literals = [], []
+    for piece in _chunks(data):
+        index = known.get(_digest(piece))
+        if index is not None:
+            ops.append([OP_COPY, index])
+        elif ops and ops[-1][0] == OP_DATA:
+            ops[-1][1] += len(piece)
+            literals.append(piece)
+        else:
+            ops.append([OP_DATA, len(piece)])
+            literals.append(piece)
+    return ops, b"".join(literals)
+
+
+def apply_delta(base, ops, literals):
+    pieces = _chunks(base)
+    out = []
+    pos = 0
+    for kind, value in ops:
+        if kind == OP_COPY:
+            out.append(pieces[value])
+        else:
+            out.append(literals[pos:pos + value])
+            pos += value
+    return b"".join(out)
@@ -0,0 +1,188 @@
+"""
+Remote VFS Server (fervv-vfs-server)
+Serves one workspace root to RemoteProvider clients over the framed protocol.
+
+    python -m src.core.vfs.remote.server --root /srv/project --port 7878 [--token SECRET]
+
+Reads of one connection run concurrently on a thread pool, so pipelined
+requests overlap their disk latency; writes and deletes run in arrival order.
+Files are replaced atomically through the same LocalProvider the IDE uses.
+Paths are relative to the root and may not escape it. Binding anything but
+a loopback address requires a token.
+"""
+import argparse
+import hashlib
+import hmac
+import ipaddress
+import os
+import socketserver
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.vfs.providers import LocalProvider
+from src.core.vfs.remote.protocol import (
+    DEFAULT_PORT, ProtocolError, apply_delta, chunk_signature, encode_frame, read_frame,
+)
+
+MUTATING_OPS = {"write", "write_delta", "delete"}
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        # "" (every interface) or a host name that may resolve anywhere
+        return False
+
+
+class WorkspaceServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, root, address=("127.0.0.1", DEFAULT_PORT), token=None, max_workers=16):
+        if not token and not is_loopback(address[0]):
+            raise ValueError(f"refusing to serve {address[0]!r} without a token: anyone could read and write the root")
+        self.root = os.path.realpath(root)
+        self.token = token
+        self.local = LocalProvider()
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vfs-server")
+        super().__init__(address, _ConnectionHandler)
+
+    def _resolve(self, path):
+        full = os.path.realpath(os.path.join(self.root, path.lstrip("/")))
+        if full != self.root and not full.startswith(self.root + os.sep):
+            raise PermissionError(13, "path escapes the workspace root", path)
+        return full
+
+    def check_token(self, token):
+        if not self.token:
+            return True
+        if not isinstance(token, str):
+            return False
+        return hmac.compare_digest(token.encode("utf-8"), self.token.encode("utf-8"))
+
+    def _stat(self, full):
+        st = self.local.stat(full)
+        if st is None:
+            return None
+        return {"size": st.size, "mtime_ns": st.mtime_ns, "is_dir": st.is_dir}
+
+    def handle_request(self, message, body):
+        """Runs one operation. Returns (response message, response body)."""
+        op = message.get("op")
+        full = self._resolve(message.get("path", ""))
+
+        if op == "stat":
+            return {"stat": self._stat(full)}, b""
+        if op == "list":
+            return {"names": sorted(self.local.list(full))}, b""
+        if op == "read":
+            st = self._stat(full)
+            if st is None:
+                raise FileNotFoundError(2, "No such file", message["path"])
+            if message.get("have") == [st["mtime_ns"], st["size"]]:
+                return {"stat": st, "unchanged": True}, b""
+            return {"stat": st}, self.local.read(full)
+        if op == "signature":
+            data = self.local.read(full) if os.path.isfile(full) else b""
+            return {"stat": self._stat(full), "signature": chunk_signature(data)}, b""
+        if op == "write":
+            self.local.write(full, body)
+            return {"stat": self._stat(full)}, b""
+        if op == "write_delta":
+            st = self._stat(full)
+            if st is None or message.get("base") != [st["mtime_ns"], st["size"]]:
+                return {"stale": True}, b""
+            data = apply_delta(self.local.read(full), message["ops"], body)
+            if hashlib.sha256(data).hexdigest() != message["sha256"]:
+                return {"stale": True}, b""
+            self.local.write(full, data)
+            return {"stat": self._stat(full)}, b""
+        if op == "delete":
+            self.local.delete(full)
+            return {}, b""
+        raise ProtocolError(f"unknown op: {op}")
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _ConnectionHandler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        self._send_lock = threading.Lock()
+        self._authed = not self.server.token
+
+    def handle(self):
+        try:
+            while True:
+                frame = read_frame(self.rfile)
+                if frame is None:
+                    return
+                request_id, message, body = frame
+                if message.get("op") == "hello":
+                    self._authed = self._authed or self.server.check_token(message.get("token"))
+                    self._send(request_id, {"ok": self._authed, "root": os.path.basename(self.server.root)})
+                elif not self._authed:
+                    self._send(request_id, {"error": "not authenticated", "errno": 13})
+                elif message.get("op") in MUTATING_OPS:
+                    self._respond(request_id, message, body)
+                else:
+                    self.server.pool.submit(self._respond, request_id, message, body)
+        except (ProtocolError, ConnectionError, OSError) as e:
+            print(f"VFS server: connection closed ({e})")
+
+    def _respond(self, request_id, message, body):
+        try:
+            response, out = self.server.handle_request(message, body)
+        except OSError as e:
+            response, out = {"error": e.strerror or str(e), "errno": e.errno}, b""
+        except Exception as e:
+            response, out = {"error": str(e)}, b""
+        try:
+            self._send(request_id, response, out)
+        except OSError:
+            pass
+
+    def _send(self, request_id, message, body=b""):
+        frame = encode_frame(request_id, message, body)
+        with self._send_lock:
+            self.wfile.write(frame)
+            self.wfile.flush()
+
+
+def serve_in_thread(root, host="127.0.0.1", port=0, token=None):
+    """Starts a server on a background thread (port 0 picks a free one). Returns (server, port)."""
+    server = WorkspaceServer(root, (host, port), token)
+    threading.Thread(target=server.serve_forever, name="vfs-server", daemon=True).start()
+    return server, server.server_address[1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="fervv-vfs-server", description="Serve a workspace to remote AI Fervv clients")
+    parser.add_argument("--root", default=".", help="workspace root to serve (default: cwd)")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: loopback only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--token", default=os.environ.get("FERVV_VFS_TOKEN"), help="shared secret clients must send")
+    args = parser.parse_args(argv)
+
+    try:
+        server = WorkspaceServer(args.root, (args.host, args.port), args.token)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Serving {server.root} on {args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,58 +1,183 @@
 """
 Virtual File System (VFS)
 Abstracts file access to allow memory/local/remote operations.
+
+URIs are routed to a provider by scheme (see providers.py):
+    /abs/path, file:///abs/path       -> LocalProvider
+    memory://scratch/notes.txt         -> MemoryProvider
+    zip:///abs/lib.whl!/pkg/mod.py     -> ZipProvider (read-only)
+    fervv://host:port/path             -> RemoteProvider (fervv-vfs-server)
+Further providers can be added with mount().
+
+Writes go through a write-behind queue (write_queue.py): write() waits for
+the atomic replace, write_async() returns a Future, transaction() groups files.
+
+Large files can be paged instead of loaded whole: open_stream(), iter_lines(),
+read_range() and read_lines() run in constant memory, backed by mmap and a
+lazily built line index for local files.
 """
-import os
+import io
 from src.core.interfaces.extension import IExtension
-from src.core.event_bus import global_event_bus
+from src.core.profiler import boot_profiler
+from src.core.vfs.providers import LocalProvider, MemoryProvider, decode_text
+from src.core.vfs.zip_provider import ZipProvider
+from src.core.vfs.remote.client import RemoteProvider
+from src.core.vfs.mapped import mapped_files
+from src.core.vfs.write_queue import Transaction, write_queue
+
+SCHEME_SEPARATOR = "://"
+
 
 class VirtualFileSystem(IExtension):
+    @boot_profiler.trace
     def __init__(self):
-        self.mounts = {} # Point -> Provider
-        
+        self.mounts = {} # Scheme -> Provider
+        self.write_queue = write_queue
+        self.local = LocalProvider()
+        self.mount("file", self.local)
+        self.mount("memory", MemoryProvider())
+        self.mount("zip", ZipProvider())
+        # Connects on first use
+        self.mount("fervv", RemoteProvider())
+
     def on_load(self, kernel):
-        kernel.register_service("VFS", self)
+        kernel.register_service("VFS", self, stop_on_shutdown=True)
         print("VFS Mounted")
 
     def on_unload(self):
-        pass
+        for provider in self.mounts.values():
+            close = getattr(provider, "close", None)
+            if close:
+                close()
+
+    def stop(self):
+        """Waits for queued writes to reach disk and stops the writer (called on kernel shutdown)."""
+        self.write_queue.stop()
+
+    def mount(self, scheme, provider):
+        """Routes every URI of the given scheme to provider."""
+        self.mounts[scheme] = provider
+
+    def unmount(self, scheme):
+        return self.mounts.pop(scheme, None)
+
+    def resolve(self, uri):
+        """Returns (provider, provider_path) for a URI. Bare paths are local."""
+        scheme, sep, rest = uri.partition(SCHEME_SEPARATOR)
+        if not sep or scheme not in self.mounts:
+            return self.local, uri
+        return self.mounts[scheme], rest
 
     def read(self, uri):
-        """Reads file content from URI."""
-        # Simple local implementation for now, expandable to mock:// or ssh://
-        if uri.startswith("file://"):
-            path = uri.replace("file://", "")
-        else:
-            path = uri
-            
-        if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                return f.read()
-        return None
+        """Reads file content from URI as text. Returns None if it does not exist."""
+        data = self.read_bytes(uri)
+        if data is None:
+            return None
+        return decode_text(data)
+
+    def read_bytes(self, uri):
+        provider, path = self.resolve(uri)
+        try:
+            return provider.read(path)
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return None
 
     def write(self, uri, content):
-        """Writes content to URI."""
-        if uri.startswith("file://"):
-            path = uri.replace("file://", "")
-        else:
-            path = uri
-            
+        """Writes content (str or bytes) to URI and waits until it is on disk."""
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            global_event_bus.publish("vfs_write", uri)
+            self.write_async(uri, content).result()
             return True
         except Exception as e:
             print(f"VFS Write Error: {e}")
             return False
 
+    def write_async(self, uri, content):
+        """Queues a write; returns a Future resolving to [uri] (or raising the write error)."""
+        return self.write_queue.submit([self.prepare_write(uri, content)])
+
+    def delete(self, uri):
+        """Deletes the file at URI through the write queue."""
+        try:
+            self.write_queue.submit([self.prepare_write(uri, None)]).result()
+            return True
+        except Exception as e:
+            print(f"VFS Delete Error: {e}")
+            return False
+
+    def prepare_write(self, uri, content):
+        """Builds a write-queue op; content None means delete."""
+        provider, path = self.resolve(uri)
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        return provider, path, data, uri
+
+    def transaction(self, wait=False):
+        """Context manager grouping writes into one atomic batch and one vfs_write event."""
+        return Transaction(self, wait)
+
     def list(self, uri):
         """Lists directory content."""
-        if uri.startswith("file://"):
-            path = uri.replace("file://", "")
-        else:
-            path = uri
-            
-        if os.path.isdir(path):
-            return os.listdir(path)
-        return []
+        provider, path = self.resolve(uri)
+        return provider.list(path)
+
+    def stat(self, uri):
+        """Returns a FileStat, or None if nothing exists at URI."""
+        provider, path = self.resolve(uri)
+        return provider.stat(path)
+
+    def open_stream(self, uri):
+        """Opens URI as a readable binary stream (caller closes it)."""
+        provider, path = self.resolve(uri)
+        return provider.open_stream(path)
+
+    def iter_lines(self, uri, encoding="utf-8", errors="replace"):
+        """Yields the lines of URI (without line endings) while reading it as a stream."""
+        with self.open_stream(uri) as stream:
+            for raw in stream:
+                yield raw.decode(encoding, errors).rstrip("\r\n")
+
+    def read_range(self, uri, offset, length):
+        """Returns up to length bytes starting at offset."""
+        provider, path = self.resolve(uri)
+        if provider.is_local:
+            with mapped_files.open(path) as mapped:
+                return mapped.read_range(offset, length)
+        with provider.open_stream(path) as stream:
+            if stream.seekable():
+                stream.seek(offset)
+            else:
+                self._skip(stream, offset)
+            return stream.read(length)
+
+    @staticmethod
+    def _skip(stream, count):
+        while count > 0:
+            chunk = stream.read(min(count, io.DEFAULT_BUFFER_SIZE * 16))
+            if not chunk:
+                break
+            count -= len(chunk)
+
+    def line_count(self, uri):
+        provider, path = self.resolve(uri)
+        if provider.is_local:
+            with mapped_files.open(path) as mapped:
+                return mapped.line_count()
+        return sum(1 for _ in self.iter_lines(uri))
+
+    def read_lines(self, uri, start, count, encoding="utf-8", errors="replace", block=True):
+        """
+        Returns up to count lines beginning at 0-based line start (a page of a large file).
+        With block=False, returns None rather than build a local file's line index.
+        """
+        provider, path = self.resolve(uri)
+        if provider.is_local:
+            with mapped_files.open(path) as mapped:
+                if not block and not mapped.indexed:
+                    return None
+                return mapped.read_lines(start, count, encoding, errors)
+        lines = []
+        for number, line in enumerate(self.iter_lines(uri, encoding, errors)):
+            if number >= start + count:
+                break
+            if number >= start:
+                lines.append(line)
+        return lines
@@ -0,0 +1,252 @@
+"""
+Write Queue
+Write-behind pipeline for VFS writes. Callers get a Future back immediately;
+a single worker thread makes the writes durable and atomic.
+
+Local files are written to a temp file in the target directory, fsynced and
+renamed over the original, so a crash leaves either the old or the new content.
+A transaction stages all of its files before the first rename, so a failed
+write (disk full, permissions) leaves every file of the transaction untouched.
+Each file it replaces or deletes is kept aside until the last one has landed;
+if a rename fails midway, the files already committed are put back. Providers
+without staging (memory, remote) are rolled back by rewriting the old bytes.
+Everything queued while the worker was busy is handled as one batch, and each
+directory touched by the batch is fsynced once.
+
+Every completed write or transaction publishes one "vfs_write" event carrying
+the list of written uris.
+"""
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+from src.core.event_bus import global_event_bus
+from src.core.vfs.providers import fsync_dir
+
+MAX_BATCH = 256
+
+
+class RollbackError(OSError):
+    """A transaction failed and some of its files could not be put back; paths lists them."""
+    def __init__(self, paths):
+        super().__init__(f"write failed and {len(paths)} file(s) could not be restored: {', '.join(paths)}")
+        self.paths = paths
+
+
+class WriteQueue:
+    def __init__(self, max_batch=MAX_BATCH, durable=True):
+        self.max_batch = max_batch
+        # durable=False skips fsyncs (tests, scratch workspaces); renames stay atomic
+        self.durable = durable
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._hooks = []
+        self._commit_hooks = []
+
+    def add_hook(self, hook, after_commit=False):
+        """
+        hook(provider, path, data, uri) runs on the writer thread for each file: before
+        it is replaced, or with after_commit once its whole transaction has landed
+        (never for a transaction that failed or was rolled back).
+        """
+        (self._commit_hooks if after_commit else self._hooks).append(hook)
+
+    def submit(self, ops):
+        """
+        Queues one transaction: a list of (provider, path, data, uri); data None deletes.
+        Returns a Future resolving to the list of written uris.
+        """
+        future = Future()
+        if threading.current_thread() is self._thread:
+            # Re-entrant write (e.g. an inline vfs_write handler): waiting on the queue would deadlock
+            self._process([(ops, future)])
+            return future
+        self._ensure_worker()
+        self._queue.put((ops, future))
+        return future
+
+    def flush(self, timeout=None):
+        """Blocks until everything queued so far has been written."""
+        self.submit([]).result(timeout)
+
+    def stop(self, timeout=None):
+        """Writes everything queued so far, then ends the worker (a later submit starts a new one)."""
+        with self._lock:
+            thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self.flush(timeout)
+        self._queue.put(None)
+        thread.join(timeout)
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="vfs-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    # stop(): finish this batch, then exit
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            self._process(batch)
+
+    def _process(self, batch):
+        done = []
+        directories = set()
+        for ops, future in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                directories.update(self._apply(ops))
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                done.append((ops, future))
+
+        if self.durable:
+            for directory in directories:
+                try:
+                    fsync_dir(directory)
+                except OSError as e:
+                    print(f"VFS fsync error for {directory}: {e}")
+
+        for ops, future in done:
+            self._run_hooks(self._commit_hooks, ops)
+            uris = [op[3] for op in ops]
+            future.set_result(uris)
+            if uris:
+                global_event_bus.publish("vfs_write", uris)
+
+    def _apply(self, ops):
+        """Writes one transaction; returns the local directories that need an fsync."""
+        staged = []
+        try:
+            for provider, path, data, _uri in ops:
+                if data is not None and hasattr(provider, "stage"):
+                    staged.append((provider, provider.stage(path, data, sync=self.durable), path))
+                else:
+                    staged.append((provider, None, path))
+        except BaseException:
+            for provider, temp, _path in staged:
+                if temp is not None:
+                    provider.discard(temp)
+            raise
+
+        self._run_hooks(self._hooks, ops)
+
+        # A single write is already atomic; only transactions need a way back
+        keep = len(ops) > 1
+        applied = []  # (provider, path, backup) in commit order
+        directories = set()
+        try:
+            for (provider, temp, path), op in zip(staged, ops):
+                if keep:
+                    applied.append((provider, path, self._backup(provider, path)))
+                if op[2] is None:
+                    provider.delete(path)
+                    if provider.is_local:
+                        directories.add(os.path.dirname(os.path.abspath(path)))
+                elif temp is None:
+                    # Providers without staging (memory, remote) write in one call
+                    provider.write(path, op[2])
+                else:
+                    provider.commit(temp, path)
+                    directories.add(os.path.dirname(os.path.abspath(path)))
+        except BaseException as e:
+            unrestored = self._rollback(applied)
+            for provider, temp, _path in staged:
+                if temp is not None:
+                    provider.discard(temp)
+            if unrestored:
+                raise RollbackError(unrestored) from e
+            raise
+        for provider, _path, backup in applied:
+            if backup is not None and hasattr(provider, "backup"):
+                provider.discard(backup)
+        return directories
+
+    @staticmethod
+    def _run_hooks(hooks, ops):
+        for op in ops:
+            for hook in hooks:
+                try:
+                    hook(*op)
+                except Exception as e:
+                    print(f"VFS write hook error: {e}")
+
+    @staticmethod
+    def _backup(provider, path):
+        """A local backup file path, the old bytes for other providers, or None if path is new."""
+        if hasattr(provider, "backup"):
+            return provider.backup(path)
+        return provider.read(path) if provider.exists(path) else None
+
+    @staticmethod
+    def _rollback(applied):
+        """Restores applied files; returns the paths that could not be."""
+        unrestored = []
+        for provider, path, backup in reversed(applied):
+            try:
+                if hasattr(provider, "restore"):
+                    provider.restore(backup, path)
+                elif backup is None:
+                    if provider.exists(path):
+                        provider.delete(path)
+                else:
+                    provider.write(path, backup)
+            except Exception as e:
+                print(f"VFS rollback error for {path}: {e}")
+                unrestored.append(path)
+        return unrestored
+
+
+class Transaction:
+    """
+    Groups VFS writes so they land together:
+
+        with vfs.transaction() as tx:
+            tx.write("a.py", new_a)
+            tx.write("b.py", new_b)
+        tx.future.result()  # optional: wait for durability
+    """
+    def __init__(self, vfs, wait=False):
+        self.vfs = vfs
+        self.wait = wait
+        self.ops = []
+        self.future = None
+
+    def write(self, uri, content):
+        self.ops.append(self.vfs.prepare_write(uri, content))
+
+    def delete(self, uri):
+        self.ops.append(self.vfs.prepare_write(uri, None))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            # Nothing was written yet: dropping the ops aborts the transaction
+            return False
+        self.future = self.vfs.write_queue.submit(self.ops)
+        if self.wait:
+            self.future.result()
+        return False
+
+
+write_queue = WriteQueue()
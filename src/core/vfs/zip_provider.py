@@ -0,0 +1,114 @@
+"""
+Zip Archive Provider
+Read-only access to files inside zip archives (wheels, jars, vendored bundles)
+without extracting them.
+
+URIs look like zip:///path/to/archive.whl!/package/module.py
+Archives are opened once and kept while their mtime is unchanged; the member
+table is indexed into directories lazily, on the first list() call.
+"""
+import os
+import threading
+import zipfile
+from datetime import datetime
+
+from src.core.vfs.providers import IFileSystemProvider, FileStat
+
+ARCHIVE_SEPARATOR = "!/"
+
+
+class _Archive:
+    def __init__(self, path, mtime_ns):
+        self.zip = zipfile.ZipFile(path)
+        self.mtime_ns = mtime_ns
+        self._dirs = None
+
+    def dirs(self):
+        """dir -> child names, built once from the member table."""
+        if self._dirs is None:
+            dirs = {"": set()}
+            for name in self.zip.namelist():
+                parts = name.rstrip("/").split("/")
+                for i in range(len(parts)):
+                    parent = "/".join(parts[:i])
+                    dirs.setdefault(parent, set()).add(parts[i])
+                    if i < len(parts) - 1 or name.endswith("/"):
+                        dirs.setdefault("/".join(parts[:i + 1]), set())
+            self._dirs = dirs
+        return self._dirs
+
+
+class ZipProvider(IFileSystemProvider):
+    def __init__(self):
+        self._archives = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def split(path):
+        """'/a/b.zip!/x/y.py' -> ('/a/b.zip', 'x/y.py')"""
+        archive, _, member = path.partition(ARCHIVE_SEPARATOR)
+        return archive, member.strip("/")
+
+    def _archive(self, archive_path):
+        mtime_ns = os.stat(archive_path).st_mtime_ns
+        with self._lock:
+            archive = self._archives.get(archive_path)
+            if archive is None or archive.mtime_ns != mtime_ns:
+                if archive is not None:
+                    archive.zip.close()
+                    del self._archives[archive_path]
+                try:
+                    archive = _Archive(archive_path, mtime_ns)
+                except zipfile.BadZipFile:
+                    raise NotADirectoryError(f"not a zip archive: {archive_path}")
+                self._archives[archive_path] = archive
+            return archive
+
+    def read(self, path):
+        archive_path, member = self.split(path)
+        try:
+            return self._archive(archive_path).zip.read(member)
+        except KeyError:
+            raise FileNotFoundError(path)
+
+    def write(self, path, data):
+        raise PermissionError(f"zip archives are read-only: {path}")
+
+    def delete(self, path):
+        raise PermissionError(f"zip archives are read-only: {path}")
+
+    def list(self, path):
+        archive_path, member = self.split(path)
+        try:
+            return sorted(self._archive(archive_path).dirs().get(member, ()))
+        except (FileNotFoundError, NotADirectoryError):
+            # Missing archive or not a zip: like any other non-directory
+            return []
+
+    def stat(self, path):
+        archive_path, member = self.split(path)
+        try:
+            archive = self._archive(archive_path)
+        except OSError:
+            return None
+        try:
+            info = archive.zip.getinfo(member)
+        except KeyError:
+            if member in archive.dirs():
+                return FileStat(0, archive.mtime_ns, is_dir=True)
+            return None
+        mtime_ns = int(datetime(*info.date_time).timestamp() * 1_000_000_000)
+        return FileStat(info.file_size, mtime_ns)
+
+    def open_stream(self, path):
+        archive_path, member = self.split(path)
+        try:
+            return self._archive(archive_path).zip.open(member)
+        except KeyError:
+            raise FileNotFoundError(path)
+
+    def close(self):
+        with self._lock:
+            for archive in self._archives.values():
+                archive.zip.close()
+            self._archives.clear()
@@ -0,0 +1,20 @@
+"""
+Workspace
+Locates the open workspace and its per-workspace state directory (.fervv/),
+where services keep history, indexes and other derived data.
+"""
+import os
+
+STATE_DIR_NAME = ".fervv"
+
+
+def workspace_root():
+    """The workspace is the folder the IDE (or headless kernel) was started in."""
+    return os.getcwd()
+
+
+def state_dir(*parts, root=None):
+    """Returns (and creates) a directory under <workspace>/.fervv/."""
+    path = os.path.join(root or workspace_root(), STATE_DIR_NAME, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
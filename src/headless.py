@@ -0,0 +1,124 @@
+"""
+Headless Kernel
+Boots the kernel and non-UI services without Tk, for scripting, batch jobs and
+service benchmarks.
+
+Python API:
+    from src.headless import HeadlessKernel
+    with HeadlessKernel(workspace=".") as hk:
+        print(hk.run_goal("Summarise README.md"))
+
+CLI:
+    python -m src.headless goal "Add a docstring to utils.py"
+    python -m src.headless index [path]
+    python -m src.headless search PATTERN [path] [--regex]
+    python -m src.headless stats
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from src.core.kernel.kernel import kernel
+from src.core.kernel.bootstrap import bootstrap_kernel
+from src.services.search_service import search_files
+from src.services.workspace_index_service import scan_tree
+
+
+class HeadlessKernel:
+    def __init__(self, workspace=".", settings_file="settings.json"):
+        self.workspace = os.path.abspath(workspace)
+        start = time.perf_counter()
+        self.logger = bootstrap_kernel(settings_file, workspace=self.workspace)
+        self.boot_ms = (time.perf_counter() - start) * 1000.0
+        kernel.log(f"Headless kernel ready in {self.boot_ms:.1f} ms")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def get_service(self, name):
+        return kernel.get_service(name)
+
+    def run_goal(self, goal):
+        """Runs one goal through the autonomous agent and returns its answer."""
+        return kernel.get_service("Agent").think_and_act(goal)
+
+    def index(self, path=None):
+        """Returns every workspace file (relative paths), honouring .gitignore/.ignore rules."""
+        root = os.path.abspath(path or self.workspace)
+        files, _ = scan_tree(root)
+        return sorted(rel.replace("/", os.sep) for rel in files)
+
+    def search(self, pattern, path=None, regex=False):
+        """
+        Yields (relative_path, line_number, line) for every matching line, file by
+        file, using the search service's matcher (binary files skipped, long lines cut).
+        """
+        root = os.path.abspath(path or self.workspace)
+        spec = (pattern, regex, True, False)
+        rels = sorted(scan_tree(root)[0])
+        trigrams = kernel.get_service("TrigramIndex") if root == self.workspace else None
+        if trigrams is not None and trigrams.ready.is_set():
+            # Narrow to files that can match when the index has been built
+            rels = sorted(trigrams.candidates(spec))
+        for rel in rels:
+            # One file at a time: memory stays flat however large the workspace is
+            results, _ = search_files(root, [rel], spec)
+            for _, matches in results:
+                last = None
+                for number, _col, _end, line in matches:
+                    if number != last:
+                        last = number
+                        yield rel.replace("/", os.sep), number, line
+
+    def shutdown(self):
+        kernel.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="fervv-headless", description="AI Fervv kernel without the UI")
+    parser.add_argument("--workspace", default=".", help="workspace root (default: cwd)")
+    parser.add_argument("--settings", default="settings.json", help="settings file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    goal = commands.add_parser("goal", help="run an agent goal")
+    goal.add_argument("text")
+
+    index = commands.add_parser("index", help="list workspace files")
+    index.add_argument("path", nargs="?")
+
+    search = commands.add_parser("search", help="search workspace files")
+    search.add_argument("pattern")
+    search.add_argument("path", nargs="?")
+    search.add_argument("--regex", action="store_true", help="treat pattern as a regular expression")
+
+    commands.add_parser("stats", help="print boot time, cache and event bus statistics")
+
+    args = parser.parse_args(argv)
+    with HeadlessKernel(args.workspace, args.settings) as hk:
+        if args.command == "goal":
+            print(hk.run_goal(args.text))
+        elif args.command == "index":
+            for rel in hk.index(args.path):
+                print(rel)
+        elif args.command == "search":
+            for rel, number, line in hk.search(args.pattern, args.path, args.regex):
+                print(f"{rel}:{number}: {line.strip()}")
+        elif args.command == "stats":
+            from src.core.vfs.cache import content_cache
+            print(json.dumps({
+                "boot_ms": round(hk.boot_ms, 3),
+                "content_cache": content_cache.stats(),
+                "events": kernel.dump_event_stats(),
+            }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -14,6 +14,8 @@ except ImportError:
     genai = None
 
 from src.core.container import get_service
+from src.core.event_bus import global_event_bus
+from src.core.profiler import boot_profiler
 
 class ReasoningEngine:
     def __init__(self, ai_service):
@@ -98,6 +100,7 @@ class ReasoningEngine:
         return initial_response
 
 class AIService:
+    @boot_profiler.trace
     def __init__(self):
         self.provider = "openai"
         self.openai_client = None
@@ -126,8 +129,6 @@ class AIService:
         self.provider = provider
         self._init_provider()
 
-    from src.core.event_bus import global_event_bus
-
     def generate_async(self, prompt, system_prompt=""):
         """Non-blocking generation"""
         thread = threading.Thread(target=self._run_async, args=(prompt, system_prompt))
@@ -1,20 +1,58 @@
 """
 Configuration Service
 Manages application settings, persistence, and defaults.
+
+Settings come from layers, lowest to highest: defaults < user (settings.json)
+< workspace (.fervv/settings.json) < session (never saved). Reads hit one
+merged dict; set() updates it in memory and the changed file is rewritten
+once, atomically, after SAVE_DELAY_SECONDS of quiet (but no later than
+MAX_SAVE_DELAY_SECONDS after the first unsaved change). "config_changed"
+carries only the keys whose effective value changed, as {key: new value};
+a key unset from every layer is reported as None. None is an ordinary value:
+set(key, None) stores it, unset() removes a key from a layer.
 """
 import json
 import os
+import tempfile
+import threading
+import time
 from src.core.event_bus import global_event_bus
+from src.core.profiler import boot_profiler
+from src.core.workspace import STATE_DIR_NAME, workspace_root
+
+LAYERS = ("default", "user", "workspace", "session")
+PERSISTED = ("user", "workspace")
+SAVE_DELAY_SECONDS = 0.5
+MAX_SAVE_DELAY_SECONDS = 3.0
+_MISSING = object()
+
 
 class ConfigService:
-    def __init__(self, settings_file="settings.json"):
+    @boot_profiler.trace
+    def __init__(self, settings_file="settings.json", workspace_file=None, defaults=None):
         self.settings_file = settings_file
-        self.config = self._load()
+        self.workspace_file = workspace_file or os.path.join(workspace_root(), STATE_DIR_NAME, "settings.json")
+        self._files = {"user": self.settings_file, "workspace": self.workspace_file}
+        self._layers = {
+            "default": dict(defaults or {}),
+            "user": self._load(self.settings_file),
+            "workspace": self._load(self.workspace_file),
+            "session": {},
+        }
+        self._lock = threading.Lock()
+        # Serialises whole saves (timer vs. shutdown): the newest snapshot is renamed last
+        self._save_lock = threading.Lock()
+        self._dirty = set()
+        self._save_timer = None
+        self._first_unsaved = None
+        self.config = {}
+        for layer in LAYERS:
+            self.config.update(self._layers[layer])
 
-    def _load(self):
-        if os.path.exists(self.settings_file):
+    def _load(self, path):
+        if os.path.exists(path):
             try:
-                with open(self.settings_file, 'r') as f:
+                with open(path, 'r') as f:
                     return json.load(f)
             except:
                 pass
@@ -23,14 +61,98 @@ class ConfigService:
     def get(self, key, default=None):
         return self.config.get(key, default)
 
-    def set(self, key, value):
-        self.config[key] = value
-        self.save()
-        global_event_bus.publish("config_changed", {"key": key, "value": value})
+    def set(self, key, value, layer="user"):
+        self.update({key: value}, layer)
+
+    def unset(self, key, layer="user"):
+        """Removes key from one layer, exposing the next layer down (or nothing)."""
+        self.update({key: None}, layer, remove=True)
+
+    def set_defaults(self, values):
+        """Registers default values; they only show where no other layer sets the key."""
+        self.update(values, "default")
+
+    def update(self, values, layer="user", remove=False):
+        """Applies several keys to one layer; a single save and a single "config_changed" follow."""
+        if layer not in LAYERS:
+            raise ValueError(f"Unknown config layer: {layer}")
+        diff = {}
+        with self._lock:
+            target = self._layers[layer]
+            touched = False
+            for key, value in values.items():
+                if remove:
+                    if key not in target:
+                        continue
+                    del target[key]
+                elif key in target and target[key] == value:
+                    continue
+                else:
+                    target[key] = value
+                touched = True
+                effective = self._resolve(key)
+                if effective is _MISSING:
+                    if key in self.config:
+                        del self.config[key]
+                        diff[key] = None
+                elif key not in self.config or self.config[key] != effective:
+                    self.config[key] = effective
+                    diff[key] = effective
+            if touched and layer in PERSISTED:
+                self._dirty.add(layer)
+                self._schedule_save()
+        if diff:
+            global_event_bus.publish("config_changed", diff)
+
+    def _resolve(self, key):
+        for layer in reversed(LAYERS):
+            if key in self._layers[layer]:
+                return self._layers[layer][key]
+        return _MISSING
+
+    # --- write-behind persistence ---
+
+    def _schedule_save(self):
+        # Each change restarts the timer, within the cap counted from the first unsaved change
+        now = time.monotonic()
+        if self._first_unsaved is None:
+            self._first_unsaved = now
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+        delay = max(0.0, min(SAVE_DELAY_SECONDS, self._first_unsaved + MAX_SAVE_DELAY_SECONDS - now))
+        self._save_timer = threading.Timer(delay, self.save)
+        self._save_timer.daemon = True
+        self._save_timer.start()
 
     def save(self):
-        try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.config, f, indent=4)
-        except Exception as e:
-            print(f"Config save error: {e}")
+        """Writes every layer changed since the last save."""
+        with self._save_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                self._first_unsaved = None
+                pending = [(self._files[layer], json.dumps(self._layers[layer], indent=4)) for layer in self._dirty]
+                self._dirty.clear()
+            self._write(pending)
+
+    @staticmethod
+    def _write(pending):
+        for path, text in pending:
+            try:
+                directory = os.path.dirname(os.path.abspath(path))
+                os.makedirs(directory, exist_ok=True)
+                fd, temp = tempfile.mkstemp(dir=directory, prefix=".settings.", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, 'w') as f:
+                        f.write(text)
+                    os.replace(temp, path)
+                except BaseException:
+                    os.remove(temp)
+                    raise
+            except Exception as e:
+                print(f"Config save error: {e}")
+
+    def stop(self):
+        """Flushes pending writes (called on kernel shutdown)."""
+        self.save()
@@ -1,39 +1,140 @@
 """
 File Service
 Handles file system operations safely.
+
+probe() classifies a file from its size and first 64 KB, without reading the
+rest: BOMs and UTF-8 validity decide the encoding, NUL bytes (outside UTF-16
+text) or a high share of control characters mean binary, and files above
+LARGE_FILE_BYTES are too large for the editor and go to the paged viewers.
 """
 import os
 from src.core.event_bus import global_event_bus
+from src.core.container import get_service
+from src.core.profiler import boot_profiler
+from src.core.vfs.cache import content_cache
+from src.core.vfs.providers import decode_text
+
+SNIFF_BYTES = 64 * 1024
+LARGE_FILE_BYTES = 8 * 1024 * 1024
+
+TEXT, BINARY, TOO_LARGE = "text", "binary", "too_large"
+
+# Longest first: the UTF-32 LE BOM starts with the UTF-16 LE one
+BOMS = (
+    (b"\xff\xfe\x00\x00", "utf-32"),
+    (b"\x00\x00\xfe\xff", "utf-32"),
+    (b"\xef\xbb\xbf", "utf-8-sig"),
+    (b"\xff\xfe", "utf-16"),
+    (b"\xfe\xff", "utf-16"),
+)
+# Control bytes that plain text does contain: \b \t \n \f \r ESC
+TEXT_CONTROLS = {8, 9, 10, 12, 13, 27}
+BINARY_CONTROL_RATIO = 0.1
+# Bytes cp1252 leaves undefined
+CP1252_UNDEFINED = {0x81, 0x8D, 0x8F, 0x90, 0x9D}
+
+
+class FileProbe:
+    """What a file is: kind (TEXT, BINARY, TOO_LARGE), its size and, for text, its encoding."""
+    __slots__ = ("path", "kind", "size", "encoding")
+
+    def __init__(self, path, kind, size, encoding=None):
+        self.path = path
+        self.kind = kind
+        self.size = size
+        self.encoding = encoding
+
+    def __repr__(self):
+        return f"FileProbe({self.path!r}, kind={self.kind}, size={self.size}, encoding={self.encoding})"
+
+
+def sniff(prefix):
+    """(kind, encoding) of a file from its leading bytes; kind is TEXT or BINARY."""
+    for bom, encoding in BOMS:
+        if prefix.startswith(bom):
+            return TEXT, encoding
+    if b"\0" in prefix:
+        # BOM-less UTF-16: the NULs are the high bytes of ASCII, all on one side
+        even, odd = prefix[0::2].count(0), prefix[1::2].count(0)
+        half = len(prefix) // 2
+        if half and odd > half * 0.4 and even == 0:
+            return TEXT, "utf-16-le"
+        if half and even > half * 0.4 and odd == 0:
+            return TEXT, "utf-16-be"
+        return BINARY, None
+    try:
+        prefix.decode("utf-8")
+        return TEXT, "utf-8"
+    except UnicodeDecodeError as e:
+        # The prefix may end inside a multi-byte sequence
+        if e.start >= len(prefix) - 3 and e.reason == "unexpected end of data":
+            return TEXT, "utf-8"
+    controls = sum(prefix.count(bytes([c])) for c in range(32) if c not in TEXT_CONTROLS)
+    if controls > len(prefix) * BINARY_CONTROL_RATIO:
+        return BINARY, None
+    if any(c in prefix for c in CP1252_UNDEFINED):
+        return TEXT, "latin-1"
+    return TEXT, "cp1252"
+
 
 class FileService:
+    @boot_profiler.trace
     def __init__(self):
         self.current_file = None
-        
+        self._encodings = {}  # path -> encoding it was read with, reused when it is saved
+
+    def probe(self, path):
+        """Classifies a file (see sniff) from its size and first SNIFF_BYTES. Returns None if unreadable."""
+        vfs = get_service("VFS")
+        try:
+            st = vfs.stat(path)
+            if st is None or st.is_dir:
+                return None
+            kind, encoding = sniff(vfs.read_range(path, 0, SNIFF_BYTES))
+        except OSError as e:
+            print(f"Error reading file {path}: {e}")
+            return None
+        if kind == TEXT and st.size > LARGE_FILE_BYTES:
+            kind = TOO_LARGE
+        return FileProbe(path, kind, st.size, encoding)
+
     def read_file(self, path):
-        """Reads content from a file."""
-        if not os.path.exists(path):
+        """Reads a text file in its detected encoding. Returns None if missing, binary or too large."""
+        probe = self.probe(path)
+        if probe is None or probe.kind != TEXT:
             return None
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = decode_text(content_cache.read(path), probe.encoding, errors="replace")
             self.current_file = path
+            self._encodings[path] = probe.encoding
             return content
         except Exception as e:
             print(f"Error reading file {path}: {e}")
             return None
 
     def write_file(self, path, content):
-        """Writes content to a file."""
+        """Writes content to a file (atomic replace) and waits for it to reach the disk."""
         try:
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            self.current_file = path
-            global_event_bus.publish("file_saved", path)
+            self.write_file_async(path, content).result()
             return True
         except Exception as e:
             print(f"Error writing file {path}: {e}")
             return False
 
+    def write_file_async(self, path, content):
+        """Queues a write off the calling thread; returns a Future. "file_saved" follows on success."""
+        self.current_file = path
+        encoding = self._encodings.get(path, "utf-8")
+        if isinstance(content, str) and encoding != "utf-8":
+            content = content.encode(encoding, errors="replace")
+        future = get_service("VFS").write_async(path, content)
+        future.add_done_callback(lambda f: self._on_written(path, f))
+        return future
+
+    def _on_written(self, path, future):
+        if future.exception() is None:
+            global_event_bus.publish("file_saved", path)
+
     def list_files(self, path):
         """List files and directories in path."""
         try:
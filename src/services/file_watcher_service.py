@@ -0,0 +1,416 @@
+"""
+File Watcher Service
+Notices changes made outside the IDE (git, terminal, other editors) and
+publishes them on the bus as debounced batches.
+
+Backends: inotify on Linux (via ctypes, one watch per directory) and a
+scandir-diff poller everywhere else or when inotify is unavailable.
+
+Event: "files_changed" with payload
+    {"root": str, "created": [paths], "modified": [paths], "deleted": [paths],
+     "renamed": [(old, new)], "overflow": bool}
+"overflow" means events were lost (kernel queue overflow): consumers should rescan.
+
+Dot-files are watched (.gitignore, .github/...); VCS and IDE state folders and
+the temp files of atomic saves are not. One flusher thread publishes a batch
+once its debounce deadline passes.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from src.core.event_bus import global_event_bus
+from src.core.ignore import ALWAYS_IGNORED
+from src.core.profiler import boot_profiler
+from src.core.vfs.async_vfs import SKIP_DIRS
+from src.core.vfs.cache import content_cache
+from src.core.vfs.mapped import mapped_files
+
+DEBOUNCE_SECONDS = 0.2
+# A steady stream of events is still flushed at least this often
+MAX_LATENCY_SECONDS = 1.0
+POLL_INTERVAL_SECONDS = 1.0
+
+CREATED, MODIFIED, DELETED = "created", "modified", "deleted"
+# Temp files of atomic saves (.name.XXXX.tmp), transaction backups and editor swap files
+SCRATCH_SUFFIXES = (".tmp", ".bak", ".swp")
+
+
+def watch_skip(name):
+    if name in ALWAYS_IGNORED or name in SKIP_DIRS:
+        return True
+    return name.startswith(".") and name.endswith(SCRATCH_SUFFIXES)
+
+
+class _ChangeSet:
+    """Folds raw events per path: created+modified=created, created+deleted=nothing, ..."""
+    def __init__(self):
+        self.changes = {}
+        self.renamed = []
+        self.overflow = False
+
+    def add(self, kind, path):
+        previous = self.changes.get(path)
+        if previous == CREATED and kind == MODIFIED:
+            return
+        if previous == CREATED and kind == DELETED:
+            del self.changes[path]
+            return
+        if previous == DELETED and kind == CREATED:
+            kind = MODIFIED
+        self.changes[path] = kind
+
+    def rename(self, old, new):
+        if self.changes.pop(old, None) == CREATED:
+            # Created and renamed within one window: just a new file
+            self.changes[new] = CREATED
+        else:
+            self.renamed.append((old, new))
+
+    def __bool__(self):
+        return bool(self.changes or self.renamed or self.overflow)
+
+    def to_payload(self, root):
+        payload = {"root": root, CREATED: [], MODIFIED: [], DELETED: [], "renamed": self.renamed, "overflow": self.overflow}
+        for path, kind in self.changes.items():
+            payload[kind].append(path)
+        return payload
+
+
+class PollingBackend:
+    """Diffs scandir snapshots; renames are matched by inode."""
+    name = "polling"
+
+    def __init__(self, root, emit, skip, interval=POLL_INTERVAL_SECONDS):
+        self.root = root
+        self.emit = emit
+        self.skip = skip
+        self.interval = interval
+        self._stop = threading.Event()
+
+    def _snapshot(self):
+        snapshot = {}
+        stack = [self.root]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if self.skip(entry.name):
+                            continue
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        snapshot[entry.path] = (st.st_mtime_ns, st.st_size, st.st_ino, is_dir)
+                        if is_dir:
+                            stack.append(entry.path)
+            except OSError:
+                continue
+        return snapshot
+
+    def run(self):
+        previous = self._snapshot()
+        while not self._stop.wait(self.interval):
+            current = self._snapshot()
+            created = [p for p in current if p not in previous]
+            deleted = {previous[p][2]: p for p in previous if p not in current}
+            for path in created:
+                old = deleted.pop(current[path][2], None)
+                if old is not None:
+                    self.emit("renamed", old, path)
+                else:
+                    self.emit(CREATED, path)
+            for path in deleted.values():
+                self.emit(DELETED, path)
+            for path, sig in current.items():
+                old = previous.get(path)
+                if old is not None and not sig[3] and old[:2] != sig[:2]:
+                    self.emit(MODIFIED, path)
+            previous = current
+
+    def stop(self):
+        self._stop.set()
+
+
+class InotifyBackend:
+    """Linux inotify through libc; adds a watch for every directory in the tree."""
+    name = "inotify"
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MODIFY | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+
+    _HEADER = struct.Struct("iIII")
+
+    def __init__(self, root, emit, skip):
+        self.root = root
+        self.emit = emit
+        self.skip = skip
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._wake_r, self._wake_w = os.pipe()
+        self._watches = {}  # wd -> directory
+        self._stopping = False
+
+    @staticmethod
+    def available():
+        return sys.platform.startswith("linux")
+
+    def _watch_tree(self, top, report_existing=False):
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                if directory == self.root or errno == 28:  # ENOSPC: out of watches
+                    raise OSError(errno, f"inotify_add_watch failed for {directory}")
+                continue
+            self._watches[wd] = directory
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if self.skip(entry.name):
+                            continue
+                        if report_existing:
+                            # Entries that landed before the new directory's watch existed
+                            self.emit(CREATED, entry.path)
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except OSError:
+                continue
+
+    def prepare(self):
+        self._watch_tree(self.root)
+
+    def run(self):
+        pending_moves = {}
+        while not self._stopping:
+            ready, _, _ = select.select([self._fd, self._wake_r], [], [])
+            if self._wake_r in ready:
+                break
+            buffer = os.read(self._fd, 64 * 1024)
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, cookie, length = self._HEADER.unpack_from(buffer, offset)
+                offset += self._HEADER.size
+                name = os.fsdecode(buffer[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                self._handle(wd, mask, cookie, name, pending_moves)
+            # A move whose other half did not arrive left (or entered) the tree
+            for move in pending_moves.values():
+                if move is not None:
+                    path, is_dir = move
+                    self.emit(DELETED, path)
+                    if is_dir:
+                        # Its watches would keep reporting it under the old paths
+                        self._unwatch_tree(path)
+            pending_moves.clear()
+
+    def _handle(self, wd, mask, cookie, name, pending_moves):
+        if mask & self.IN_Q_OVERFLOW:
+            self.emit("overflow", None)
+            return
+        if mask & self.IN_IGNORED:
+            self._watches.pop(wd, None)
+            return
+        directory = self._watches.get(wd)
+        if directory is None or not name:
+            return
+        if self.skip(name):
+            if mask & self.IN_MOVED_FROM:
+                # Likely an atomic save (.name.tmp renamed over name): reported as a modify
+                pending_moves[cookie] = None
+            return
+        path = os.path.join(directory, name)
+        is_dir = bool(mask & self.IN_ISDIR)
+
+        if mask & self.IN_MOVED_FROM:
+            pending_moves[cookie] = (path, is_dir)
+        elif mask & self.IN_MOVED_TO:
+            if cookie in pending_moves and pending_moves[cookie] is None:
+                del pending_moves[cookie]
+                self.emit(MODIFIED, path)
+                return
+            old = pending_moves.pop(cookie, None)
+            if old is not None:
+                old = old[0]
+                self.emit("renamed", old, path)
+                if is_dir:
+                    self._rebase(old, path)
+            else:
+                self.emit(CREATED, path)
+                if is_dir:
+                    self._watch_tree(path, report_existing=True)
+        elif mask & self.IN_CREATE:
+            self.emit(CREATED, path)
+            if is_dir:
+                self._watch_tree(path, report_existing=True)
+        elif mask & self.IN_DELETE:
+            self.emit(DELETED, path)
+        elif mask & (self.IN_MODIFY | self.IN_CLOSE_WRITE) and not is_dir:
+            self.emit(MODIFIED, path)
+
+    def _rebase(self, old, new):
+        # Watches follow a moved directory; only our path bookkeeping needs updating
+        for wd, directory in self._watches.items():
+            if directory == old or directory.startswith(old + os.sep):
+                self._watches[wd] = new + directory[len(old):]
+
+    def _unwatch_tree(self, top):
+        for wd, directory in list(self._watches.items()):
+            if directory == top or directory.startswith(top + os.sep):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+
+    def stop(self):
+        self._stopping = True
+        try:
+            os.write(self._wake_w, b"x")
+        except OSError:
+            pass  # Already closed: the run loop has ended
+
+    def close(self):
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class FileWatcherService:
+    @boot_profiler.trace
+    def __init__(self, root=None, debounce=DEBOUNCE_SECONDS, skip=watch_skip, force_polling=False):
+        self.root = os.path.abspath(root or os.getcwd())
+        self.debounce = debounce
+        self.skip = skip
+        self.force_polling = force_polling
+        self.backend = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._pending = _ChangeSet()
+        self._deadline = None
+        self._first_event_at = None
+        self._flusher = None
+        self._stopping = False
+
+    def start(self):
+        """Starts watching in a background thread (setting up watches can take a while)."""
+        if self._thread is not None:
+            return
+        backend = None
+        if not self.force_polling and InotifyBackend.available():
+            try:
+                backend = InotifyBackend(self.root, self._emit, self.skip)
+            except Exception as e:
+                print(f"FileWatcher: inotify unavailable ({e}), falling back to polling")
+        # Created here, not on the thread, so a stop() right after start() reaches it
+        with self._lock:
+            self._stopping = False
+            self.backend = backend or PollingBackend(self.root, self._emit, self.skip)
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        backend = self.backend
+        if isinstance(backend, InotifyBackend):
+            try:
+                backend.prepare()
+            except Exception as e:
+                print(f"FileWatcher: inotify unavailable ({e}), falling back to polling")
+                backend.close()
+                backend = PollingBackend(self.root, self._emit, self.skip)
+                with self._lock:
+                    self.backend = backend
+                    if self._stopping:
+                        return
+        try:
+            backend.run()
+        except Exception as e:
+            print(f"FileWatcher error: {e}")
+        finally:
+            close = getattr(backend, "close", None)
+            if close:
+                close()
+
+    def _emit(self, kind, path, new_path=None):
+        with self._lock:
+            if kind == "renamed":
+                self._pending.rename(path, new_path)
+            elif kind == "overflow":
+                self._pending.overflow = True
+            else:
+                self._pending.add(kind, path)
+
+            now = time.monotonic()
+            if self._first_event_at is None:
+                self._first_event_at = now
+            idle = self._deadline is None
+            # Trailing debounce, but never hold a batch longer than MAX_LATENCY_SECONDS
+            self._deadline = min(now + self.debounce, self._first_event_at + MAX_LATENCY_SECONDS)
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="file-watcher-flush", daemon=True)
+                self._flusher.start()
+            elif idle:
+                # A later deadline needs no wake-up: the flusher re-checks it when it wakes
+                self._wake.notify()
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                while not self._stopping and (self._deadline is None or self._deadline > time.monotonic()):
+                    self._wake.wait(None if self._deadline is None else self._deadline - time.monotonic())
+                if self._stopping:
+                    self._flusher = None
+                    return
+                pending = self._take()
+            self._publish(pending)
+
+    def _take(self):
+        pending, self._pending = self._pending, _ChangeSet()
+        self._deadline = None
+        self._first_event_at = None
+        return pending
+
+    def flush(self):
+        """Publishes the pending batch now."""
+        with self._lock:
+            pending = self._take()
+        self._publish(pending)
+
+    def _publish(self, pending):
+        if not pending:
+            return
+        payload = pending.to_payload(self.root)
+        for path in payload[MODIFIED] + payload[DELETED] + [old for old, _ in payload["renamed"]]:
+            content_cache.invalidate(path)
+            mapped_files.release(path)
+        global_event_bus.publish("files_changed", payload)
+
+    def stop(self):
+        with self._lock:
+            # Drops the pending batch and ends the flusher
+            self._stopping = True
+            backend = self.backend
+            self._take()
+            self._wake.notify()
+        if backend is not None:
+            backend.stop()
+        self._thread = None
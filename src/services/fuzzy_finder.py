@@ -0,0 +1,159 @@
+"""
+Fuzzy Finder
+Subsequence matching and ranking of workspace paths for quick-open.
+
+Paths are kept shortest first, with a presence mask per character (one byte
+per path, held as a big int and built the first time that character is
+typed, or ahead of time by warm()). Narrowing 200k paths to those containing
+every query character is a few big-int ANDs and an itertools.compress, all
+in C; only the survivors are matched and scored in Python, in batches. Each
+batch yields the running top results, so the UI paints the best matches
+after the first batch and keeps refining until the next keystroke. When a
+query extends the previous one, the previous matches (kept as a mask too)
+join the AND, so typing on re-filters only what still matches.
+
+Scoring favours matches on segment starts (after / _ - . or a camelCase
+hump), consecutive runs and the file name, and prefers shorter paths.
+"""
+import heapq
+import threading
+from itertools import compress
+
+from src.core.profiler import boot_profiler
+
+BATCH_SIZE = 1000
+BOUNDARY_CHARS = "/\\_-. "
+WARM_CHARS = "abcdefghijklmnopqrstuvwxyz0123456789_-./"
+
+
+def match_positions(query, lower):
+    """Right-most subsequence match of query in lower (both lowercase). Returns positions or None."""
+    positions = []
+    pos = len(lower)
+    for ch in reversed(query):
+        pos = lower.rfind(ch, 0, pos)
+        if pos < 0:
+            return None
+        positions.append(pos)
+    positions.reverse()
+    return positions
+
+
+def score_path(query, path, lower):
+    """Returns (score, positions), or None when query is not a subsequence of path."""
+    positions = match_positions(query, lower)
+    if positions is None:
+        return None
+    name_start = max(lower.rfind("/"), lower.rfind("\\")) + 1
+    score = 0.0
+    previous = -2
+    for p in positions:
+        score += 1.0
+        if p == 0 or lower[p - 1] in BOUNDARY_CHARS:
+            score += 8.0
+        elif path[p].isupper() and path[p - 1].islower():
+            score += 7.0
+        if p == previous + 1:
+            score += 5.0
+        elif previous >= 0:
+            score -= min(p - previous - 1, 10) * 0.2
+        if p >= name_start:
+            score += 3.0
+        previous = p
+    if positions[0] == name_start:
+        score += 6.0
+    return score - len(path) * 0.02, positions
+
+
+class FuzzyFinder:
+    def __init__(self, paths=()):
+        self.set_paths(paths)
+
+    def set_paths(self, paths):
+        self.paths = sorted(paths, key=len)
+        self.lower = [p.lower() for p in self.paths]
+        self._masks = {}
+        self._last_query = None
+        self._last_mask = None  # matches of _last_query, once fully scored
+
+    def __len__(self):
+        return len(self.paths)
+
+    def warm(self, chars=WARM_CHARS):
+        """Builds the masks of common characters ahead of the first keystrokes."""
+        for ch in chars:
+            self._mask(ch)
+
+    def _mask(self, ch):
+        masks, lower = self._masks, self.lower  # consistent even if set_paths runs meanwhile
+        mask = masks.get(ch)
+        if mask is None:
+            mask = masks[ch] = int.from_bytes(bytes([ch in p for p in lower]), "little")
+        return mask
+
+    def candidates(self, query):
+        """Indices (shortest path first) of paths containing every character of query (lowercase)."""
+        combined = -1
+        if self._last_mask is not None and query.startswith(self._last_query):
+            # Extending the previous query: only its matches can still match
+            combined = self._last_mask
+        for ch in set(query):
+            combined &= self._mask(ch)
+        return list(compress(range(len(self.paths)), combined.to_bytes(len(self.paths), "little")))
+
+    def iter_batches(self, query, limit=50, batch_size=BATCH_SIZE):
+        """
+        Yields ranked result lists [(score, path, positions)], best first, as
+        scoring progresses; the last list is the final ranking.
+        """
+        query = query.lower().replace(" ", "")
+        if not query:
+            yield [(0.0, path, []) for path in self.paths[:limit]]
+            return
+        found = self.candidates(query)
+        self._last_query, self._last_mask = query, None
+        matches = bytearray(len(self.paths))
+        top = []  # min-heap of (score, -index, positions)
+        for start in range(0, len(found), batch_size):
+            for i in found[start:start + batch_size]:
+                scored = score_path(query, self.paths[i], self.lower[i])
+                if scored is None:
+                    continue
+                matches[i] = 1
+                item = (scored[0], -i, scored[1])
+                if len(top) < limit:
+                    heapq.heappush(top, item)
+                elif item > top[0]:
+                    heapq.heapreplace(top, item)
+            yield [(s, self.paths[-neg], pos) for s, neg, pos in sorted(top, reverse=True)]
+        # Only a fully scored query may seed the next, narrower one
+        self._last_mask = int.from_bytes(matches, "little")
+        if not found:
+            yield []
+
+    def search(self, query, limit=50):
+        """The final ranking of query (all batches scored)."""
+        result = []
+        for result in self.iter_batches(query, limit):
+            pass
+        return result
+
+
+class FuzzyFinderService:
+    """The FuzzyFinder over the WorkspaceIndex, rebuilt when the index has changed since last use."""
+    @boot_profiler.trace
+    def __init__(self, index):
+        self.index = index
+        self._finder = FuzzyFinder()
+        self._key = None
+        self._lock = threading.Lock()
+
+    def finder(self):
+        table = self.index.table
+        key = (id(table), table.version)
+        with self._lock:
+            if key != self._key:
+                self._finder.set_paths(self.index.paths())
+                self._key = key
+                threading.Thread(target=self._finder.warm, name="fuzzy-warm", daemon=True).start()
+            return self._finder
@@ -0,0 +1,274 @@
+"""
+History Service
+Local history for every file written through the VFS, so an agent edit that
+clobbers a file can be undone even if it was never committed to git.
+
+Snapshots are stored in a content-addressed chunk store under .fervv/history/:
+file contents are cut into content-defined chunks (see vfs/chunking.py) and
+each chunk is stored once, zlib-compressed, under its sha256. An edit in the middle of a large file only
+changes the chunks around it; every other chunk is shared with the previous
+snapshot. Snapshot manifests (path, time, chunk list) live in an append-only
+JSON-lines log.
+
+Content a VFS write is about to replace is snapshotted first if history has
+never seen it; the new content is snapshotted only once the write has landed,
+so a failed or rolled-back transaction leaves no snapshot of what it tried to write.
+
+Retention is bounded by size: when the chunk store grows past its budget the
+oldest snapshots are dropped (the latest one of each file is always kept) and
+chunks no longer referenced are deleted. Chunk reference counts and the number
+of droppable snapshots are kept as running totals, so recording stays cheap
+even when the store sits at its budget.
+
+Chunks are written to a temp file and renamed into place, so a chunk file that
+exists is always complete.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from collections import deque
+
+from src.core.profiler import boot_profiler
+from src.core.vfs.chunking import chunk_boundaries
+from src.core.workspace import STATE_DIR_NAME, state_dir
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Files above this size are not recorded
+MAX_FILE_BYTES = 32 * 1024 * 1024
+LOG_FILE = "snapshots.jsonl"
+
+
+class HistoryService:
+    @boot_profiler.trace
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = os.path.abspath(root or os.getcwd())
+        self.max_bytes = max_bytes
+        self.dir = None
+        self._snapshots = None  # path -> [snapshot dicts], oldest first; loaded on first use
+        self._chunk_sizes = {}  # sha256 -> stored (compressed) size
+        self._refs = {}  # sha256 -> number of snapshots using the chunk
+        self._order = deque()  # every snapshot, oldest first
+        self._old_count = 0  # snapshots that are not the latest of their file
+        self._stored_bytes = 0
+        self._next_id = 1
+        self._lock = threading.RLock()
+
+    # --- storage ---
+
+    def _ensure_loaded(self):
+        if self._snapshots is not None:
+            return
+        self.dir = state_dir("history", root=self.root)
+        os.makedirs(os.path.join(self.dir, "chunks"), exist_ok=True)
+        self._snapshots = {}
+        log = os.path.join(self.dir, LOG_FILE)
+        if os.path.exists(log):
+            with open(log, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        snap = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line after a crash
+                    self._snapshots.setdefault(snap["path"], []).append(snap)
+                    self._next_id = max(self._next_id, snap["id"] + 1)
+        for bucket in os.scandir(os.path.join(self.dir, "chunks")):
+            if bucket.is_dir():
+                for entry in os.scandir(bucket.path):
+                    if entry.name.endswith(".tmp"):
+                        # Interrupted chunk write
+                        self._unlink(entry.path)
+                    else:
+                        self._chunk_sizes[entry.name] = entry.stat().st_size
+        self._order = deque(sorted((s for snaps in self._snapshots.values() for s in snaps), key=lambda s: s["id"]))
+        for snap in self._order:
+            for digest in snap["chunks"]:
+                self._refs[digest] = self._refs.get(digest, 0) + 1
+        self._old_count = len(self._order) - len(self._snapshots)
+        for digest in [d for d in self._chunk_sizes if d not in self._refs]:
+            # Stored before a crash cut off its snapshot's log line
+            self._unlink(self._chunk_path(digest))
+            del self._chunk_sizes[digest]
+        self._stored_bytes = sum(self._chunk_sizes.values())
+
+    def _chunk_path(self, digest):
+        return os.path.join(self.dir, "chunks", digest[:2], digest)
+
+    def _store_chunk(self, piece):
+        digest = hashlib.sha256(piece).hexdigest()
+        if digest not in self._chunk_sizes:
+            packed = zlib.compress(piece, 6)
+            path = self._chunk_path(digest)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp = tempfile.mkstemp(prefix=digest[:8], suffix=".tmp", dir=os.path.dirname(path))
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(packed)
+                    # Durable before it becomes visible under its final name
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp, path)
+            except BaseException:
+                self._unlink(temp)
+                raise
+            self._chunk_sizes[digest] = len(packed)
+            self._stored_bytes += len(packed)
+        return digest
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def _append_log(self, snap):
+        with open(os.path.join(self.dir, LOG_FILE), "a", encoding="utf-8") as f:
+            f.write(json.dumps(snap) + "\n")
+
+    def stored_bytes(self):
+        with self._lock:
+            self._ensure_loaded()
+            return self._stored_bytes
+
+    # --- recording ---
+
+    def _key(self, path):
+        return os.path.normcase(os.path.abspath(path))
+
+    def record(self, path, data, reason="write"):
+        """Snapshots data as the content of path. Returns the snapshot id (None if skipped)."""
+        if len(data) > MAX_FILE_BYTES:
+            return None
+        key = self._key(path)
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self._ensure_loaded()
+            timeline = self._snapshots.setdefault(key, [])
+            if timeline and timeline[-1]["sha256"] == digest:
+                return timeline[-1]["id"]
+            chunks = [self._store_chunk(data[start:end]) for start, end in chunk_boundaries(data)]
+            snap = {"id": self._next_id, "path": key, "time": time.time(), "size": len(data),
+                    "sha256": digest, "reason": reason, "chunks": chunks}
+            self._next_id += 1
+            if timeline:
+                self._old_count += 1
+            timeline.append(snap)
+            self._order.append(snap)
+            for chunk in chunks:
+                self._refs[chunk] = self._refs.get(chunk, 0) + 1
+            self._append_log(snap)
+            if self._stored_bytes > self.max_bytes and self._old_count:
+                self._collect()
+            return snap["id"]
+
+    def _tracked(self, provider, path):
+        """Absolute path if provider/path is a workspace file with history, else None."""
+        if not provider.is_local:
+            return None
+        full = os.path.abspath(path)
+        if not full.startswith(self.root + os.sep) or f"{os.sep}{STATE_DIR_NAME}{os.sep}" in full:
+            return None
+        return full
+
+    def on_write(self, provider, path, data, uri):
+        """Write-queue hook: runs on the writer thread just before a write (or delete, data None) is committed."""
+        full = self._tracked(provider, path)
+        if full is None:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            first = not self._snapshots.get(self._key(full))
+        if (first or data is None) and os.path.isfile(full):
+            # The content about to be replaced was never seen: keep it so the write can be undone
+            try:
+                with open(full, "rb") as f:
+                    self.record(full, f.read(), reason="before write" if data is not None else "before delete")
+            except OSError:
+                pass
+
+    def on_commit(self, provider, path, data, uri):
+        """Write-queue hook: snapshots the new content once its transaction has landed."""
+        full = self._tracked(provider, path)
+        if full is not None and data is not None:
+            self.record(full, data)
+
+    # --- timeline ---
+
+    def timeline(self, path):
+        """Returns the snapshots of path, newest first: [{id, time, size, reason}]."""
+        with self._lock:
+            self._ensure_loaded()
+            snaps = self._snapshots.get(self._key(path), [])
+            return [{k: s[k] for k in ("id", "time", "size", "reason")} for s in reversed(snaps)]
+
+    def _find(self, snapshot_id):
+        for snaps in self._snapshots.values():
+            for snap in snaps:
+                if snap["id"] == snapshot_id:
+                    return snap
+        return None
+
+    def read_snapshot(self, snapshot_id):
+        """Returns the bytes of a snapshot, or None if it no longer exists."""
+        with self._lock:
+            self._ensure_loaded()
+            snap = self._find(snapshot_id)
+            if snap is None:
+                return None
+            parts = []
+            try:
+                for digest in snap["chunks"]:
+                    with open(self._chunk_path(digest), "rb") as f:
+                        parts.append(zlib.decompress(f.read()))
+            except (OSError, zlib.error):
+                # A missing or damaged chunk: the snapshot can no longer be rebuilt
+                return None
+        return b"".join(parts)
+
+    def restore(self, path, snapshot_id, vfs):
+        """Writes a snapshot back to path through the VFS (which records the restore too)."""
+        data = self.read_snapshot(snapshot_id)
+        if data is None:
+            return False
+        return vfs.write(path, data)
+
+    # --- retention ---
+
+    def _collect(self):
+        """Drops the oldest snapshots until the store is back under 90% of its budget."""
+        target = int(self.max_bytes * 0.9)
+        kept = []
+        dropped = set()
+        paths = set()
+        while self._order and self._old_count and self._stored_bytes > target:
+            snap = self._order.popleft()
+            if self._snapshots[snap["path"]][-1] is snap:
+                kept.append(snap)  # the latest of each file is always kept
+                continue
+            dropped.add(snap["id"])
+            paths.add(snap["path"])
+            self._old_count -= 1
+            for digest in snap["chunks"]:
+                self._refs[digest] -= 1
+                if self._refs[digest] == 0:
+                    del self._refs[digest]
+                    self._unlink(self._chunk_path(digest))
+                    self._stored_bytes -= self._chunk_sizes.pop(digest, 0)
+        self._order.extendleft(reversed(kept))
+        if not dropped:
+            return
+        for key in paths:
+            self._snapshots[key] = [s for s in self._snapshots[key] if s["id"] not in dropped]
+        self._rewrite_log()
+
+    def _rewrite_log(self):
+        log = os.path.join(self.dir, LOG_FILE)
+        temp = log + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            for snap in sorted((s for snaps in self._snapshots.values() for s in snaps), key=lambda s: s["id"]):
+                f.write(json.dumps(snap) + "\n")
+        os.replace(temp, log)
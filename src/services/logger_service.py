@@ -10,8 +10,11 @@ import threading
 import traceback
 from datetime import datetime
 from src.core.kernel.kernel import kernel
+from src.core.event_bus import global_event_bus
+from src.core.profiler import boot_profiler
 
 class UniversalLogger:
+    @boot_profiler.trace
     def __init__(self, log_dir="logs"):
         self.log_dir = log_dir
         if not os.path.exists(log_dir):
@@ -84,9 +87,11 @@ class UniversalLogger:
         kernel.log("Logger shutting down.")
 
 # Integration with Kernel
-def setup_logger(kernel_instance):
-    logger = UniversalLogger()
+def setup_logger(kernel_instance, log_dir="logs"):
+    logger = UniversalLogger(log_dir)
     kernel_instance.register_service("Logger", logger)
     # Monkey patch kernel print/log
     kernel_instance.log = logger.info
+    # Handler errors and slow-handler reports go to the structured log
+    global_event_bus.set_logger(logger)
     return logger
@@ -6,8 +6,10 @@ Future upgrades: Vector Database implementation.
 import json
 import os
 from datetime import datetime
+from src.core.profiler import boot_profiler
 
 class MemoryService:
+    @boot_profiler.trace
     def __init__(self, storage_file="ai_memory.json"):
         self.storage_file = storage_file
         self.memory = []
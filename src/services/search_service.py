@@ -0,0 +1,435 @@
+"""
+Search Service
+Find in files across the workspace index, on worker processes.
+
+The indexed files are split into chunks of a few megabytes and searched by a
+process pool, a bounded number of chunks at a time. Workers mmap each file,
+skip it if its first 8 KB hold a NUL byte (binary), and run the bytes regex
+straight over the mapping; only matched lines are decoded. Results stream
+back as each chunk finishes, and starting a new search (or cancel()) bumps a
+generation counter, so stale chunks are dropped and unstarted ones cancelled.
+When the TrigramIndex is ready it narrows the files to search first, and a
+small candidate set is searched on the calling thread without the pool.
+
+Bytes regexes fold case and find word boundaries for ASCII only. A non-ASCII
+pattern searched case-insensitively or as a whole word ("Straße", Cyrillic
+identifiers) therefore runs as a str regex over the decoded file instead.
+In regex mode, word, digit and word-boundary classes still only match ASCII.
+
+Replace runs the same way: workers compute each file's edits as byte
+ranges, the resulting ReplacePlan renders diffs only for the files asked
+about, and commit() writes every accepted file in one VFS transaction.
+
+Events (the first three carry the id returned by search() / plan_replace()):
+    "search_results"    {"id", "results": [(rel, [(line_no, col, end_col, line_text)])]}
+    "search_done"       {"id", "files", "matches", "scanned_bytes", "elapsed",
+                         "cancelled", "truncated"}
+    "replace_ready"     {"id", "plan": ReplacePlan, "cancelled"}
+    "replace_committed" {"files": [rel], "error": message or None}
+"""
+import difflib
+import mmap
+import os
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from src.core.event_bus import global_event_bus
+from src.core.process_pool import process_pool
+from src.core.profiler import boot_profiler
+from src.core.vfs.providers import decode_text
+from src.core.vfs.write_queue import RollbackError
+
+BINARY_SNIFF_BYTES = 8192
+MAX_FILE_BYTES = 256 * 1024 * 1024
+CHUNK_BYTES = 8 * 1024 * 1024
+CHUNK_FILES = 256
+# Candidate sets up to this size skip the process pool round trip
+INLINE_BYTES = 4 * 1024 * 1024
+MAX_MATCHES_PER_FILE = 1000
+MAX_RESULTS = 20000
+MAX_LINE_CHARS = 300
+
+_compiled = {}  # per process: spec -> (regex, literal prefilter or None)
+
+
+class _ByteSpan:
+    """A match of _TextRegex, with the byte offsets of the UTF-8 data it was found in."""
+    __slots__ = ("match", "_span")
+
+    def __init__(self, match, span):
+        self.match = match
+        self._span = span
+
+    def start(self):
+        return self._span[0]
+
+    def end(self):
+        return self._span[1]
+
+    def span(self):
+        return self._span
+
+    def expand(self, template):
+        return self.match.expand(template.decode("utf-8")).encode("utf-8")
+
+
+class _TextRegex:
+    """A str regex over UTF-8 bytes (Unicode case folding and \\b), reporting byte offsets."""
+    def __init__(self, regex):
+        self.regex = regex
+
+    def finditer(self, data):
+        # surrogateescape maps invalid bytes to one char each and back, so offsets stay exact
+        text = bytes(data).decode("utf-8", "surrogateescape")
+        pos = byte_pos = 0
+        for m in self.regex.finditer(text):
+            start, end = m.span()
+            byte_pos += len(text[pos:start].encode("utf-8", "surrogateescape"))
+            byte_end = byte_pos + len(text[start:end].encode("utf-8", "surrogateescape"))
+            yield _ByteSpan(m, (byte_pos, byte_end))
+            pos, byte_pos = end, byte_end
+
+
+def _compile(spec):
+    """spec: (pattern, is_regex, case_sensitive, whole_word). Returns (regex, needle or None)."""
+    cached = _compiled.get(spec)
+    if cached is not None:
+        return cached
+    pattern, is_regex, case_sensitive, whole_word = spec
+    body = pattern if is_regex else re.escape(pattern)
+    if whole_word:
+        body = rf"\b(?:{body})\b"
+    flags = 0 if case_sensitive else re.IGNORECASE
+    if not pattern.isascii() and (whole_word or not case_sensitive):
+        regex = _TextRegex(re.compile(body, flags))
+    else:
+        regex = re.compile(body.encode("utf-8"), flags)
+    # A case-sensitive literal must appear verbatim: mmap.find rejects most files without the regex
+    needle = pattern.encode("utf-8") if not is_regex and case_sensitive else None
+    _compiled[spec] = (regex, needle)
+    return regex, needle
+
+
+def _line_matches(mm, regex):
+    """[(line_no, col, end_col, text)] for every match in a mapped file (1-based lines, char columns)."""
+    found = []
+    line_no, counted_to = 1, 0
+    for m in regex.finditer(mm):
+        start, end = m.span()
+        if start == end:
+            continue
+        line_start = mm.rfind(b"\n", 0, start) + 1
+        line_end = mm.find(b"\n", start)
+        if line_end == -1:
+            line_end = len(mm)
+        line_no += mm[counted_to:line_start].count(b"\n")
+        counted_to = line_start
+        col = len(mm[line_start:start].decode("utf-8", "replace"))
+        end_col = col + len(mm[start:min(end, line_end)].decode("utf-8", "replace"))
+        text = mm[line_start:min(line_end, line_start + MAX_LINE_CHARS * 4)].decode("utf-8", "replace")
+        found.append((line_no, col, end_col, text.rstrip("\r")[:MAX_LINE_CHARS]))
+        if len(found) >= MAX_MATCHES_PER_FILE:
+            break
+    return found
+
+
+def search_files(root, rels, spec):
+    """Worker entry point. Returns ([(rel, matches)], bytes scanned)."""
+    regex, needle = _compile(spec)
+    results = []
+    scanned = 0
+    for rel in rels:
+        try:
+            with open(os.path.join(root, *rel.split("/")), "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0 or size > MAX_FILE_BYTES:
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if mm.find(b"\0", 0, BINARY_SNIFF_BYTES) != -1:
+                        continue
+                    scanned += size
+                    if needle is not None and mm.find(needle) == -1:
+                        continue
+                    matches = _line_matches(mm, regex)
+        except (OSError, ValueError):
+            continue
+        if matches:
+            results.append((rel, matches))
+    return results, scanned
+
+
+def file_edits(data, spec, replacement):
+    """[(start, end, new bytes)] replacing every match of spec in data."""
+    regex, _ = _compile(spec)
+    template = replacement.encode("utf-8")
+    edits = []
+    for m in regex.finditer(data):
+        if m.start() == m.end():
+            continue
+        edits.append((m.start(), m.end(), m.expand(template) if spec[1] else template))
+    return edits
+
+
+def apply_edits(data, edits):
+    parts = []
+    pos = 0
+    for start, end, new in edits:
+        parts.append(data[pos:start])
+        parts.append(new)
+        pos = end
+    parts.append(data[pos:])
+    return b"".join(parts)
+
+
+def replace_files(root, rels, spec, replacement):
+    """Worker entry point. Returns ([(rel, size, mtime_ns, edits)], bytes scanned)."""
+    _, needle = _compile(spec)
+    results = []
+    scanned = 0
+    for rel in rels:
+        try:
+            with open(os.path.join(root, *rel.split("/")), "rb") as f:
+                st = os.fstat(f.fileno())
+                if st.st_size == 0 or st.st_size > MAX_FILE_BYTES:
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if mm.find(b"\0", 0, BINARY_SNIFF_BYTES) != -1:
+                        continue
+                    scanned += st.st_size
+                    if needle is not None and mm.find(needle) == -1:
+                        continue
+                    edits = file_edits(mm, spec, replacement)
+        except (OSError, ValueError):
+            continue
+        if edits:
+            results.append((rel, st.st_size, st.st_mtime_ns, edits))
+    return results, scanned
+
+
+class SearchService:
+    @boot_profiler.trace
+    def __init__(self, index, trigrams=None, max_workers=None):
+        self.index = index
+        self.trigrams = trigrams
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self._pool = None
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def search(self, pattern, regex=False, case_sensitive=False, whole_word=False, max_results=MAX_RESULTS):
+        """
+        Starts a search in the background, cancelling any running one.
+        Returns its id. Raises re.error for an invalid pattern.
+        """
+        spec = (pattern, bool(regex), bool(case_sensitive), bool(whole_word))
+        _compile(spec)
+        with self._lock:
+            self._generation += 1
+            search_id = self._generation
+        threading.Thread(target=self._run, args=(search_id, spec, max_results), name="search", daemon=True).start()
+        return search_id
+
+    def cancel(self):
+        with self._lock:
+            self._generation += 1
+
+    def stop(self):
+        self.cancel()
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = process_pool(self.max_workers)
+            return self._pool
+
+    def candidate_paths(self, spec):
+        """Workspace-relative files that may contain matches of spec."""
+        if self.trigrams is not None and self.trigrams.ready.is_set():
+            return self.trigrams.candidates(spec)
+        return self.index.paths()
+
+    def _chunks(self, rels):
+        chunk, chunk_bytes = [], 0
+        for rel in rels:
+            st = self.index.stat(rel)
+            chunk.append(rel)
+            chunk_bytes += st[0] if st else 0
+            if chunk_bytes >= CHUNK_BYTES or len(chunk) >= CHUNK_FILES:
+                yield chunk
+                chunk, chunk_bytes = [], 0
+        if chunk:
+            yield chunk
+
+    def _run(self, search_id, spec, max_results):
+        started = time.perf_counter()
+        totals = {"files": 0, "matches": 0}
+
+        def on_results(results):
+            totals["files"] += len(results)
+            totals["matches"] += sum(len(found) for _, found in results)
+            global_event_bus.publish("search_results", {"id": search_id, "results": results})
+            return totals["matches"] >= max_results
+
+        scanned, cancelled, truncated = self._fan_out(search_id, spec, search_files, (), on_results)
+        global_event_bus.publish("search_done", {
+            "id": search_id, "files": totals["files"], "matches": totals["matches"], "scanned_bytes": scanned,
+            "elapsed": time.perf_counter() - started, "cancelled": cancelled, "truncated": truncated,
+        })
+
+    def _fan_out(self, job_id, spec, worker, extra, on_results):
+        """
+        Runs worker(root, chunk, spec, *extra) -> (results, bytes scanned) over the
+        candidate files, calling on_results(results) for each non-empty chunk
+        until it returns True. Returns (bytes scanned, cancelled, stopped early).
+        """
+        self.index.ready.wait(30)
+        scanned = 0
+        chunks = list(self._chunks(self.candidate_paths(spec)))
+        if len(chunks) == 1 and sum((self.index.stat(rel) or (0,))[0] for rel in chunks[0]) <= INLINE_BYTES:
+            # Few candidates (usually narrowed by the trigram index): no pool round trip
+            results, scanned = worker(self.index.root, chunks.pop(), spec, *extra)
+            if job_id != self._generation:
+                return scanned, True, False
+            if results and on_results(results):
+                return scanned, False, True
+        chunks = iter(chunks)
+        pending = set()
+        cancelled = stopped = False
+
+        def fill():
+            while len(pending) < self.max_workers * 2:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                pending.add(self._executor().submit(worker, self.index.root, chunk, spec, *extra))
+
+        try:
+            fill()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                if job_id != self._generation:
+                    cancelled = True
+                    break
+                for future in done:
+                    results, chunk_scanned = future.result()
+                    scanned += chunk_scanned
+                    if results and on_results(results):
+                        stopped = True
+                if stopped:
+                    break
+                fill()
+        except BrokenProcessPool as e:
+            print(f"Search worker pool failed: {e}")
+            with self._lock:
+                self._pool = None
+        for future in pending:
+            future.cancel()
+        return scanned, cancelled, stopped
+
+    # --- replace ---
+
+    def plan_replace(self, pattern, replacement, regex=False, case_sensitive=False, whole_word=False):
+        """
+        Computes the edits of a workspace-wide replace in the background, cancelling
+        any running search, and publishes "replace_ready" with a ReplacePlan.
+        Returns its id. Raises re.error for an invalid pattern or replacement.
+        """
+        spec = (pattern, bool(regex), bool(case_sensitive), bool(whole_word))
+        compiled, _ = _compile(spec)
+        if regex:
+            compiled.sub(replacement.encode("utf-8"), b"")  # validates group references
+        with self._lock:
+            self._generation += 1
+            job_id = self._generation
+        threading.Thread(target=self._run_replace, args=(job_id, spec, replacement), name="replace", daemon=True).start()
+        return job_id
+
+    def _run_replace(self, job_id, spec, replacement):
+        plan = ReplacePlan(self.index.root, spec, replacement)
+        _, cancelled, _ = self._fan_out(job_id, spec, replace_files, (replacement,), plan.add)
+        global_event_bus.publish("replace_ready", {"id": job_id, "plan": plan, "cancelled": cancelled})
+
+    def commit_replace(self, plan, vfs, rels=None):
+        """Writes the plan (or the given files of it) in the background; publishes "replace_committed"."""
+        def run():
+            try:
+                written = plan.commit(vfs, rels)
+                error = None
+            except RollbackError as e:
+                # The rest was rolled back; these files kept their new content
+                written, error = [os.path.relpath(path, plan.root) for path in e.paths], str(e)
+            except Exception as e:
+                written, error = [], str(e)
+            global_event_bus.publish("replace_committed", {"files": written, "error": error})
+        threading.Thread(target=run, name="replace-commit", daemon=True).start()
+
+
+class ReplacePlan:
+    """
+    The per-file edits of a workspace replace, as (start, end, new bytes) byte
+    ranges computed by the workers. Nothing is written until commit().
+    """
+    def __init__(self, root, spec, replacement):
+        self.root = root
+        self.spec = spec
+        self.replacement = replacement
+        self.files = {}  # rel -> (size, mtime_ns, edits)
+
+    def add(self, results):
+        for rel, size, mtime_ns, edits in results:
+            self.files[rel] = (size, mtime_ns, edits)
+        return False
+
+    def __len__(self):
+        return len(self.files)
+
+    def count(self, rel=None):
+        """Number of replacements in one file, or in the whole plan."""
+        if rel is not None:
+            return len(self.files[rel][2])
+        return sum(len(edits) for _, _, edits in self.files.values())
+
+    def _path(self, rel):
+        return os.path.join(self.root, *rel.split("/"))
+
+    def _current(self, rel):
+        """(old bytes, new bytes) of a file, recomputing the edits if it changed since planning."""
+        with open(self._path(rel), "rb") as f:
+            data = f.read()
+            st = os.fstat(f.fileno())
+        size, mtime_ns, edits = self.files[rel]
+        if (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+            edits = file_edits(data, self.spec, self.replacement)
+        return data, apply_edits(data, edits)
+
+    def preview(self, rel, context=3):
+        """Unified diff of one file, computed on demand."""
+        old, new = self._current(rel)
+        return "".join(difflib.unified_diff(
+            decode_text(old, errors="replace").splitlines(keepends=True),
+            decode_text(new, errors="replace").splitlines(keepends=True),
+            f"a/{rel}", f"b/{rel}", n=context,
+        ))
+
+    def commit(self, vfs, rels=None):
+        """
+        Writes every file (or rels) in one VFS transaction and a single vfs_write
+        event. A failure rolls back the files already replaced; if some cannot
+        be restored, the RollbackError names them. Returns the written
+        workspace-relative paths.
+        """
+        written = []
+        with vfs.transaction(wait=True) as tx:
+            for rel in (rels if rels is not None else list(self.files)):
+                old, new = self._current(rel)
+                if new != old:
+                    tx.write(self._path(rel), new)
+                    written.append(rel)
+        return written
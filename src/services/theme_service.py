@@ -4,6 +4,7 @@ Manages application themes and color palettes.
 """
 from src.core.event_bus import global_event_bus
 from src.core.container import get_service
+from src.core.profiler import boot_profiler
 
 class Theme:
     def __init__(self, name, colors):
@@ -11,6 +12,7 @@ class Theme:
         self.colors = colors
 
 class ThemeService:
+    @boot_profiler.trace
     def __init__(self):
         self._themes = {}
         self._current_theme = None
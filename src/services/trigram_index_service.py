@@ -0,0 +1,444 @@
+"""
+Trigram Index Service
+Narrows find-in-files to the files that can contain a match.
+
+For every text file of the workspace index, the set of byte trigrams it
+contains (ASCII-lowercased, so one index serves case-sensitive and
+-insensitive searches) is recorded as posting lists of file ids. A query's
+required literals (the whole pattern for literal searches; the mandatory
+literal runs of a regex) are split into trigrams, and only the files whose
+posting lists contain all of them are searched.
+
+The index is built on a process pool and saved to .fervv/index/trigrams.idx,
+which is memory-mapped at load: posting lists are decoded only when a query
+touches them. Files changed after the build live in an in-memory overlay fed
+by "workspace_index_changed"; once the overlay grows large the index is
+rebuilt in the background and swapped in.
+
+File format (little-endian):
+    "FVTG", version, file count, trigram count, meta length
+    meta     JSON [[rel, size, mtime_ns, kind], ...], padded to 4 bytes
+    keys     uint32[trigram count], sorted
+    counts   uint32[trigram count]
+    offsets  uint32[trigram count + 1] into the postings area
+    postings LEB128 varints: the first file id, then the gaps to the next
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+from src.core.event_bus import global_event_bus
+from src.core.process_pool import process_pool
+from src.core.profiler import boot_profiler
+from src.core.workspace import state_dir
+
+TRIGRAM_FILE = "trigrams.idx"
+TRIGRAM_MAGIC = b"FVTG"
+TRIGRAM_VERSION = 1
+HEADER = struct.Struct("<4sIIII")
+# Larger files are not indexed; they are always searched
+INDEX_MAX_FILE_BYTES = 4 * 1024 * 1024
+BINARY_SNIFF_BYTES = 8192
+CHUNK_FILES = 128
+# Overlay size at which a background rebuild is cheaper than carrying it
+REBUILD_THRESHOLD = 5000
+
+TEXT, BINARY, LARGE = 0, 1, 2
+
+
+def file_trigrams(data):
+    """Set of trigrams of data as ints (b0 | b1 << 8 | b2 << 16), ASCII-lowercased."""
+    data = data.lower()
+    if len(data) < 4:
+        return {int.from_bytes(data[i:i + 3], "little") for i in range(len(data) - 2)}
+    # Every 4-byte word at the four alignments, deduplicated in C; each holds two trigrams
+    quads = set()
+    for offset in range(4):
+        end = offset + (len(data) - offset) // 4 * 4
+        words = array("I", data[offset:end])
+        if sys.byteorder == "big":
+            words.byteswap()
+        quads.update(words)
+    return {q & 0xFFFFFF for q in quads} | {q >> 8 for q in quads}
+
+
+def encode_varint(value, out):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_postings(buf):
+    """File ids of an encoded posting list."""
+    ids = []
+    current = shift = value = 0
+    for byte in buf:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        current += value
+        ids.append(current)
+        value = shift = 0
+    return ids
+
+
+def read_entry(path):
+    """(size, mtime_ns, kind, trigrams or None) of one file. Raises OSError."""
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        if st.st_size > INDEX_MAX_FILE_BYTES:
+            return st.st_size, st.st_mtime_ns, LARGE, None
+        data = f.read()
+    if b"\0" in data[:BINARY_SNIFF_BYTES]:
+        return st.st_size, st.st_mtime_ns, BINARY, None
+    return st.st_size, st.st_mtime_ns, TEXT, file_trigrams(data)
+
+
+def index_files(root, rels, first_id):
+    """
+    Worker entry point: indexes rels as file ids first_id, first_id + 1, ...
+    Returns ([(rel, size, mtime_ns, kind)], {trigram: (first id, last id, encoded gaps after the first, count)}).
+    """
+    files = []
+    lists = {}
+    for offset, rel in enumerate(rels):
+        try:
+            size, mtime, kind, trigrams = read_entry(os.path.join(root, *rel.split("/")))
+        except OSError:
+            size, mtime, kind, trigrams = 0, 0, BINARY, None
+        files.append((rel, size, mtime, kind))
+        for trigram in trigrams or ():
+            lists.setdefault(trigram, []).append(first_id + offset)
+    segments = {}
+    for trigram, ids in lists.items():
+        gaps = bytearray()
+        for previous, current in zip(ids, ids[1:]):
+            encode_varint(current - previous, gaps)
+        segments[trigram] = (ids[0], ids[-1], bytes(gaps), len(ids))
+    return files, segments
+
+
+def build_index(root, rels, path, max_workers=None):
+    """Indexes rels on a process pool and writes the index file to path."""
+    chunks = [rels[i:i + CHUNK_FILES] for i in range(0, len(rels), CHUNK_FILES)]
+    files = []
+    merged = {}  # trigram -> [encoded bytearray, last id, count]
+    with process_pool(max_workers) as pool:
+        results = pool.map(index_files, [root] * len(chunks), chunks,
+                           [i * CHUNK_FILES for i in range(len(chunks))])
+        for chunk_files, segments in results:  # in chunk order, so ids stay ascending
+            files.extend(chunk_files)
+            for trigram, (first, last, gaps, count) in segments.items():
+                entry = merged.get(trigram)
+                if entry is None:
+                    entry = merged[trigram] = [bytearray(), 0, 0]
+                encode_varint(first - entry[1], entry[0])
+                entry[0] += gaps
+                entry[1] = last
+                entry[2] += count
+
+    keys = array("I", sorted(merged))
+    counts = array("I")
+    offsets = array("I", [0])
+    postings = bytearray()
+    for trigram in keys:
+        encoded, _, count = merged[trigram]
+        postings += encoded
+        counts.append(count)
+        offsets.append(len(postings))
+    meta = json.dumps([list(f) for f in files], separators=(",", ":")).encode("utf-8")
+    meta += b" " * (-len(meta) % 4)
+    temp = path + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(HEADER.pack(TRIGRAM_MAGIC, TRIGRAM_VERSION, len(files), len(keys), len(meta)))
+        f.write(meta)
+        for column in (keys, counts, offsets):
+            if sys.byteorder == "big":
+                column.byteswap()
+            f.write(column.tobytes())
+        f.write(postings)
+    return temp
+
+
+def required_trigrams(spec):
+    """
+    Trigrams every match of spec (pattern, is_regex, case_sensitive, whole_word)
+    must contain, or None when the query cannot be narrowed.
+    """
+    pattern, is_regex, case_sensitive = spec[0], spec[1], spec[2]
+    if is_regex:
+        try:
+            parsed = sre_parse.parse(pattern)
+        except Exception:
+            return None
+        runs = _literal_runs(parsed)
+        case_sensitive = case_sensitive and not parsed.state.flags & sre_parse.SRE_FLAG_IGNORECASE
+    else:
+        runs = [pattern]
+    trigrams = set()
+    for run in runs:
+        data = run.encode("utf-8").lower()
+        for i in range(len(data) - 2):
+            # The index only folds ASCII: other bytes of a case-insensitive query prove nothing
+            if case_sensitive or data[i:i + 3].isascii():
+                trigrams.add(int.from_bytes(data[i:i + 3], "little"))
+    return trigrams or None
+
+
+def _literal_runs(parsed):
+    """Literal strings that every match of a parsed regex contains (top-level sequence only)."""
+    runs, current = [], []
+    for op, value in parsed:
+        if op is sre_parse.LITERAL:
+            current.append(chr(value))
+            continue
+        if current:
+            runs.append("".join(current))
+            current = []
+        if op is sre_parse.SUBPATTERN:
+            # A scoped (?i:...) folds case beyond what the ASCII-lowercased index knows
+            if not value[1] & sre_parse.SRE_FLAG_IGNORECASE:
+                runs.extend(_literal_runs(value[-1]))
+        # Anything else (alternatives, repeats, classes) contributes no mandatory literal
+    if current:
+        runs.append("".join(current))
+    return runs
+
+
+class TrigramIndex:
+    """A saved index, memory-mapped."""
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, file_count, count, meta_len = HEADER.unpack_from(self._mm, 0)
+            if magic != TRIGRAM_MAGIC or version != TRIGRAM_VERSION:
+                raise ValueError("not a trigram index")
+            pos = HEADER.size
+            self.files = json.loads(self._mm[pos:pos + meta_len].decode("utf-8"))
+            if len(self.files) != file_count:
+                raise ValueError("corrupt trigram index")
+            pos += meta_len
+            view = memoryview(self._mm)
+            self._views = [view]
+            columns = []
+            for length in (count, count, count + 1):
+                end = pos + length * 4
+                if sys.byteorder == "big":
+                    columns.append(array("I", self._mm[pos:end]))
+                    columns[-1].byteswap()
+                else:
+                    columns.append(view[pos:end].cast("I"))
+                    self._views.append(columns[-1])
+                pos = end
+            self.keys, self.counts, self.offsets = columns
+            self._postings_start = pos
+        except Exception:
+            self.close()
+            raise
+        self.rows = {f[0]: i for i, f in enumerate(self.files)}
+        self.large = [i for i, f in enumerate(self.files) if f[3] == LARGE]
+
+    @classmethod
+    def open(cls, path):
+        """The index at path, or None if it is missing or unreadable."""
+        try:
+            return cls(path)
+        except (OSError, ValueError, KeyError, struct.error):
+            return None
+
+    def postings(self, trigram):
+        index = bisect_left(self.keys, trigram)
+        if index == len(self.keys) or self.keys[index] != trigram:
+            return []
+        start = self._postings_start + self.offsets[index]
+        end = self._postings_start + self.offsets[index + 1]
+        return decode_postings(self._mm[start:end])
+
+    def count(self, trigram):
+        index = bisect_left(self.keys, trigram)
+        if index == len(self.keys) or self.keys[index] != trigram:
+            return 0
+        return self.counts[index]
+
+    def search(self, trigrams):
+        """Ids of the text files containing every trigram, plus every unindexed large file."""
+        ordered = sorted(trigrams, key=self.count)
+        ids = None
+        for trigram in ordered:
+            found = self.postings(trigram)
+            ids = set(found) if ids is None else ids.intersection(found)
+            if not ids:
+                break
+        return sorted(ids or ()) + self.large
+
+    def close(self):
+        for view in reversed(getattr(self, "_views", [])):
+            view.release()
+        self._views = []
+        if getattr(self, "_mm", None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+
+class TrigramIndexService:
+    @boot_profiler.trace
+    def __init__(self, index, max_workers=None):
+        self.index = index
+        self.max_workers = max_workers
+        self.base = None
+        self.ready = threading.Event()
+        # rel -> (seq, trigrams | None (gone) | True (too large: always searched)), for files changed since the build
+        self._dirty = {}
+        # rel -> seq, for changed files whose trigrams are not extracted yet (always searched)
+        self._pending = {}
+        self._seq = 0
+        self._lock = threading.RLock()
+        self._worker = None
+        self._building = False
+        self._subscription = None
+        self._path = None
+
+    def start(self):
+        if self._subscription is not None:
+            return
+        self._path = os.path.join(state_dir("index", root=self.index.root), TRIGRAM_FILE)
+        self._subscription = global_event_bus.subscribe("workspace_index_changed", self._on_index_changed)
+        threading.Thread(target=self._load, name="trigram-index", daemon=True).start()
+
+    def stop(self):
+        if self._subscription is not None:
+            self._subscription.unsubscribe()
+            self._subscription = None
+        with self._lock:
+            if self.base is not None:
+                self.base.close()
+                self.base = None
+            self.ready.clear()
+
+    # --- queries ---
+
+    def candidates(self, spec):
+        """Workspace-relative files that may contain matches of spec."""
+        required = required_trigrams(spec)
+        with self._lock:
+            if required is None or self.base is None:
+                return self.index.paths()
+            files = self.base.files
+            dirty, pending = self._dirty, self._pending
+            result = [files[i][0] for i in self.base.search(required)]
+            result = [rel for rel in result if rel not in dirty and rel not in pending]
+            for rel, (_, trigrams) in dirty.items():
+                if trigrams is True or (trigrams and required <= trigrams):
+                    result.append(rel)
+            result.extend(pending)
+            return result
+
+    # --- maintenance ---
+
+    def _load(self):
+        self.index.ready.wait()
+        base = TrigramIndex.open(self._path)
+        if base is None:
+            self.rebuild()
+            return
+        stale = []
+        for rel, row in base.rows.items():
+            st = self.index.stat(rel)
+            if st is None:
+                stale.append(rel)
+            elif st != (base.files[row][1], base.files[row][2]):
+                stale.append(rel)
+        stale.extend(rel for rel in self.index.paths() if rel not in base.rows)
+        with self._lock:
+            self.base = base
+        self._queue(stale)
+        self.ready.set()
+
+    def rebuild(self):
+        """Reindexes the whole workspace on a process pool, then swaps the new index in."""
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+            started = self._seq
+        try:
+            temp = build_index(self.index.root, self.index.paths(), self._path, self.max_workers)
+            with self._lock:
+                if self.base is not None:
+                    self.base.close()  # Windows cannot replace a mapped file
+                try:
+                    os.replace(temp, self._path)
+                    # Changes queued before the build started are in the new index
+                    self._dirty = {rel: entry for rel, entry in self._dirty.items() if entry[0] > started}
+                    self._pending = {rel: seq for rel, seq in self._pending.items() if seq > started}
+                finally:
+                    self.base = TrigramIndex.open(self._path)
+        except (OSError, RuntimeError) as e:
+            print(f"Trigram index build error: {e}")
+        finally:
+            with self._lock:
+                self._building = False
+                self._start_worker()
+        self.ready.set()
+
+    def _on_index_changed(self, changes):
+        with self._lock:
+            for rel in changes["removed"]:
+                self._seq += 1
+                self._pending.pop(rel, None)
+                self._dirty[rel] = (self._seq, None)
+        self._queue(changes["added"] + changes["modified"])
+
+    def _queue(self, rels):
+        if not rels:
+            return
+        with self._lock:
+            for rel in rels:
+                self._seq += 1
+                self._pending[rel] = self._seq
+            if len(self._dirty) + len(self._pending) > REBUILD_THRESHOLD:
+                threading.Thread(target=self.rebuild, name="trigram-rebuild", daemon=True).start()
+                return
+            self._start_worker()
+
+    def _start_worker(self):
+        if self._worker is None and self._pending and not self._building:
+            self._worker = threading.Thread(target=self._drain, name="trigram-overlay", daemon=True)
+            self._worker.start()
+
+    def _drain(self):
+        """Extracts the trigrams of pending files into the overlay."""
+        while True:
+            with self._lock:
+                batch = list(self._pending.items())[:64]
+                if not batch or self._building:
+                    self._worker = None
+                    return
+            entries = []
+            for rel, seq in batch:
+                try:
+                    _, _, kind, trigrams = read_entry(self.index.abspath(rel))
+                    value = True if kind == LARGE else frozenset(trigrams or ())
+                except OSError:
+                    value = None
+                entries.append((rel, seq, value))
+            with self._lock:
+                for rel, seq, value in entries:
+                    # Changed again meanwhile: leave it pending for the next round
+                    if self._pending.get(rel) == seq:
+                        del self._pending[rel]
+                        self._dirty[rel] = (seq, value)
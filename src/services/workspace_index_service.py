@@ -0,0 +1,368 @@
+"""
+Workspace Index Service
+Every file of the workspace in a compact path table (directory id, name, size,
+mtime), for quick-open, search and agent context building.
+
+The first scan walks the tree on a thread pool (scandir and stat release the
+GIL), honouring .gitignore/.ignore rules. The table is saved under
+.fervv/index/ and reloaded at startup; a background rescan then reconciles it
+with the disk, and FileWatcher batches keep it current from there.
+
+Event: "workspace_index_changed" {"added": [rel], "removed": [rel], "modified": [rel]}
+with workspace-relative, '/'-separated paths.
+"""
+import json
+import os
+import struct
+import threading
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from src.core.event_bus import global_event_bus
+from src.core.ignore import ALWAYS_IGNORED, IGNORE_FILES, IgnoreRules, IgnoreStack
+from src.core.profiler import boot_profiler
+from src.core.workspace import state_dir
+
+INDEX_FILE = "files.idx"
+INDEX_MAGIC = b"FVIX"
+INDEX_VERSION = 1
+SAVE_DELAY_SECONDS = 2.0
+DEAD = 0xFFFFFFFF
+
+
+class PathTable:
+    """
+    Column store of files: dir_ids/sizes/mtimes arrays plus a names list,
+    with directories interned in their own table. Removed rows are tombstoned
+    (dir id DEAD) and dropped when the table is saved.
+    """
+    def __init__(self):
+        self.dirs = [""]
+        self.dir_ids = {"": 0}
+        self.names = []
+        self.file_dirs = array("I")
+        self.sizes = array("Q")
+        self.mtimes = array("q")
+        self.rows = {}  # rel path -> row
+        self.version = 0
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _dir_id(self, dir_rel):
+        index = self.dir_ids.get(dir_rel)
+        if index is None:
+            index = self.dir_ids[dir_rel] = len(self.dirs)
+            self.dirs.append(dir_rel)
+        return index
+
+    def path(self, row):
+        directory = self.dirs[self.file_dirs[row]]
+        return f"{directory}/{self.names[row]}" if directory else self.names[row]
+
+    def upsert(self, rel, size, mtime_ns):
+        """Adds or updates a file. Returns True if it is new."""
+        self.version += 1
+        row = self.rows.get(rel)
+        if row is not None:
+            self.sizes[row] = size
+            self.mtimes[row] = mtime_ns
+            return False
+        directory, _, name = rel.rpartition("/")
+        self.rows[rel] = len(self.names)
+        self.names.append(name)
+        self.file_dirs.append(self._dir_id(directory))
+        self.sizes.append(size)
+        self.mtimes.append(mtime_ns)
+        return True
+
+    def remove(self, rel):
+        row = self.rows.pop(rel, None)
+        if row is None:
+            return False
+        self.version += 1
+        self.file_dirs[row] = DEAD
+        return True
+
+    def remove_tree(self, dir_rel):
+        """Removes every file below dir_rel. Returns the removed paths."""
+        prefix = dir_rel + "/"
+        removed = [rel for rel in self.rows if rel.startswith(prefix)]
+        for rel in removed:
+            self.remove(rel)
+        return removed
+
+    def get(self, rel):
+        """(size, mtime_ns) of a file, or None."""
+        row = self.rows.get(rel)
+        if row is None:
+            return None
+        return self.sizes[row], self.mtimes[row]
+
+    def paths(self):
+        return list(self.rows)
+
+    # --- persistence: magic, version, json length, json (dirs, names), then the arrays ---
+
+    def save(self, path):
+        live = sorted(self.rows.values())
+        names = [self.names[row] for row in live]
+        file_dirs = array("I", (self.file_dirs[row] for row in live))
+        sizes = array("Q", (self.sizes[row] for row in live))
+        mtimes = array("q", (self.mtimes[row] for row in live))
+        meta = json.dumps({"dirs": self.dirs, "names": names}, separators=(",", ":")).encode("utf-8")
+        temp = path + ".tmp"
+        with open(temp, "wb") as f:
+            f.write(INDEX_MAGIC + struct.pack("<II", INDEX_VERSION, len(meta)))
+            f.write(meta)
+            for column in (file_dirs, sizes, mtimes):
+                f.write(column.tobytes())
+        os.replace(temp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Returns the saved table, or None if it is missing or unreadable."""
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            if data[:4] != INDEX_MAGIC:
+                return None
+            version, meta_len = struct.unpack_from("<II", data, 4)
+            if version != INDEX_VERSION:
+                return None
+            pos = 12 + meta_len
+            meta = json.loads(data[12:pos].decode("utf-8"))
+            table = cls()
+            table.dirs = meta["dirs"]
+            table.dir_ids = {d: i for i, d in enumerate(table.dirs)}
+            table.names = meta["names"]
+            count = len(table.names)
+            for attr, code in (("file_dirs", "I"), ("sizes", "Q"), ("mtimes", "q")):
+                column = array(code)
+                end = pos + count * column.itemsize
+                column.frombytes(data[pos:end])
+                setattr(table, attr, column)
+                pos = end
+            table.rows = {table.path(row): row for row in range(count)}
+            return table
+        except (OSError, ValueError, KeyError, struct.error):
+            return None
+
+
+def scan_tree(root, max_workers=8, start_rel="", stack=None):
+    """
+    Walks root in parallel. Returns ({rel: (size, mtime_ns)}, {dir_rel: IgnoreRules or None}).
+    start_rel/stack restrict the walk to a subtree whose ancestors' rules are given.
+    """
+    files = {}
+    rules_by_dir = {}
+
+    def scan(dir_rel, dir_stack):
+        full = os.path.join(root, dir_rel) if dir_rel else root
+        rules = IgnoreRules.from_directory(full)
+        dir_stack = dir_stack.child(dir_rel, rules)
+        found, subdirs = [], []
+        try:
+            with os.scandir(full) as entries:
+                for entry in entries:
+                    if entry.name in ALWAYS_IGNORED:
+                        continue
+                    rel = f"{dir_rel}/{entry.name}" if dir_rel else entry.name
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if dir_stack.entries and dir_stack.is_ignored(rel, is_dir):
+                            continue
+                        if is_dir:
+                            subdirs.append(rel)
+                        elif entry.is_file():
+                            st = entry.stat()
+                            found.append((rel, st.st_size, st.st_mtime_ns))
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return dir_rel, rules, dir_stack, found, subdirs
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="index-scan") as pool:
+        pending = {pool.submit(scan, start_rel, stack or IgnoreStack())}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                dir_rel, rules, dir_stack, found, subdirs = future.result()
+                rules_by_dir[dir_rel] = rules
+                for rel, size, mtime in found:
+                    files[rel] = (size, mtime)
+                for sub in subdirs:
+                    pending.add(pool.submit(scan, sub, dir_stack))
+    return files, rules_by_dir
+
+
+class WorkspaceIndexService:
+    @boot_profiler.trace
+    def __init__(self, root=None, max_workers=8):
+        self.root = os.path.abspath(root or os.getcwd())
+        self.max_workers = max_workers
+        self.table = PathTable()
+        self.ready = threading.Event()
+        self._rules = {}  # dir_rel -> IgnoreRules or None, for every indexed directory
+        self._lock = threading.RLock()
+        self._save_timer = None
+        self._subscription = None
+        self._index_path = None
+
+    def start(self):
+        """Loads the saved table, then reconciles it with the disk in the background."""
+        if self._subscription is not None:
+            return
+        self._index_path = os.path.join(state_dir("index", root=self.root), INDEX_FILE)
+        saved = PathTable.load(self._index_path)
+        if saved is not None:
+            self.table = saved
+            self.ready.set()
+        self._subscription = global_event_bus.subscribe("files_changed", self._on_files_changed)
+        threading.Thread(target=self.rescan, name="workspace-index", daemon=True).start()
+
+    def stop(self):
+        if self._subscription is not None:
+            self._subscription.unsubscribe()
+            self._subscription = None
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+        self.save()
+
+    # --- queries ---
+
+    def paths(self):
+        """Every indexed file, workspace-relative and '/'-separated."""
+        with self._lock:
+            return self.table.paths()
+
+    def abspath(self, rel):
+        return os.path.join(self.root, *rel.split("/"))
+
+    def stat(self, rel):
+        with self._lock:
+            return self.table.get(rel)
+
+    def __len__(self):
+        return len(self.table)
+
+    # --- updates ---
+
+    def rescan(self):
+        """Full parallel walk; diffs the result against the current table."""
+        files, rules = scan_tree(self.root, self.max_workers)
+        added, removed, modified = [], [], []
+        with self._lock:
+            for rel in self.table.paths():
+                if rel not in files:
+                    self.table.remove(rel)
+                    removed.append(rel)
+            for rel, (size, mtime) in files.items():
+                if self.table.get(rel) == (size, mtime):
+                    continue
+                (added if self.table.upsert(rel, size, mtime) else modified).append(rel)
+            self._rules = rules
+        self.ready.set()
+        self._changed(added, removed, modified)
+
+    def _rel(self, path):
+        rel = os.path.relpath(path, self.root)
+        if rel.startswith(".."):
+            return None
+        return rel.replace(os.sep, "/")
+
+    def _stack_for(self, dir_rel):
+        """Ignore rules in effect inside an indexed directory (None if it is not indexed)."""
+        if dir_rel not in self._rules:
+            return None
+        parts = dir_rel.split("/") if dir_rel else []
+        stack = IgnoreStack()
+        for depth in range(len(parts) + 1):
+            ancestor = "/".join(parts[:depth])
+            stack = stack.child(ancestor, self._rules.get(ancestor))
+        return stack
+
+    def _add_path(self, rel, added, modified):
+        parent = rel.rpartition("/")[0]
+        stack = self._stack_for(parent)
+        if stack is None:
+            return  # inside an ignored (or not yet indexed) directory
+        full = self.abspath(rel)
+        if os.path.isdir(full):
+            if stack.is_ignored(rel, True):
+                return
+            files, rules = scan_tree(self.root, self.max_workers, rel, stack)
+            self._rules.update(rules)
+            for sub, (size, mtime) in files.items():
+                (added if self.table.upsert(sub, size, mtime) else modified).append(sub)
+            return
+        if stack.is_ignored(rel, False):
+            return
+        try:
+            st = os.stat(full)
+        except OSError:
+            return
+        (added if self.table.upsert(rel, st.st_size, st.st_mtime_ns) else modified).append(rel)
+
+    def _remove_path(self, rel, removed):
+        if self.table.remove(rel):
+            removed.append(rel)
+        elif rel in self._rules:
+            removed.extend(self.table.remove_tree(rel))
+            for dir_rel in [d for d in self._rules if d == rel or d.startswith(rel + "/")]:
+                del self._rules[dir_rel]
+
+    def _on_files_changed(self, changes):
+        if changes["overflow"]:
+            self.rescan()
+            return
+        added, removed, modified = [], [], []
+        touched = changes["created"] + changes["modified"] + changes["deleted"]
+        touched += [path for pair in changes["renamed"] for path in pair]
+        rules_changed = any(os.path.basename(path) in IGNORE_FILES for path in touched)
+        with self._lock:
+            for path in changes["deleted"]:
+                rel = self._rel(path)
+                if rel is not None:
+                    self._remove_path(rel, removed)
+            for old, new in changes["renamed"]:
+                rel = self._rel(old)
+                if rel is not None:
+                    self._remove_path(rel, removed)
+                rel = self._rel(new)
+                if rel is not None:
+                    self._add_path(rel, added, modified)
+            for path in changes["created"] + changes["modified"]:
+                rel = self._rel(path)
+                if rel is not None:
+                    self._add_path(rel, added, modified)
+        if rules_changed:
+            # Ignore rules changed: what is indexed may change anywhere below them
+            self.rescan()
+        self._changed(added, removed, modified)
+
+    def _changed(self, added, removed, modified):
+        if not (added or removed or modified):
+            return
+        global_event_bus.publish("workspace_index_changed", {"added": added, "removed": removed, "modified": modified})
+        self._schedule_save()
+
+    def _schedule_save(self):
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(SAVE_DELAY_SECONDS, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def save(self):
+        with self._lock:
+            self._save_timer = None
+            if self._index_path is None:
+                return
+            try:
+                self.table.save(self._index_path)
+            except OSError as e:
+                print(f"Workspace index save error: {e}")
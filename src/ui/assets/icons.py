@@ -35,7 +35,9 @@ class IconFactory:
 # For this "WOW" effect, I will generate icons programmatically using PIL Draw.
 
 from PIL import Image, ImageDraw
+from src.core.profiler import boot_profiler
 
+@boot_profiler.trace(cat="icons")
 def get_icon(name, color="#00f3ff", size=(32, 32)):
     img = Image.new("RGBA", size, (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
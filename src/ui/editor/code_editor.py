@@ -63,11 +63,19 @@ class CodeEditor(ctk.CTkFrame):
     def save_file(self, event=None):
         if self.file_path:
             content = self.textbox.get("1.0", "end-1c")
-            if self.file_service.write_file(self.file_path, content):
-                print(f"Saved {self.file_path}")
+            # Written on the VFS writer thread; the UI never waits for the disk
+            future = self.file_service.write_file_async(self.file_path, content)
+            future.add_done_callback(lambda f, path=self.file_path: self._on_saved(path, f))
         else:
             print("No file path set. Save As not implemented.")
 
+    def _on_saved(self, path, future):
+        error = future.exception()
+        if error is None:
+            print(f"Saved {path}")
+        else:
+            print(f"Error writing file {path}: {error}")
+
     def on_key_release(self, event):
         self.update_line_numbers()
         self.debounce_highlight()
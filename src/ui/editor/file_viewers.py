@@ -0,0 +1,153 @@
+"""
+File Viewers
+Read-only views for files the editor should not load: a hex dump for binary
+files and a line pager for text files too large for a Tk text widget. Both
+render only the rows in view, read through VFS.read_range / VFS.read_lines,
+so a 300 MB file costs no more than a small one.
+"""
+import customtkinter as ctk
+import os
+import threading
+import tkinter.font as tkfont
+from src.core.container import get_service
+from src.core.event_bus import global_event_bus, DISPATCH_MAIN
+
+BYTES_PER_ROW = 16
+FONT = ("Consolas", 13)
+
+
+class _PagedView(ctk.CTkFrame):
+    def __init__(self, master, probe, **kwargs):
+        super().__init__(master, **kwargs)
+        self.theme = get_service("ThemeService")
+        self.vfs = get_service("VFS")
+        self.probe = probe
+        self.total_rows = 0
+        self.top = 0
+        self._line_height = tkfont.Font(family=FONT[0], size=FONT[1]).metrics("linespace")
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+        self.header = ctk.CTkLabel(self, text=self._describe(), text_color="gray", anchor="w", font=("Segoe UI", 11))
+        self.header.grid(row=0, column=0, columnspan=2, sticky="ew", padx=8)
+        self.text = ctk.CTkTextbox(
+            self, wrap="none", font=FONT, activate_scrollbars=False,
+            fg_color=self.theme.get_color("bg_main"), text_color=self.theme.get_color("fg_text"),
+        )
+        self.text.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+
+        self.text.bind("<Configure>", lambda e: self.render())
+        self.text.bind("<MouseWheel>", lambda e: self._scroll_by(-3 if e.delta > 0 else 3))
+        self.text.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.text.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.text.bind("<Prior>", lambda e: self._scroll_by(-self._visible_rows()))
+        self.text.bind("<Next>", lambda e: self._scroll_by(self._visible_rows()))
+
+    def _describe(self):
+        return f"{os.path.basename(self.probe.path)} - {self.probe.size:,} bytes (read-only)"
+
+    def _rows(self, first, count):
+        raise NotImplementedError
+
+    def _visible_rows(self):
+        return max(1, self.text.winfo_height() // self._line_height)
+
+    def _scroll_by(self, rows):
+        self._scroll_to(self.top + rows)
+        return "break"
+
+    def _scroll_to(self, top):
+        top = max(0, min(top, self.total_rows - self._visible_rows()))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self._scroll_to(int(float(value) * self.total_rows))
+        elif action == "scroll":
+            self._scroll_by(int(value) * (self._visible_rows() if unit == "pages" else 1))
+
+    def render(self):
+        visible = self._visible_rows()
+        rows = self._rows(self.top, visible)
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(rows))
+        self.text.configure(state="disabled")
+        if self.total_rows:
+            self.scrollbar.set(self.top / self.total_rows, min(1.0, (self.top + visible) / self.total_rows))
+
+
+class HexViewer(_PagedView):
+    """Offset, hex bytes and printable ASCII, 16 bytes per row."""
+    def __init__(self, master, probe, **kwargs):
+        super().__init__(master, probe, **kwargs)
+        self.total_rows = (probe.size + BYTES_PER_ROW - 1) // BYTES_PER_ROW
+
+    def _describe(self):
+        return super()._describe() + " - binary, shown as hex"
+
+    def _rows(self, first, count):
+        data = self.vfs.read_range(self.probe.path, first * BYTES_PER_ROW, count * BYTES_PER_ROW)
+        rows = []
+        for start in range(0, len(data), BYTES_PER_ROW):
+            chunk = data[start:start + BYTES_PER_ROW]
+            hex_part = " ".join(f"{b:02x}" for b in chunk)
+            ascii_part = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
+            rows.append(f"{first * BYTES_PER_ROW + start:08x}  {hex_part:<47}  {ascii_part}")
+        return rows
+
+
+class PagedTextViewer(_PagedView):
+    """A large text file, a screenful of lines at a time."""
+    def __init__(self, master, probe, **kwargs):
+        super().__init__(master, probe, **kwargs)
+        # Building the line index is one pass over the file: always off the UI thread.
+        # It is needed again whenever the mapping is evicted or the file changes.
+        self._line_count = None
+        self._indexing = False
+        self._subscriptions = [
+            global_event_bus.subscribe("line_index_ready", self._on_line_index, dispatch=DISPATCH_MAIN),
+        ]
+        self._reindex()
+
+    def destroy(self):
+        for sub in self._subscriptions:
+            sub.unsubscribe()
+        super().destroy()
+
+    def _describe(self):
+        return super()._describe() + f" - too large for the editor, {self.probe.encoding}"
+
+    def _reindex(self):
+        if not self._indexing:
+            self._indexing = True
+            threading.Thread(target=self._count_lines, name="line-index", daemon=True).start()
+
+    def _count_lines(self):
+        try:
+            lines = self.vfs.line_count(self.probe.path)
+        except OSError as e:
+            print(f"Error indexing {self.probe.path}: {e}")
+            lines = 0
+        global_event_bus.publish("line_index_ready", {"path": self.probe.path, "lines": lines})
+
+    def _on_line_index(self, ready):
+        if ready["path"] != self.probe.path:
+            return
+        self._indexing = False
+        # A rebuilt index may count more lines (e.g. an appended log)
+        self._line_count = self.total_rows = ready["lines"]
+        self.header.configure(text=self._describe() + f" - {self._line_count:,} lines")
+        self.render()
+
+    def _rows(self, first, count):
+        if self._line_count is not None:
+            rows = self.vfs.read_lines(self.probe.path, first, count, self.probe.encoding or "utf-8", "replace", block=False)
+            if rows is not None:
+                return rows
+            self._reindex()
+        return ["Indexing lines..."]
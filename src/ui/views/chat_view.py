@@ -6,11 +6,12 @@ import customtkinter as ctk
 import threading
 from src.core.kernel.kernel import kernel
 from src.core.event_bus import global_event_bus
+from src.core.profiler import boot_profiler
 
 class ChatView(ctk.CTkFrame):
+    @boot_profiler.trace
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
-        self.ai_service = kernel.get_service("AIService")
         
         # Main Layout: Stack vertically with pack
         # 1. Chat History (Top, expands)
@@ -53,6 +54,11 @@ class ChatView(ctk.CTkFrame):
         
         self.append_message("System", "AI Fervv is ready. 🧠")
 
+    @property
+    def ai_service(self):
+        # Resolved on demand: the AI service is built lazily on first use
+        return kernel.get_service("AIService")
+
     def send_message(self, event=None):
         prompt = self.input_field.get()
         if not prompt.strip():
@@ -6,15 +6,18 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk
 import os
-from src.core.event_bus import global_event_bus
+from src.core.event_bus import global_event_bus, DISPATCH_MAIN
 from src.core.container import get_service
+from src.core.profiler import boot_profiler
 
 class ExplorerView(ctk.CTkFrame):
+    @boot_profiler.trace
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
         self.file_service = get_service("FileService")
         self.theme = get_service("ThemeService")
         self.current_path = os.getcwd()
+        self._nodes = {}  # path -> tree item, for incremental updates
         
         # UI Setup
         self.pack_propagate(False)
@@ -22,7 +25,14 @@ class ExplorerView(ctk.CTkFrame):
         self.refresh()
         
         # Events
-        global_event_bus.subscribe("file_saved", self._on_file_changed)
+        self._subscriptions = [
+            global_event_bus.subscribe("files_changed", self._on_files_changed, dispatch=DISPATCH_MAIN),
+        ]
+
+    def destroy(self):
+        for sub in self._subscriptions:
+            sub.unsubscribe()
+        super().destroy()
 
     def _init_tree(self):
         # We need a style for the Treeview to match Dark Mode
@@ -56,9 +66,11 @@ class ExplorerView(ctk.CTkFrame):
         # Clear
         for item in self.tree.get_children():
             self.tree.delete(item)
+        self._nodes.clear()
             
         # Add Root
         root_node = self.tree.insert("", "end", text=os.path.basename(self.current_path), open=True)
+        self._nodes[self.current_path] = root_node
         self._populate_node(root_node, self.current_path)
 
     def _populate_node(self, parent_node, path):
@@ -67,13 +79,14 @@ class ExplorerView(ctk.CTkFrame):
         for d in dirs:
             full_path = os.path.join(path, d)
             node = self.tree.insert(parent_node, "end", text=f"📁 {d}", values=[full_path])
+            self._nodes[full_path] = node
             # For deeper recursion we could lazy load, but for now just 1 level or full? 
             # Let's do 1 level deep to verify it works
             # self._populate_node(node, full_path) 
             
         for f in files:
             full_path = os.path.join(path, f)
-            self.tree.insert(parent_node, "end", text=f"📄 {f}", values=[full_path])
+            self._nodes[full_path] = self.tree.insert(parent_node, "end", text=f"📄 {f}", values=[full_path])
 
     def _on_event(self, event):
         pass
@@ -92,6 +105,39 @@ class ExplorerView(ctk.CTkFrame):
                 # Optionally toggle open/close
                 pass
 
-    def _on_file_changed(self, path):
-        # self.refresh() # Simplified
-        pass
+    def _on_files_changed(self, changes):
+        """Applies a FileWatcher batch to the tree without rescanning the folder."""
+        if changes["overflow"]:
+            self.refresh()
+            return
+        for path in changes["deleted"]:
+            self._remove_entry(path)
+        for old, new in changes["renamed"]:
+            self._remove_entry(old)
+            self._insert_entry(new)
+        # Atomic saves replace files by rename, so a new file can arrive as "modified"
+        for path in changes["created"] + changes["modified"]:
+            self._insert_entry(path)
+
+    def _remove_entry(self, path):
+        node = self._nodes.pop(path, None)
+        if node is not None:
+            self.tree.delete(node)
+
+    def _insert_entry(self, path):
+        parent_node = self._nodes.get(os.path.dirname(path))
+        if parent_node is None or path in self._nodes:
+            # Parent not shown (deeper than the listed level): nothing to update
+            return
+        name = os.path.basename(path)
+        is_dir = os.path.isdir(path)
+        # Keep list_files order: folders first, each group sorted by name
+        key = (not is_dir, name)
+        index = 0
+        for child in self.tree.get_children(parent_node):
+            child_path = self.tree.item(child, "values")[0]
+            if (not self.tree.item(child, "text").startswith("📁"), os.path.basename(child_path)) > key:
+                break
+            index += 1
+        text = f"📁 {name}" if is_dir else f"📄 {name}"
+        self._nodes[path] = self.tree.insert(parent_node, index, text=text, values=[path])
@@ -5,9 +5,12 @@ Source control integration panel.
 import customtkinter as ctk
 import subprocess
 import os
+from src.core.event_bus import global_event_bus, DISPATCH_MAIN, DISPATCH_POOL
 from src.core.container import get_service
+from src.core.profiler import boot_profiler
 
 class GitView(ctk.CTkFrame):
+    @boot_profiler.trace
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
         self.file_svc = get_service("FileService")
@@ -39,6 +42,17 @@ class GitView(ctk.CTkFrame):
         ctk.CTkButton(btn_frame, text="Push", width=60, height=24, command=self.git_push).pack(side="left", padx=2)
         
         self.refresh_status()
+        
+        # Events: status is re-queried off the UI thread when the watcher reports changes
+        self._subscriptions = [
+            global_event_bus.subscribe("files_changed", self._on_files_changed, dispatch=DISPATCH_POOL),
+            global_event_bus.subscribe("git_status", self._render_status, dispatch=DISPATCH_MAIN),
+        ]
+
+    def destroy(self):
+        for sub in self._subscriptions:
+            sub.unsubscribe()
+        super().destroy()
 
     def _run_git(self, args):
         """Run git command and return output"""
@@ -55,11 +69,17 @@ class GitView(ctk.CTkFrame):
         self.refresh_status()
 
     def refresh_status(self):
+        self._render_status(self._run_git(["status", "--porcelain"]))
+
+    def _on_files_changed(self, _changes):
+        # Pool thread: only the git call happens here, rendering goes back to the main loop
+        global_event_bus.publish("git_status", self._run_git(["status", "--porcelain"]))
+
+    def _render_status(self, output):
         # Clear existing
         for widget in self.status_list.winfo_children():
             widget.destroy()
         
-        output = self._run_git(["status", "--porcelain"])
         if not output.strip():
             ctk.CTkLabel(self.status_list, text="No changes", text_color="gray").pack(anchor="w", padx=5)
             return
@@ -0,0 +1,89 @@
+"""
+Quick Open
+Ctrl+P file finder over the workspace index.
+
+Each keystroke paints the first ranked batch from the FuzzyFinder right away;
+the remaining batches are scored on idle callbacks and repaint the list as
+they finish, until the next keystroke starts a new query.
+"""
+import customtkinter as ctk
+import tkinter as tk
+from src.core.container import get_service
+from src.core.event_bus import global_event_bus
+
+MAX_RESULTS = 50
+
+
+class QuickOpen(ctk.CTkToplevel):
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.theme = get_service("ThemeService")
+        self.index = get_service("WorkspaceIndex")
+        self.finder = get_service("FuzzyFinder").finder()
+        self._batches = None
+        self._results = []
+
+        self.title("Go to File")
+        self.geometry(f"640x380+{master.winfo_rootx() + 200}+{master.winfo_rooty() + 60}")
+        self.transient(master.winfo_toplevel())
+
+        self.query = ctk.StringVar()
+        self.entry = ctk.CTkEntry(self, textvariable=self.query, placeholder_text="Search files by name")
+        self.entry.pack(fill="x", padx=8, pady=8)
+
+        self.listbox = tk.Listbox(
+            self, activestyle="none", borderwidth=0, highlightthickness=0,
+            background=self.theme.get_color("bg_sidebar"), foreground=self.theme.get_color("fg_text"),
+            selectbackground="#37373d", font=("Segoe UI", 10),
+        )
+        self.listbox.pack(fill="both", expand=True, padx=8, pady=(0, 8))
+
+        self.query.trace_add("write", lambda *_: self._on_query())
+        self.entry.bind("<Return>", self._open_selected)
+        self.entry.bind("<Down>", lambda e: self._move(1))
+        self.entry.bind("<Up>", lambda e: self._move(-1))
+        self.bind("<Escape>", lambda e: self.destroy())
+        self.listbox.bind("<Double-1>", self._open_selected)
+
+        self._on_query()
+        self.after(50, self.entry.focus_set)
+
+    def _on_query(self):
+        self._batches = self.finder.iter_batches(self.query.get(), MAX_RESULTS)
+        self._next_batch(self._batches)
+
+    def _next_batch(self, batches):
+        if batches is not self._batches or not self.winfo_exists():
+            return  # superseded by a newer keystroke, or closed
+        try:
+            results = next(batches)
+        except StopIteration:
+            return
+        self._render(results)
+        self.after_idle(self._next_batch, batches)
+
+    def _render(self, results):
+        self._results = [path for _, path, _ in results]
+        self.listbox.delete(0, "end")
+        for path in self._results:
+            directory, _, name = path.rpartition("/")
+            self.listbox.insert("end", f"{name}    {directory}" if directory else name)
+        if self._results:
+            self.listbox.selection_set(0)
+
+    def _move(self, step):
+        if not self._results:
+            return "break"
+        current = self.listbox.curselection()
+        index = max(0, min(len(self._results) - 1, (current[0] if current else -1) + step))
+        self.listbox.selection_clear(0, "end")
+        self.listbox.selection_set(index)
+        self.listbox.see(index)
+        return "break"
+
+    def _open_selected(self, event=None):
+        current = self.listbox.curselection()
+        if current:
+            global_event_bus.publish("open_file", self.index.abspath(self._results[current[0]]))
+            self.destroy()
+        return "break"
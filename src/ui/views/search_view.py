@@ -0,0 +1,196 @@
+"""
+Search View
+Find in files panel: streams SearchService results into a virtual list.
+With a replacement entered, "Preview" lists the planned edits per file
+(double-click shows that file's diff) and "Replace All" commits them at once.
+"""
+import customtkinter as ctk
+import re
+from src.core.container import get_service
+from src.core.event_bus import global_event_bus, DISPATCH_MAIN
+from src.core.profiler import boot_profiler
+from src.ui.widgets.virtual_list import VirtualList
+
+SEARCH_DELAY_MS = 250
+
+
+class SearchView(ctk.CTkFrame):
+    @boot_profiler.trace
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.theme = get_service("ThemeService")
+        self._search_id = None
+        self._pending = None
+        self._plan = None
+
+        ctk.CTkLabel(self, text="SEARCH", font=("Segoe UI", 11, "bold"), text_color="gray").pack(anchor="w", padx=10, pady=10)
+
+        self.query = ctk.StringVar()
+        self.entry = ctk.CTkEntry(self, textvariable=self.query, placeholder_text="Search in files")
+        self.entry.pack(fill="x", padx=8)
+        self.entry.bind("<Return>", lambda e: self._start_search())
+        self.query.trace_add("write", lambda *_: self._schedule_search())
+
+        replace_row = ctk.CTkFrame(self, fg_color="transparent")
+        replace_row.pack(fill="x", padx=8, pady=(4, 0))
+        self.replacement = ctk.CTkEntry(replace_row, placeholder_text="Replace")
+        self.replacement.pack(side="left", fill="x", expand=True)
+        ctk.CTkButton(replace_row, text="Preview", width=60, command=self._plan_replace).pack(side="left", padx=(4, 0))
+        self.apply_button = ctk.CTkButton(replace_row, text="Replace All", width=80, state="disabled",
+                                          command=self._apply_replace)
+        self.apply_button.pack(side="left", padx=(4, 0))
+
+        options = ctk.CTkFrame(self, fg_color="transparent")
+        options.pack(fill="x", padx=8, pady=4)
+        self.regex_var = ctk.BooleanVar()
+        self.case_var = ctk.BooleanVar()
+        self.word_var = ctk.BooleanVar()
+        for text, var in (("Regex", self.regex_var), ("Aa", self.case_var), ("Word", self.word_var)):
+            ctk.CTkCheckBox(options, text=text, variable=var, width=60, checkbox_width=16, checkbox_height=16,
+                            command=self._start_search).pack(side="left", padx=2)
+
+        self.status = ctk.CTkLabel(self, text="", text_color="gray", font=("Segoe UI", 10), anchor="w")
+        self.status.pack(fill="x", padx=10)
+
+        self.results = VirtualList(
+            self, background=self.theme.get_color("bg_sidebar"), text_color=self.theme.get_color("fg_text"),
+            on_activate=self._open_result, fg_color="transparent",
+        )
+        self.results.pack(fill="both", expand=True, padx=4, pady=4)
+
+        self._subscriptions = [
+            global_event_bus.subscribe("search_results", self._on_results, dispatch=DISPATCH_MAIN),
+            global_event_bus.subscribe("search_done", self._on_done, dispatch=DISPATCH_MAIN),
+            global_event_bus.subscribe("replace_ready", self._on_plan, dispatch=DISPATCH_MAIN),
+            global_event_bus.subscribe("replace_committed", self._on_committed, dispatch=DISPATCH_MAIN),
+        ]
+
+    def destroy(self):
+        for sub in self._subscriptions:
+            sub.unsubscribe()
+        super().destroy()
+
+    def _schedule_search(self):
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+        self._pending = self.after(SEARCH_DELAY_MS, self._start_search)
+
+    def _start_search(self):
+        self._pending = None
+        self._set_plan(None)
+        service = get_service("SearchService")
+        self.results.clear()
+        pattern = self.query.get()
+        if not pattern:
+            service.cancel()
+            self._search_id = None
+            self.status.configure(text="")
+            return
+        try:
+            self._search_id = service.search(
+                pattern, regex=self.regex_var.get(), case_sensitive=self.case_var.get(), whole_word=self.word_var.get()
+            )
+        except re.error as e:
+            self._search_id = None
+            self.status.configure(text=f"Invalid pattern: {e}")
+            return
+        self.status.configure(text="Searching...")
+
+    def _on_results(self, batches):
+        # "search_results" is batched by the bus: a list of payloads
+        rows = []
+        for batch in batches:
+            if batch["id"] != self._search_id:
+                continue
+            for rel, matches in batch["results"]:
+                rows.append((f"{rel}  ({len(matches)})", self.theme.get_color("fg_function"), (rel, None)))
+                for line_no, col, end_col, text in matches:
+                    rows.append((f"  {line_no}: {text.strip()}", None, (rel, line_no)))
+        if rows:
+            self.results.append(rows)
+
+    def _on_done(self, summary):
+        if summary["id"] != self._search_id:
+            return
+        text = f"{summary['matches']} results in {summary['files']} files ({summary['elapsed']:.2f}s)"
+        if summary["truncated"]:
+            text += " - limit reached"
+        self.status.configure(text=text)
+
+    def _open_result(self, payload):
+        rel, line_no = payload
+        if line_no == "replace":
+            # The plan is gone once it was applied (its rows with it)
+            if self._plan is not None:
+                DiffPreview(self, rel, self._plan.preview(rel))
+            return
+        global_event_bus.publish("open_file", get_service("WorkspaceIndex").abspath(rel))
+
+    # --- replace ---
+
+    def _set_plan(self, plan):
+        self._plan = plan
+        self.apply_button.configure(state="normal" if plan else "disabled")
+
+    def _plan_replace(self):
+        pattern = self.query.get()
+        if not pattern:
+            return
+        self._set_plan(None)
+        self.results.clear()
+        try:
+            self._search_id = get_service("SearchService").plan_replace(
+                pattern, self.replacement.get(), regex=self.regex_var.get(),
+                case_sensitive=self.case_var.get(), whole_word=self.word_var.get(),
+            )
+        except re.error as e:
+            self._search_id = None
+            self.status.configure(text=f"Invalid pattern: {e}")
+            return
+        self.status.configure(text="Preparing replace...")
+
+    def _on_plan(self, ready):
+        if ready["id"] != self._search_id or ready["cancelled"]:
+            return
+        plan = ready["plan"]
+        self.results.clear()
+        self.results.append([
+            (f"{rel}  ({plan.count(rel)})", self.theme.get_color("fg_function"), (rel, "replace"))
+            for rel in sorted(plan.files)
+        ])
+        self.status.configure(text=f"{plan.count()} replacements in {len(plan)} files - double-click to preview")
+        self._set_plan(plan if len(plan) else None)
+
+    def _apply_replace(self):
+        if self._plan is None:
+            return
+        get_service("SearchService").commit_replace(self._plan, get_service("VFS"))
+        self._set_plan(None)
+        self.results.clear()
+        self.status.configure(text="Replacing...")
+
+    def _on_committed(self, result):
+        if result["error"] and result["files"]:
+            self.status.configure(text=f"Replace failed and {len(result['files'])} files could not be "
+                                       f"restored: {', '.join(result['files'])}")
+        elif result["error"]:
+            self.status.configure(text=f"Replace failed, no file was changed: {result['error']}")
+        else:
+            self.status.configure(text=f"Replaced in {len(result['files'])} files")
+        self.results.clear()
+
+
+class DiffPreview(ctk.CTkToplevel):
+    """Read-only unified diff of one file of a replace plan."""
+    def __init__(self, master, rel, diff):
+        super().__init__(master)
+        self.title(f"Replace preview - {rel}")
+        self.geometry("800x500")
+        text = ctk.CTkTextbox(self, font=("Consolas", 11), wrap="none")
+        text.pack(fill="both", expand=True)
+        text.tag_config("added", foreground="#89d185")
+        text.tag_config("removed", foreground="#f48771")
+        for line in diff.splitlines(keepends=True):
+            tag = "added" if line.startswith("+") else "removed" if line.startswith("-") else None
+            text.insert("end", line, tag)
+        text.configure(state="disabled")
@@ -3,6 +3,7 @@ Snippets View
 Code snippets library panel.
 """
 import customtkinter as ctk
+from src.core.profiler import boot_profiler
 
 # Built-in snippets
 SNIPPETS = {
@@ -32,6 +33,7 @@ SNIPPETS = {
 }
 
 class SnippetsView(ctk.CTkFrame):
+    @boot_profiler.trace
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
         
@@ -4,8 +4,10 @@ Task management panel.
 """
 import customtkinter as ctk
 from datetime import datetime
+from src.core.profiler import boot_profiler
 
 class TasksView(ctk.CTkFrame):
+    @boot_profiler.trace
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
         self.tasks = []
@@ -0,0 +1,108 @@
+"""
+Virtual List Widget
+A canvas list that only draws the rows in view, so appending tens of
+thousands of rows (search results) costs nothing until they are scrolled to.
+"""
+import customtkinter as ctk
+import tkinter as tk
+
+
+class VirtualList(ctk.CTkFrame):
+    def __init__(self, master, row_height=20, font=("Consolas", 10), background="#252526",
+                 text_color="#cccccc", select_color="#37373d", on_activate=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.row_height = row_height
+        self.font = font
+        self.text_color = text_color
+        self.select_color = select_color
+        self.on_activate = on_activate
+        self.rows = []  # (text, color or None, payload)
+        self.top = 0
+        self.selected = None
+        self._redraw_pending = False
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, borderwidth=0, background=background)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.canvas.bind("<Configure>", lambda e: self._schedule_redraw())
+        self.canvas.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, 3))
+        self.canvas.bind("<Button-4>", lambda e: self.scroll(-1, 3))
+        self.canvas.bind("<Button-5>", lambda e: self.scroll(1, 3))
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Double-1>", self._on_double_click)
+
+    # --- content ---
+
+    def clear(self):
+        self.rows = []
+        self.top = 0
+        self.selected = None
+        self._schedule_redraw()
+
+    def append(self, rows):
+        self.rows.extend(rows)
+        self._schedule_redraw()
+
+    # --- scrolling ---
+
+    def _visible_count(self):
+        return max(1, self.canvas.winfo_height() // self.row_height)
+
+    def scroll(self, direction, amount=1):
+        self._scroll_to(self.top + direction * amount)
+
+    def _scroll_to(self, top):
+        top = max(0, min(top, len(self.rows) - self._visible_count()))
+        if top != self.top:
+            self.top = top
+            self._schedule_redraw()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self._scroll_to(int(float(value) * len(self.rows)))
+        elif action == "scroll":
+            step = self._visible_count() if unit == "pages" else 1
+            self.scroll(int(value), step)
+
+    # --- drawing ---
+
+    def _schedule_redraw(self):
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_pending = False
+        canvas = self.canvas
+        canvas.delete("all")
+        width = canvas.winfo_width()
+        visible = self._visible_count()
+        end = min(len(self.rows), self.top + visible + 1)
+        for i in range(self.top, end):
+            y = (i - self.top) * self.row_height
+            if i == self.selected:
+                canvas.create_rectangle(0, y, width, y + self.row_height, fill=self.select_color, width=0)
+            text, color, _ = self.rows[i]
+            canvas.create_text(4, y + self.row_height // 2, text=text, anchor="w", font=self.font,
+                               fill=color or self.text_color)
+        if self.rows:
+            self.scrollbar.set(self.top / len(self.rows), min(1.0, (self.top + visible) / len(self.rows)))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # --- selection ---
+
+    def _row_at(self, y):
+        index = self.top + y // self.row_height
+        return index if index < len(self.rows) else None
+
+    def _on_click(self, event):
+        self.selected = self._row_at(event.y)
+        self._schedule_redraw()
+
+    def _on_double_click(self, event):
+        index = self._row_at(event.y)
+        if index is not None and self.on_activate:
+            self.on_activate(self.rows[index][2])
@@ -5,13 +5,16 @@ The main window layout and component manager.
 import customtkinter as ctk
 from src.services.theme_service import ThemeService
 from src.core.container import get_service
-from src.core.event_bus import global_event_bus
+from src.core.event_bus import global_event_bus, DISPATCH_MAIN
 from src.ui.editor.code_editor import CodeEditor
+from src.ui.editor.file_viewers import HexViewer, PagedTextViewer
+from src.services.file_service import BINARY, TOO_LARGE
 
 from src.ui.views.explorer import ExplorerView
 from src.ui.views.chat_view import ChatView
 from src.ui.docking.dock_manager import DockingManager
 from src.ui.widgets.terminal import Terminal
+from src.core.profiler import boot_profiler
 import os
 
 class Workbench(ctk.CTkFrame):
@@ -41,16 +44,27 @@ class Workbench(ctk.CTkFrame):
         self._init_status_bar()
         
         # Docking System
-        self.dock_manager = DockingManager(self)
-        self.dock_manager.mount()
-        self.terminal = self.dock_manager.add_bottom_panel("TERMINAL", Terminal)
-        self.dock_manager.add_bottom_panel("OUTPUT", lambda m: ctk.CTkLabel(m, text="Build Output..."))
+        with boot_profiler.span("Workbench docking"):
+            self.dock_manager = DockingManager(self)
+            self.dock_manager.mount()
+            self.terminal = self.dock_manager.add_bottom_panel("TERMINAL", Terminal)
+            self.dock_manager.add_bottom_panel("OUTPUT", lambda m: ctk.CTkLabel(m, text="Build Output..."))
         
         
         # Events
-        global_event_bus.subscribe("theme_changed", self.on_theme_changed)
-        global_event_bus.subscribe("open_file", self.open_file_in_tab)
+        self._subscriptions = [
+            global_event_bus.subscribe("theme_changed", self.on_theme_changed, dispatch=DISPATCH_MAIN),
+            global_event_bus.subscribe("open_file", self.open_file_in_tab, dispatch=DISPATCH_MAIN),
+        ]
+        self.winfo_toplevel().bind("<Control-p>", self.show_quick_open)
+        self.winfo_toplevel().bind("<Control-Shift-F>", self.show_search)
 
+    def destroy(self):
+        for sub in self._subscriptions:
+            sub.unsubscribe()
+        super().destroy()
+
+    @boot_profiler.trace
     def _init_menu_bar(self):
         """Initialize menu bar with File, Edit, View, Run, Terminal, Help"""
         from tkinter import Menu
@@ -92,6 +106,7 @@ class Workbench(ctk.CTkFrame):
         menu = Menu(self, tearoff=0)
         menu.add_command(label="New File (Ctrl+N)", command=lambda: global_event_bus.publish("new_file", None))
         menu.add_command(label="Open File (Ctrl+O)", command=lambda: global_event_bus.publish("open_file_dialog", None))
+        menu.add_command(label="Go to File (Ctrl+P)", command=self.show_quick_open)
         menu.add_command(label="Save (Ctrl+S)", command=lambda: global_event_bus.publish("save_file", None))
         menu.add_separator()
         menu.add_command(label="Exit", command=self.master.quit)
@@ -145,6 +160,19 @@ class Workbench(ctk.CTkFrame):
         ctk.CTkLabel(top, text="Galactic Edition", text_color="gray").pack()
         ctk.CTkLabel(top, text="Version: 2.1.0", text_color="gray").pack(pady=5)
 
+    def show_quick_open(self, event=None):
+        from src.ui.views.quick_open import QuickOpen
+        if getattr(self, "_quick_open", None) is not None and self._quick_open.winfo_exists():
+            self._quick_open.focus_set()
+        else:
+            self._quick_open = QuickOpen(self)
+        return "break"
+
+    def show_search(self, event=None):
+        self.switch_sidebar("search")
+        self.search_view.entry.focus_set()
+        return "break"
+
     def toggle_sidebar(self):
         if self.sidebar_container.winfo_viewable():
             self.sidebar_container.grid_remove()
@@ -156,6 +184,7 @@ class Workbench(ctk.CTkFrame):
             # Toggle dock visibility
             pass  # Implement with DockingManager
 
+    @boot_profiler.trace
     def _init_activity_bar(self):
         from src.ui.assets.icons import get_icon
         
@@ -179,6 +208,7 @@ class Workbench(ctk.CTkFrame):
         
         # View switching buttons
         create_act_btn("folder", lambda: self.switch_sidebar("explorer")).pack(pady=8, padx=8)
+        create_act_btn("search", lambda: self.switch_sidebar("search")).pack(pady=8, padx=8)
         create_act_btn("git", lambda: self.switch_sidebar("git")).pack(pady=8, padx=8)
         create_act_btn("tasks", lambda: self.switch_sidebar("tasks")).pack(pady=8, padx=8)
         
@@ -194,8 +224,10 @@ class Workbench(ctk.CTkFrame):
             command=lambda: global_event_bus.publish("open_settings", None)
         ).pack(side="bottom", pady=16)
 
+    @boot_profiler.trace
     def _init_sidebar(self):
         from src.ui.views.git_view import GitView
+        from src.ui.views.search_view import SearchView
         from src.ui.views.snippets_view import SnippetsView
         from src.ui.views.tasks_view import TasksView
         
@@ -205,6 +237,7 @@ class Workbench(ctk.CTkFrame):
         
         # All sidebar views
         self.explorer = ExplorerView(self.sidebar_container, fg_color="transparent")
+        self.search_view = SearchView(self.sidebar_container, fg_color="transparent")
         self.git_view = GitView(self.sidebar_container, fg_color="transparent")
         self.snippets_view = SnippetsView(self.sidebar_container, fg_color="transparent")
         self.tasks_view = TasksView(self.sidebar_container, fg_color="transparent")
@@ -212,6 +245,7 @@ class Workbench(ctk.CTkFrame):
         # Store views for switching
         self.sidebar_views = {
             "explorer": self.explorer,
+            "search": self.search_view,
             "git": self.git_view,
             "snippets": self.snippets_view,
             "tasks": self.tasks_view
@@ -232,6 +266,7 @@ class Workbench(ctk.CTkFrame):
             self.sidebar_views[mode].pack(fill="both", expand=True)
             self.current_sidebar = mode
 
+    @boot_profiler.trace
     def _init_editor_area(self):
         self.editor_tabs = ctk.CTkTabview(self, fg_color=self.theme.get_color("bg_main"), segmented_button_fg_color="#2d2d2d")
         self.editor_tabs.grid(row=1, column=2, sticky="nsew", padx=0, pady=0) # Removed padding for seamless look
@@ -239,6 +274,7 @@ class Workbench(ctk.CTkFrame):
         # Default Tab
         # self.open_file_in_tab(None) # Or start empty
 
+    @boot_profiler.trace
     def _init_ai_panel(self):
         self.ai_panel = ctk.CTkFrame(self, width=320, corner_radius=0, fg_color=self.theme.get_color("bg_sidebar")) # Increased width
         self.ai_panel.grid(row=1, column=3, sticky="ns", rowspan=3)
@@ -265,12 +301,25 @@ class Workbench(ctk.CTkFrame):
         except:
             pass # Not found, create new
             
+        probe = get_service("FileService").probe(file_path) if file_path else None
+        if file_path and probe is None:
+            return
+
         tab = self.editor_tabs.add(name)
         ext = name.split(".")[-1] if "." in name else "txt"
-        editor = CodeEditor(tab, file_ext=ext, file_path=file_path)
+        # Binary and very large files get a read-only paged view instead of the editor;
+        # the line pager splits on b"\n", so large UTF-16/32 text is shown as hex
+        wide = probe is not None and (probe.encoding or "").startswith(("utf-16", "utf-32"))
+        if probe is not None and (probe.kind == BINARY or probe.kind == TOO_LARGE and wide):
+            editor = HexViewer(tab, probe)
+        elif probe is not None and probe.kind == TOO_LARGE:
+            editor = PagedTextViewer(tab, probe)
+        else:
+            editor = CodeEditor(tab, file_ext=ext, file_path=file_path)
         editor.pack(fill="both", expand=True)
         self.editor_tabs.set(name)
 
+    @boot_profiler.trace
     def _init_status_bar(self):
         # Elegant translucent-style status bar
         self.status_bar = ctk.CTkFrame(self, height=28, corner_radius=0, fg_color=self.theme.get_color("bg_sidebar"))
@@ -0,0 +1,77 @@
+import json
+import time
+
+from src.core.event_bus import global_event_bus
+from src.services import config_service
+from src.services.config_service import ConfigService
+
+
+def _service(tmp_path, user=None, workspace=None, defaults=None):
+    user_file = tmp_path / "settings.json"
+    workspace_file = tmp_path / ".fervv" / "settings.json"
+    if user is not None:
+        user_file.write_text(json.dumps(user))
+    if workspace is not None:
+        workspace_file.parent.mkdir()
+        workspace_file.write_text(json.dumps(workspace))
+    return ConfigService(str(user_file), str(workspace_file), defaults)
+
+
+def test_higher_layers_win(tmp_path):
+    config = _service(tmp_path, user={"a": 2, "b": 2}, workspace={"a": 3}, defaults={"a": 1, "b": 1, "c": 1})
+    try:
+        assert (config.get("a"), config.get("b"), config.get("c")) == (3, 2, 1)
+        config.set("a", 4, layer="session")
+        assert config.get("a") == 4
+        config.set_defaults({"a": 0, "d": 0})
+        assert (config.get("a"), config.get("d")) == (4, 0)
+    finally:
+        config.stop()
+
+
+def test_unset_exposes_the_next_layer_down(tmp_path):
+    config = _service(tmp_path, user={"a": 2}, workspace={"a": 3}, defaults={"a": 1})
+    try:
+        config.unset("a", layer="workspace")
+        assert config.get("a") == 2
+        config.unset("a")
+        assert config.get("a") == 1
+        config.unset("a", layer="default")
+        assert config.get("a", "gone") == "gone"
+    finally:
+        config.stop()
+
+
+def test_config_changed_carries_only_effective_changes(tmp_path):
+    config = _service(tmp_path, workspace={"a": 3}, defaults={"a": 1, "b": 1})
+    events = []
+    sub = global_event_bus.subscribe("config_changed", events.append)
+    try:
+        config.update({"a": 2, "b": 1, "c": None})
+        config.set("b", 5)
+        config.unset("a", layer="workspace")
+        config.unset("c")
+        assert events == [{"c": None}, {"b": 5}, {"a": 2}, {"c": None}]
+    finally:
+        sub.unsubscribe()
+        config.stop()
+
+
+def test_burst_of_changes_is_saved_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_service, "SAVE_DELAY_SECONDS", 0.1)
+    writes = []
+    real_write = ConfigService._write
+    monkeypatch.setattr(ConfigService, "_write", staticmethod(lambda pending: (writes.append(pending), real_write(pending))))
+    config = _service(tmp_path)
+    try:
+        for i in range(5):
+            config.set("n", i)
+            time.sleep(0.05)
+        # Still within the quiet period of the last change
+        assert writes == []
+        time.sleep(0.3)
+        assert len(writes) == 1
+        assert json.loads((tmp_path / "settings.json").read_text()) == {"n": 4}
+        assert [p.name for p in tmp_path.iterdir()] == ["settings.json"]
+    finally:
+        config.stop()
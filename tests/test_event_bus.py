@@ -0,0 +1,177 @@
+import gc
+import threading
+import time
+
+import pytest
+
+from src.core.event_bus import DISPATCH_INLINE, DISPATCH_MAIN, DISPATCH_POOL, Batch, EventBus, LatestWins, RateLimit
+
+
+class _FakeRoot:
+    """Stands in for a Tk root: after() callbacks run when the test calls run_pending()."""
+    def __init__(self):
+        self.pending = []
+
+    def after(self, _ms, callback):
+        self.pending.append(callback)
+
+    def run_pending(self):
+        pending, self.pending = self.pending, []
+        for callback in pending:
+            callback()
+
+
+@pytest.fixture
+def bus():
+    bus = EventBus()
+    yield bus
+    bus.shutdown()
+
+
+def _publish_from_worker(bus, topic, data):
+    worker = threading.Thread(target=bus.publish, args=(topic, data))
+    worker.start()
+    worker.join()
+
+
+def test_inline_runs_on_the_publishing_thread(bus):
+    threads = []
+    bus.subscribe("t", lambda _data: threads.append(threading.current_thread()), dispatch=DISPATCH_INLINE)
+    bus.publish("t")
+    assert threads == [threading.current_thread()]
+
+
+def test_pool_runs_on_a_worker_thread(bus):
+    done = threading.Event()
+    threads = []
+
+    def handler(_data):
+        threads.append(threading.current_thread())
+        done.set()
+
+    bus.subscribe("t", handler, dispatch=DISPATCH_POOL)
+    bus.publish("t")
+    assert done.wait(2)
+    assert threads[0] is not threading.current_thread()
+    assert threads[0].name.startswith("event-bus")
+
+
+def test_main_is_drained_on_the_main_loop(bus):
+    root = _FakeRoot()
+    bus.attach_main_loop(root)
+    calls = []
+    bus.subscribe("t", lambda data: calls.append((data, threading.current_thread())), dispatch=DISPATCH_MAIN)
+
+    _publish_from_worker(bus, "t", 1)
+    _publish_from_worker(bus, "t", 2)
+    # Queued, not run, and both events share one scheduled drain
+    assert calls == []
+    assert len(root.pending) == 1
+
+    root.run_pending()
+    assert calls == [(1, threading.current_thread()), (2, threading.current_thread())]
+
+    # Published on the main thread itself: no marshaling needed
+    bus.publish("t", 3)
+    assert calls[-1] == (3, threading.current_thread())
+    assert root.pending == []
+
+
+def test_main_runs_inline_without_a_main_loop(bus):
+    calls = []
+    bus.subscribe("t", lambda _data: calls.append(threading.current_thread()), dispatch=DISPATCH_MAIN)
+    _publish_from_worker(bus, "t", None)
+    assert len(calls) == 1 and calls[0] is not threading.current_thread()
+
+
+def test_batch_delivers_one_list_per_window(bus):
+    received = []
+    bus.set_policy("t", Batch(window=0.1))
+    bus.subscribe("t", received.append)
+    for i in range(3):
+        bus.publish("t", i)
+    assert received == []
+    time.sleep(0.3)
+    assert received == [[0, 1, 2]]
+
+    bus.publish("t", 3)
+    time.sleep(0.3)
+    assert received == [[0, 1, 2], [3]]
+
+
+def test_batch_flushes_early_when_full(bus):
+    received = []
+    bus.set_policy("t", Batch(window=10, max_items=2))
+    bus.subscribe("t", received.append)
+    for i in range(3):
+        bus.publish("t", i)
+    assert received == [[0, 1]]
+    bus.flush("t")
+    assert received == [[0, 1], [2]]
+
+
+def test_latest_wins_delivers_only_the_last_payload(bus):
+    received = []
+    bus.set_policy("t", LatestWins(window=0.1))
+    bus.subscribe("t", received.append)
+    for i in range(5):
+        bus.publish("t", i)
+    time.sleep(0.3)
+    assert received == [4]
+
+
+def test_rate_limit_spacing(bus):
+    received = []
+    bus.set_policy("t", RateLimit(max_per_second=2))
+    bus.subscribe("t", lambda data: received.append((data, time.monotonic())))
+    start = time.monotonic()
+    for i in range(5):
+        bus.publish("t", i)
+    # The first two pass straight through; the rest collapse into the latest
+    assert [data for data, _ in received] == [0, 1]
+    time.sleep(1.3)
+    assert [data for data, _ in received] == [0, 1, 4]
+    assert received[2][1] - start >= 1.0
+
+
+def test_weak_subscription_drops_a_collected_owner(bus):
+    received = []
+
+    class Owner:
+        def on_event(self, data):
+            received.append(data)
+
+    owner = Owner()
+    sub = bus.subscribe("t", owner.on_event, weak=True)
+    bus.publish("t", 1)
+    del owner
+    gc.collect()
+    bus.publish("t", 2)
+    assert received == [1]
+    assert not sub.active
+    assert bus._resolve("t") == ()
+
+
+def test_unsubscribe_stops_delivery(bus):
+    received = []
+    sub = bus.subscribe("a.*", received.append)
+    bus.publish("a.b", 1)
+    sub.unsubscribe()
+    bus.publish("a.b", 2)
+    assert received == [1]
+    assert bus._trie.children == {}
+
+
+def test_wildcard_patterns_deliver_once(bus):
+    received = []
+    for pattern in ("a.*", "a.**", "**", "a.b"):
+        bus.subscribe(pattern, lambda data, pattern=pattern: received.append((pattern, data)))
+    bus.publish("a.b", 1)
+    bus.publish("a.*", 2)
+    bus.publish("c", 3)
+    assert sorted(received) == [
+        ("**", 1), ("**", 2), ("**", 3),
+        ("a.*", 1), ("a.*", 2),
+        ("a.**", 1), ("a.**", 2),
+        ("a.b", 1),
+    ]
@@ -0,0 +1,37 @@
+import json
+
+from src.core.event_bus import global_event_bus
+from src.core.kernel.kernel import kernel
+
+
+def _write_extension(root, name, body):
+    folder = root / name
+    folder.mkdir()
+    (folder / "__init__.py").write_text("")
+    (folder / "main.py").write_text(body)
+    (folder / "extension.json").write_text(json.dumps({
+        "name": name,
+        "entry": f"{name}.main:Extension",
+        "activationEvents": [f"onEvent:{name}.ping"],
+    }))
+
+
+def test_lazy_extension_receives_the_event_that_activated_it(tmp_path):
+    _write_extension(tmp_path, "lazy_ping", (
+        "from src.core.interfaces.extension import IExtension\n"
+        "from src.core.event_bus import global_event_bus\n"
+        "received = []\n"
+        "class Extension(IExtension):\n"
+        "    def on_load(self, kernel):\n"
+        "        global_event_bus.subscribe('lazy_ping.ping', received.append)\n"
+        "    def on_unload(self):\n"
+        "        pass\n"
+    ))
+    kernel.load_extensions([str(tmp_path)])
+    assert "lazy_ping" not in kernel.extensions
+
+    global_event_bus.publish("lazy_ping.ping", "first")
+    global_event_bus.publish("lazy_ping.ping", "second")
+
+    import lazy_ping.main
+    assert lazy_ping.main.received == ["first", "second"]
@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+
+import pytest
+
+from src.core.event_bus import global_event_bus
+from src.services.file_watcher_service import FileWatcherService, InotifyBackend
+
+linux_only = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify backend")
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_stop_right_after_start_stops_the_backend(tmp_path):
+    watcher = FileWatcherService(str(tmp_path), debounce=0.01)
+    watcher.start()
+    thread = watcher._thread
+    watcher.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+@linux_only
+def test_directory_moved_out_of_the_tree_is_no_longer_watched(tmp_path):
+    root, outside = tmp_path / "root", tmp_path / "outside"
+    root.mkdir()
+    outside.mkdir()
+    (root / "pkg" / "sub").mkdir(parents=True)
+    batches = []
+    sub = global_event_bus.subscribe("files_changed", batches.append)
+    watcher = FileWatcherService(str(root), debounce=0.01)
+    watcher.start()
+    try:
+        assert _wait_for(lambda: isinstance(watcher.backend, InotifyBackend) and len(watcher.backend._watches) == 3)
+        os.rename(root / "pkg", outside / "pkg")
+        assert _wait_for(lambda: any(str(root / "pkg") in b["deleted"] for b in batches))
+        assert _wait_for(lambda: list(watcher.backend._watches.values()) == [str(root)])
+
+        batches.clear()
+        (outside / "pkg" / "sub" / "late.py").write_text("x")
+        (root / "marker.txt").write_text("x")
+        assert _wait_for(lambda: any(str(root / "marker.txt") in b["created"] for b in batches))
+        reported = [p for b in batches for kind in ("created", "modified") for p in b[kind]]
+        assert not any("late.py" in p for p in reported)
+    finally:
+        sub.unsubscribe()
+        watcher.stop()
@@ -0,0 +1,89 @@
+import os
+
+from src.services.history_service import HistoryService
+
+
+def test_retention_keeps_the_latest_snapshot_of_each_file(tmp_path):
+    history = HistoryService(str(tmp_path), max_bytes=20_000)
+    for version in range(20):
+        history.record(str(tmp_path / "a.txt"), os.urandom(4_000) + bytes([version]))
+    for name in ("b.txt", "c.txt", "d.txt"):
+        history.record(str(tmp_path / name), os.urandom(8_000))
+
+    # Over budget with nothing left to drop: every file still has its latest snapshot
+    assert history.stored_bytes() > 20_000
+    assert history._old_count == 0
+    for name in ("a.txt", "b.txt", "c.txt", "d.txt"):
+        snaps = history.timeline(str(tmp_path / name))
+        assert len(snaps) == 1
+        assert history.read_snapshot(snaps[0]["id"]) is not None
+
+    reloaded = HistoryService(str(tmp_path), max_bytes=20_000)
+    assert reloaded.stored_bytes() == history.stored_bytes()
+
+
+def test_reload_drops_interrupted_and_orphaned_chunks(tmp_path):
+    history = HistoryService(str(tmp_path))
+    history.record(str(tmp_path / "a.txt"), b"hello world")
+    bucket = os.path.join(history.dir, "chunks", "ab")
+    os.makedirs(bucket, exist_ok=True)
+    with open(os.path.join(bucket, "ab12.tmp"), "wb") as f:
+        f.write(b"torn")
+    with open(os.path.join(bucket, "ab" * 32), "wb") as f:
+        f.write(b"never logged")
+
+    reloaded = HistoryService(str(tmp_path))
+    assert reloaded.stored_bytes() == history.stored_bytes()
+    assert os.listdir(bucket) == []
+
+
+def test_rolled_back_write_leaves_no_snapshot_of_its_content(tmp_path, monkeypatch):
+    import pytest
+    from src.core.vfs.providers import LocalProvider
+    from src.core.vfs.vfs import VirtualFileSystem
+    from src.core.vfs.write_queue import WriteQueue
+
+    a, b = str(tmp_path / "a.txt"), str(tmp_path / "b.txt")
+    for path in (a, b):
+        with open(path, "w") as f:
+            f.write("old")
+    history = HistoryService(str(tmp_path))
+    vfs = VirtualFileSystem()
+    vfs.write_queue = WriteQueue(durable=False)
+    vfs.write_queue.add_hook(history.on_write)
+    vfs.write_queue.add_hook(history.on_commit, after_commit=True)
+
+    commit = LocalProvider.commit
+
+    def failing_commit(self, temp, path):
+        if path == b and temp.endswith(".tmp"):
+            raise PermissionError(path)
+        commit(self, temp, path)
+
+    monkeypatch.setattr(LocalProvider, "commit", failing_commit)
+    with pytest.raises(PermissionError):
+        with vfs.transaction(wait=True) as tx:
+            tx.write(a, "new")
+            tx.write(b, "new")
+    assert [s["reason"] for s in history.timeline(a)] == ["before write"]
+
+    monkeypatch.setattr(LocalProvider, "commit", commit)
+    assert vfs.write(a, "newer")
+    snaps = history.timeline(a)
+    assert [s["reason"] for s in snaps] == ["write", "before write"]
+    assert history.read_snapshot(snaps[0]["id"]) == b"newer"
+
+
+def test_snapshot_with_a_lost_or_damaged_chunk_reads_as_none(tmp_path):
+    history = HistoryService(str(tmp_path))
+    first = history.record(str(tmp_path / "a.txt"), b"first version")
+    second = history.record(str(tmp_path / "b.txt"), b"second version")
+    snaps = {s["id"]: s for s in history._order}
+
+    os.remove(history._chunk_path(snaps[first]["chunks"][0]))
+    with open(history._chunk_path(snaps[second]["chunks"][0]), "wb") as f:
+        f.write(b"not zlib")
+
+    assert history.read_snapshot(first) is None
+    assert history.read_snapshot(second) is None
+    assert history.restore(str(tmp_path / "a.txt"), first, vfs=None) is False
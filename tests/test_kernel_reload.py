@@ -0,0 +1,71 @@
+import os
+import sys
+
+from src.core.kernel.kernel import kernel
+
+TEMPLATE = (
+    "from src.core.interfaces.extension import IExtension\n"
+    "import reload_log\n"
+    "class Extension(IExtension):\n"
+    "    version = {version!r}\n"
+    "    def on_load(self, kernel):\n"
+    "        {on_load}\n"
+    "        reload_log.events.append(('load', self.version))\n"
+    "    def on_unload(self):\n"
+    "        reload_log.events.append(('unload', self.version))\n"
+)
+
+
+def _write(path, version, on_load="pass"):
+    path.write_text(TEMPLATE.format(version=version, on_load=on_load))
+    # Make sure the re-import does not reuse bytecode cached for the previous source
+    stamp = os.stat(path).st_mtime + len(version)
+    os.utime(path, (stamp, stamp))
+
+
+def test_failed_reload_keeps_the_old_extension_loaded(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / "reload_log.py").write_text("events = []\n")
+    module = tmp_path / "reload_me.py"
+    _write(module, "v1")
+    import reload_log
+    import reload_me
+    kernel.start_extension("reload_me", reload_me.Extension(), "reload_me", "Extension")
+
+    _write(module, "v2-broken", on_load="raise RuntimeError('boom')")
+    assert not kernel.reload_extension("reload_me")
+    assert reload_log.events == [("load", "v1")]
+    assert kernel.extensions["reload_me"].version == "v1"
+
+    _write(module, "v3")
+    assert kernel.reload_extension("reload_me")
+    assert reload_log.events == [("load", "v1"), ("load", "v3"), ("unload", "v1")]
+    assert kernel.extensions["reload_me"].version == "v3"
+    del kernel.extensions["reload_me"]
+    sys.modules.pop("reload_me", None)
+
+
+def test_reload_keeps_sibling_modules(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / "reload_log.py").write_text("events = []\n")
+    package = tmp_path / "host_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "shared.py").write_text("class Service:\n    pass\n")
+    _write(package / "ext.py", "v1")
+    import host_pkg.ext
+    import host_pkg.shared
+    old = sys.modules["host_pkg.ext"]
+    siblings = {n: sys.modules[n] for n in ("host_pkg", "host_pkg.shared")}
+    kernel.start_extension("hosted", old.Extension(), "host_pkg.ext", "Extension")
+    try:
+        _write(package / "ext.py", "v2")
+        assert kernel.reload_extension("hosted")
+        assert kernel.extensions["hosted"].version == "v2"
+        assert sys.modules["host_pkg.ext"] is not old
+        for name, module in siblings.items():
+            assert sys.modules[name] is module
+    finally:
+        del kernel.extensions["hosted"]
+        for name in ("host_pkg", "host_pkg.ext", "host_pkg.shared", "reload_log"):
+            sys.modules.pop(name, None)
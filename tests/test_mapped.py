@@ -0,0 +1,42 @@
+from src.core.vfs.mapped import MappedFileRegistry
+
+
+def test_released_mapping_stays_open_until_the_reader_is_done(tmp_path):
+    path = tmp_path / "big.log"
+    path.write_bytes(b"line\n" * 1000)
+    registry = MappedFileRegistry()
+    with registry.open(str(path)) as mapped:
+        registry.release(str(path))
+        assert mapped.read_lines(10, 2) == ["line", "line"]
+    assert mapped._mm is None
+
+
+def test_evicted_mapping_stays_open_until_the_reader_is_done(tmp_path):
+    first, second = tmp_path / "a.txt", tmp_path / "b.txt"
+    first.write_bytes(b"a\n")
+    second.write_bytes(b"b\n")
+    registry = MappedFileRegistry(limit=1)
+    with registry.open(str(first)) as mapped:
+        with registry.open(str(second)):
+            assert mapped.read_range(0, 1) == b"a"
+        assert mapped.read_range(0, 1) == b"a"
+    assert mapped._mm is None
+
+
+def test_non_blocking_read_lines_waits_for_a_rebuilt_index(tmp_path):
+    from src.core.vfs.vfs import VirtualFileSystem
+
+    path = str(tmp_path / "grow.log")
+    with open(path, "wb") as f:
+        f.write(b"line\n" * 10)
+    vfs = VirtualFileSystem()
+    assert vfs.read_lines(path, 0, 2, block=False) is None
+    assert vfs.line_count(path) == 10
+    assert vfs.read_lines(path, 8, 5, block=False) == ["line", "line"]
+
+    # An append gives the file a new validator and so a mapping without an index
+    with open(path, "ab") as f:
+        f.write(b"more\n")
+    assert vfs.read_lines(path, 10, 1, block=False) is None
+    assert vfs.line_count(path) == 11
+    assert vfs.read_lines(path, 10, 1, block=False) == ["more"]
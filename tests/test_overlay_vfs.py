@@ -0,0 +1,18 @@
+import os
+
+from src.agent_os.tools import AgentTools
+from src.core.vfs.overlay import OverlayVFS
+from src.core.vfs.vfs import VirtualFileSystem
+
+
+def test_agent_tools_keep_an_empty_overlay(tmp_path):
+    overlay = OverlayVFS(VirtualFileSystem())
+    assert len(overlay) == 0
+
+    tools = AgentTools(overlay)
+    assert tools.vfs is overlay
+
+    target = str(tmp_path / "speculative.txt")
+    assert tools.write_file(target, "draft").startswith("Success")
+    assert not os.path.exists(target)
+    assert overlay.read(target) == "draft"
@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from src.core.vfs.remote.client import DELTA_MIN_FILE_BYTES, RemoteProvider
+from src.core.vfs.remote.server import WorkspaceServer, serve_in_thread
+from src.core.vfs.vfs import VirtualFileSystem
+
+
+@pytest.fixture
+def served(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    server, port = serve_in_thread(str(root), token="secret")
+    ops = []
+    handle_request = server.handle_request
+
+    def recording(message, body):
+        ops.append(message.get("op"))
+        return handle_request(message, body)
+
+    server.handle_request = recording
+    provider = RemoteProvider(token="secret", stat_ttl=0)
+    yield root, f"127.0.0.1:{port}", provider, ops
+    provider.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_read_list_and_delete(served):
+    root, address, provider, _ops = served
+    (root / "pkg").mkdir()
+    (root / "pkg" / "a.py").write_bytes(b"print('a')\n")
+    (root / "b.txt").write_bytes(b"b")
+
+    assert provider.read(f"{address}/pkg/a.py") == b"print('a')\n"
+    assert provider.list(f"{address}/") == ["b.txt", "pkg"]
+    assert provider.list(f"{address}/pkg") == ["a.py"]
+    assert provider.stat(f"{address}/pkg").is_dir
+
+    provider.delete(f"{address}/b.txt")
+    assert not (root / "b.txt").exists()
+    with pytest.raises(FileNotFoundError):
+        provider.read(f"{address}/b.txt")
+
+
+def test_write_of_a_seen_file_sends_a_delta(served):
+    root, address, provider, ops = served
+    original = bytes(range(256)) * (DELTA_MIN_FILE_BYTES // 64)
+    (root / "big.bin").write_bytes(original)
+    provider.read(f"{address}/big.bin")
+
+    edited = original[:1000] + b"EDIT" + original[1000:]
+    provider.write(f"{address}/big.bin", edited)
+
+    assert ops[-1] == "write_delta"
+    assert (root / "big.bin").read_bytes() == edited
+
+
+def test_transaction_writes_every_remote_file(served):
+    root, address, provider, _ops = served
+    vfs = VirtualFileSystem()
+    vfs.mount("fervv", provider)
+    with vfs.transaction(wait=True) as tx:
+        tx.write(f"fervv://{address}/one.txt", "1")
+        tx.write(f"fervv://{address}/two.txt", "2")
+    assert tx.future.result() == [f"fervv://{address}/one.txt", f"fervv://{address}/two.txt"]
+    assert (root / "one.txt").read_text() == "1"
+    assert (root / "two.txt").read_text() == "2"
+
+
+def test_paths_may_not_escape_the_root(served, tmp_path):
+    _root, address, provider, _ops = served
+    (tmp_path / "outside.txt").write_bytes(b"secret")
+    with pytest.raises(PermissionError):
+        provider.read(f"{address}/../outside.txt")
+    with pytest.raises(PermissionError):
+        provider.write(f"{address}/../outside.txt", b"overwritten")
+    assert (tmp_path / "outside.txt").read_bytes() == b"secret"
+
+
+def test_bad_token_is_rejected(served):
+    root, address, _provider, _ops = served
+    (root / "a.txt").write_bytes(b"a")
+    intruder = RemoteProvider(token="wrong")
+    try:
+        with pytest.raises(PermissionError):
+            intruder.read(f"{address}/a.txt")
+    finally:
+        intruder.close()
+
+
+def test_non_loopback_bind_requires_a_token(tmp_path):
+    with pytest.raises(ValueError):
+        WorkspaceServer(str(tmp_path), ("0.0.0.0", 0))
+    assert not os.listdir(tmp_path)
@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+from src.core.vfs.providers import LocalProvider
+from src.core.vfs.vfs import VirtualFileSystem
+from src.services.search_service import ReplacePlan, file_edits
+
+SPEC = ("old", False, True, False)
+
+
+def _plan(root, names):
+    plan = ReplacePlan(str(root), SPEC, "new")
+    for name in names:
+        path = root / name
+        path.write_bytes(b"old value\n")
+        st = os.stat(path)
+        plan.add([(name, st.st_size, st.st_mtime_ns, file_edits(path.read_bytes(), SPEC, "new"))])
+    return plan
+
+
+def test_commit_replaces_every_file(tmp_path):
+    plan = _plan(tmp_path, ["a.txt", "b.txt"])
+    assert sorted(plan.commit(VirtualFileSystem())) == ["a.txt", "b.txt"]
+    assert (tmp_path / "a.txt").read_bytes() == b"new value\n"
+    assert (tmp_path / "b.txt").read_bytes() == b"new value\n"
+
+
+def test_failed_commit_leaves_no_file_changed(tmp_path, monkeypatch):
+    plan = _plan(tmp_path, ["a.txt", "b.txt", "c.txt"])
+    commit = LocalProvider.commit
+    failing = str(tmp_path / "b.txt")
+
+    def failing_commit(self, temp, path):
+        if path == failing and temp.endswith(".tmp"):
+            raise PermissionError(path)
+        commit(self, temp, path)
+
+    monkeypatch.setattr(LocalProvider, "commit", failing_commit)
+    with pytest.raises(PermissionError):
+        plan.commit(VirtualFileSystem())
+    for name in ("a.txt", "b.txt", "c.txt"):
+        assert (tmp_path / name).read_bytes() == b"old value\n"
@@ -0,0 +1,67 @@
+import mmap
+import re
+
+from src.services.search_service import MAX_MATCHES_PER_FILE, _line_matches, apply_edits, file_edits, search_files
+
+
+def _spec(pattern, regex=False, case_sensitive=True, whole_word=False):
+    return pattern, regex, case_sensitive, whole_word
+
+
+def _matches(data, pattern):
+    with mmap.mmap(-1, len(data)) as mm:
+        mm.write(data)
+        return _line_matches(mm, re.compile(pattern))
+
+
+def test_line_numbers_and_character_columns():
+    data = "first line\nsecond needle\r\nπ needle and needle\n".encode("utf-8")
+    assert _matches(data, rb"needle") == [
+        (2, 7, 13, "second needle"),
+        (3, 2, 8, "π needle and needle"),
+        (3, 13, 19, "π needle and needle"),
+    ]
+
+
+def test_matches_per_file_are_capped():
+    data = b"x\n" * (MAX_MATCHES_PER_FILE + 50)
+    found = _matches(data, rb"x")
+    assert len(found) == MAX_MATCHES_PER_FILE
+    assert found[-1][0] == MAX_MATCHES_PER_FILE
+
+
+def test_search_files_skips_binary_and_empty_files(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.py").write_bytes(b"import os\nos.getcwd()\n")
+    (tmp_path / "blob.bin").write_bytes(b"os\0os")
+    (tmp_path / "empty.txt").write_bytes(b"")
+    results, scanned = search_files(str(tmp_path), ["src/a.py", "blob.bin", "empty.txt", "missing.txt"], _spec("os"))
+    assert results == [("src/a.py", [(1, 7, 9, "import os"), (2, 0, 2, "os.getcwd()")])]
+    assert scanned == len(b"import os\nos.getcwd()\n")
+
+
+def test_search_files_honours_case_and_whole_word(tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"Value values value\n")
+    rels = ["a.txt"]
+    assert [m[1] for m in search_files(str(tmp_path), rels, _spec("value"))[0][0][1]] == [6, 13]
+    insensitive = search_files(str(tmp_path), rels, _spec("value", case_sensitive=False, whole_word=True))[0]
+    assert [m[1] for m in insensitive[0][1]] == [0, 13]
+
+
+def test_non_ascii_patterns_fold_case_and_respect_word_boundaries(tmp_path):
+    (tmp_path / "de.txt").write_bytes("STRASSE\nDie Straße und straße\nстраßen\n".encode("utf-8"))
+    (tmp_path / "ru.txt").write_bytes("Привет, ПРИВЕТ; приветствие\n".encode("utf-8"))
+
+    results = dict(search_files(str(tmp_path), ["de.txt"], _spec("straße", case_sensitive=False))[0])
+    assert [(m[0], m[1], m[2]) for m in results["de.txt"]] == [(2, 4, 10), (2, 15, 21)]
+
+    results = dict(search_files(str(tmp_path), ["ru.txt"], _spec("привет", case_sensitive=False, whole_word=True))[0])
+    assert [m[1] for m in results["ru.txt"]] == [0, 8]
+
+
+def test_non_ascii_replace_edits_are_byte_ranges():
+    # An invalid byte between the matches must not shift the offsets after it
+    data = "ä Über".encode("utf-8") + b"\xff " + "über\n".encode("utf-8")
+    edits = file_edits(data, _spec("über", case_sensitive=False), "over")
+    assert [(start, end) for start, end, _ in edits] == [(3, 8), (10, 15)]
+    assert apply_edits(data, edits) == "ä over".encode("utf-8") + b"\xff over\n"
@@ -0,0 +1,118 @@
+import os
+
+from src.services.trigram_index_service import (
+    TrigramIndex, TrigramIndexService, _literal_runs, build_index, decode_postings, encode_varint,
+    file_trigrams, required_trigrams, sre_parse,
+)
+
+
+def _trigrams(*words):
+    result = set()
+    for word in words:
+        data = word.encode("utf-8")
+        result.update(int.from_bytes(data[i:i + 3], "little") for i in range(len(data) - 2))
+    return result
+
+
+def _runs(pattern):
+    return _literal_runs(sre_parse.parse(pattern))
+
+
+class _FakeIndex:
+    def __init__(self, root, files):
+        self.root = str(root)
+        self._files = files
+
+    def paths(self):
+        return list(self._files)
+
+    def abspath(self, rel):
+        return os.path.join(self.root, *rel.split("/"))
+
+
+def _build(tmp_path, files):
+    for rel, data in files.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    temp = build_index(str(tmp_path), list(files), str(tmp_path / "trigrams.idx"), max_workers=2)
+    os.replace(temp, tmp_path / "trigrams.idx")
+    return TrigramIndex.open(str(tmp_path / "trigrams.idx"))
+
+
+def test_postings_round_trip():
+    ids = [0, 1, 127, 128, 300, 16_384, 2_000_000]
+    out = bytearray()
+    previous = 0
+    for current in ids:
+        encode_varint(current - previous, out)
+        previous = current
+    assert decode_postings(bytes(out)) == ids
+
+
+def test_literal_runs():
+    assert _runs("foo.*bar") == ["foo", "bar"]
+    assert _runs("x(abc)y") == ["x", "abc", "y"]
+    assert _runs("ab+cde") == ["a", "cde"]
+    assert _runs("pre(?:one|two)post") == ["pre", "post"]
+    assert _runs("one|two") == []
+    assert _runs(r"\d+") == []
+    assert _runs("ab(?i:cdé)fg") == ["ab", "fg"]
+
+
+def test_required_trigrams():
+    assert required_trigrams(("Hello", False, True, False)) == _trigrams("hello")
+    assert required_trigrams(("foo.*bar", True, True, False)) == _trigrams("foo", "bar")
+    assert required_trigrams(("one|two", True, True, False)) is None
+    assert required_trigrams(("ab", False, True, False)) is None
+    assert required_trigrams(("(", True, True, False)) is None
+    # Case-insensitive non-ASCII: only the ASCII trigrams can be relied on
+    assert required_trigrams(("straße", False, False, False)) == _trigrams("str", "tra")
+    assert required_trigrams(("(?i)straße", True, True, False)) == _trigrams("str", "tra")
+    assert required_trigrams(("straße", False, True, False)) == file_trigrams("straße".encode("utf-8"))
+
+
+def test_built_index_narrows_to_matching_files(tmp_path):
+    files = {
+        "a.py": b"def hello_world():\n    pass\n",
+        "pkg/b.py": b"HELLO = 1\n",
+        "c.txt": b"nothing to see\n",
+        "d.bin": b"hello\0world",
+        "e.txt": "Die STRASSE, die Straße\n".encode("utf-8"),
+    }
+    index = _build(tmp_path, files)
+
+    def names(spec):
+        return sorted(index.files[i][0] for i in index.search(required_trigrams(spec)))
+
+    try:
+        assert [f[0] for f in index.files] == list(files)
+        assert names(("hello", False, False, False)) == ["a.py", "pkg/b.py"]
+        assert names(("hello_world", False, True, False)) == ["a.py"]
+        assert names(("to.*see", True, True, False)) == ["c.txt"]
+        assert names(("straße", False, False, False)) == ["e.txt"]
+        assert names(("missing", False, True, False)) == []
+    finally:
+        index.close()
+
+
+def test_candidates_apply_the_overlay(tmp_path):
+    files = {"a.txt": b"hello there\n", "b.txt": b"goodbye\n", "c.txt": b"other\n"}
+    service = TrigramIndexService(_FakeIndex(tmp_path, files))
+    service.base = _build(tmp_path, files)
+    try:
+        spec = ("hello", False, True, False)
+        assert service.candidates(spec) == ["a.txt"]
+
+        # Changed since the build: a.txt deleted, b.txt now matches, c.txt not read yet
+        service._dirty = {"a.txt": (1, None), "b.txt": (2, frozenset(file_trigrams(b"hello again")))}
+        service._pending = {"c.txt": 3}
+        assert sorted(service.candidates(spec)) == ["b.txt", "c.txt"]
+
+        # Too large for the overlay: always searched
+        service._dirty["big.log"] = (4, True)
+        assert sorted(service.candidates(spec)) == ["b.txt", "big.log", "c.txt"]
+        # An unnarrowable query searches everything
+        assert service.candidates(("ab", False, True, False)) == list(files)
+    finally:
+        service.stop()
@@ -0,0 +1,37 @@
+import time
+
+from src.services.file_watcher_service import FileWatcherService
+from src.services.workspace_index_service import WorkspaceIndexService
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_gitignore_edits_apply_at_runtime(tmp_path):
+    (tmp_path / "main.py").write_text("print(1)\n")
+    (tmp_path / "debug.log").write_text("noise\n")
+    watcher = FileWatcherService(str(tmp_path), debounce=0.05)
+    index = WorkspaceIndexService(str(tmp_path))
+    watcher.start()
+    index.start()
+    try:
+        assert index.ready.wait(5)
+        assert index.table.get("debug.log") is not None
+        # Let the watcher set up its watches before changing anything
+        time.sleep(0.3)
+
+        (tmp_path / ".gitignore").write_text("*.log\n")
+        assert _wait_for(lambda: index.table.get("debug.log") is None)
+        assert index.table.get("main.py") is not None
+
+        (tmp_path / ".gitignore").unlink()
+        assert _wait_for(lambda: index.table.get("debug.log") is not None)
+    finally:
+        index.stop()
+        watcher.stop()
@@ -0,0 +1,85 @@
+import os
+import threading
+
+import pytest
+
+from src.core.event_bus import global_event_bus
+from src.core.vfs.providers import LocalProvider
+from src.core.vfs.vfs import VirtualFileSystem
+
+
+def _write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def _read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def test_failed_transaction_rolls_back_committed_files(tmp_path, monkeypatch):
+    a, b, c, d = (str(tmp_path / name) for name in ("a.txt", "b.txt", "c.txt", "d.txt"))
+    _write(a, "old a")
+    _write(b, "old b")
+    _write(c, "old c")
+
+    commit = LocalProvider.commit
+
+    def failing_commit(self, temp, path):
+        if path == c and temp.endswith(".tmp"):
+            raise PermissionError(path)
+        commit(self, temp, path)
+
+    monkeypatch.setattr(LocalProvider, "commit", failing_commit)
+    vfs = VirtualFileSystem()
+    with pytest.raises(PermissionError):
+        with vfs.transaction(wait=True) as tx:
+            tx.write(a, "new a")
+            tx.delete(b)
+            tx.write(d, "new d")
+            tx.write(c, "new c")
+
+    assert _read(a) == "old a"
+    assert _read(b) == "old b"
+    assert _read(c) == "old c"
+    assert not os.path.exists(d)
+    assert sorted(os.listdir(tmp_path)) == ["a.txt", "b.txt", "c.txt"]
+
+
+def test_vfs_write_payload_is_always_a_list(tmp_path):
+    received = []
+    sub = global_event_bus.subscribe("vfs_write", received.append)
+    try:
+        vfs = VirtualFileSystem()
+        target = str(tmp_path / "one.txt")
+        vfs.write(target, "x")
+        # The event follows the Future; the next (empty) batch runs after it was published
+        vfs.write_queue.flush()
+    finally:
+        sub.unsubscribe()
+    assert received and all(isinstance(payload, list) for payload in received)
+
+
+def test_kernel_shutdown_flushes_queued_writes(tmp_path, monkeypatch):
+    from src.core.container import Container
+    from src.core.kernel.kernel import kernel
+
+    monkeypatch.setattr(kernel, "_stoppable", [])
+    monkeypatch.setattr(kernel, "extensions", {})
+    vfs = VirtualFileSystem()
+    vfs.on_load(kernel)
+    # Hold the writer so the save is still in flight when shutdown starts
+    gate = threading.Event()
+    vfs.write_queue.add_hook(lambda *op: gate.wait(5))
+    try:
+        target = str(tmp_path / "late.txt")
+        future = vfs.write_async(target, "saved on exit")
+        threading.Timer(0.2, gate.set).start()
+        kernel.shutdown()
+        assert future.done()
+        assert _read(target) == "saved on exit"
+        assert not vfs.write_queue._thread.is_alive()
+    finally:
+        vfs.write_queue._hooks.pop()
+        Container.unregister("VFS")
@@ -0,0 +1,38 @@
+import zipfile
+
+import pytest
+
+from src.core.vfs.vfs import VirtualFileSystem
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = tmp_path / "lib.whl"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("pkg/__init__.py", "")
+        zf.writestr("pkg/mod.py", "x = 1\n")
+    return str(path)
+
+
+def test_reads_and_lists_members(archive):
+    vfs = VirtualFileSystem()
+    assert vfs.read(f"zip://{archive}!/pkg/mod.py") == "x = 1\n"
+    assert vfs.list(f"zip://{archive}!/") == ["pkg"]
+    assert vfs.list(f"zip://{archive}!/pkg") == ["__init__.py", "mod.py"]
+
+
+def test_list_of_a_non_zip_is_empty(tmp_path):
+    plain = tmp_path / "notes.txt"
+    plain.write_text("not an archive")
+    vfs = VirtualFileSystem()
+    assert vfs.list(f"zip://{plain}!/") == []
+    assert vfs.list(f"zip://{plain}!/inner/dir") == []
+    assert vfs.list(f"zip://{tmp_path / 'missing.zip'}!/") == []
+    assert vfs.stat(f"zip://{plain}!/inner") is None
+
+
+def test_archives_are_read_only(archive):
+    vfs = VirtualFileSystem()
+    assert not vfs.write(f"zip://{archive}!/pkg/mod.py", "x = 2\n")
+    assert not vfs.delete(f"zip://{archive}!/pkg/mod.py")
+    assert vfs.read(f"zip://{archive}!/pkg/mod.py") == "x = 1\n"